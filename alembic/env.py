@@ -9,17 +9,13 @@ from alembic import context
 from app.db import Base
 # Import all models so Alembic can detect them for autogenerate
 from app import models
-import os
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
+from app.config import get_settings
 
 # Alembic configuration object
 config = context.config
 
-# Set database URL from environment variable (overrides alembic.ini)
-database_url = os.getenv("DATABASE_URL")
+# Set database URL from DATABASE_URL / .env (overrides alembic.ini)
+database_url = get_settings().database_url
 if database_url:
     config.set_main_option("sqlalchemy.url", database_url)
 
@@ -0,0 +1,26 @@
+"""add (player_id, season_id) index to roster memberships for player history
+
+Revision ID: 538cb9de36f3
+Revises: e91df916ab7b
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '538cb9de36f3'
+down_revision: Union[str, None] = 'e91df916ab7b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serves GET /players/{id}/history: all memberships for one player, by season
+    op.create_index('idx_player_season', 'roster_memberships', ['player_id', 'season_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_player_season', table_name='roster_memberships')
@@ -0,0 +1,45 @@
+"""add team season analytics table
+
+Revision ID: 630f03596e1f
+Revises: 538cb9de36f3
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '630f03596e1f'
+down_revision: Union[str, None] = '538cb9de36f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Precomputed per-team-season aggregates; populate with
+    # python scripts/seed.py --rebuild-analytics
+    op.create_table(
+        'team_season_analytics',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('team_id', sa.Integer(), nullable=False),
+        sa.Column('season_id', sa.Integer(), nullable=False),
+        sa.Column('previous_season_id', sa.Integer(), nullable=True),
+        sa.Column('roster_size', sa.Integer(), nullable=False),
+        sa.Column('position_counts', sa.JSON(), nullable=False),
+        sa.Column('retained', sa.Integer(), nullable=False),
+        sa.Column('added', sa.Integer(), nullable=False),
+        sa.Column('departed', sa.Integer(), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ),
+        sa.ForeignKeyConstraint(['season_id'], ['seasons.id'], ),
+        sa.ForeignKeyConstraint(['previous_season_id'], ['seasons.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('team_id', 'season_id', name='unique_team_season_analytics')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('team_season_analytics')
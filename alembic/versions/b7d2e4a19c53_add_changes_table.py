@@ -0,0 +1,38 @@
+"""add changes table
+
+Revision ID: b7d2e4a19c53
+Revises: 630f03596e1f
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e4a19c53'
+down_revision: Union[str, None] = '630f03596e1f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Append-only change log for GET /changes, written by app/change_log.py.
+    # Starts empty: rows already in the database predate the log, so clients
+    # do one full pull and then sync from the current max(seq).
+    op.create_table(
+        'changes',
+        sa.Column('seq', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), nullable=False),
+        sa.Column('entity', sa.String(), nullable=False),
+        sa.Column('op', sa.String(), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('data', sa.JSON(), nullable=False),
+        sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('seq')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('changes')
@@ -0,0 +1,108 @@
+"""rationalize indexes: drop redundant ones, match real query patterns
+
+Revision ID: c4e8f1a2b9d7
+Revises: b7d2e4a19c53
+Create Date: 2026-10-18 16:00:00.000000
+
+Dropped (each insert paid for them, no query needs them):
+- ix_{teams,players,seasons,roster_memberships}_id: duplicates of the primary
+  key indexes.
+- ix_roster_memberships_team_id, ix_roster_memberships_player_id: prefixes of
+  the (team_id, season_id, player_id) unique index and idx_player_season.
+- ix_players_position: five distinct values, never filtered on.
+- ix_teams_name: teams are looked up by abbreviation only.
+- ix_players_first_name, ix_players_last_name: replaced by idx_player_name.
+
+Replaced:
+- unique_roster_membership is rebuilt as (team_id, season_id, player_id). It
+  enforces the same uniqueness, but now it also serves "roster of team T in
+  season S" lookups, so idx_team_season (team_id, season_id) is dropped.
+- idx_player_name (last_name, first_name): name lookups (POST
+  /players/resolve, the seeder's get-or-create and bulk anti-join) use both
+  columns together.
+
+Kept: ix_teams_abbreviation, ix_seasons_year, ix_roster_memberships_season_id
+(season exports, FK checks on season deletes), and idx_player_season.
+
+Indexes are built and dropped with CREATE/DROP INDEX CONCURRENTLY outside a
+transaction, so reads and writes continue during the migration. The only
+exclusive lock is the brief constraint swap, and it gives up after
+lock_timeout rather than queueing behind long queries. A concurrent build that
+fails leaves an INVALID index behind: drop it by hand, then rerun.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8f1a2b9d7'
+down_revision: Union[str, None] = 'b7d2e4a19c53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns) dropped by upgrade and recreated by downgrade
+REDUNDANT_INDEXES = [
+    ('ix_teams_id', 'teams', ['id']),
+    ('ix_teams_name', 'teams', ['name']),
+    ('ix_players_id', 'players', ['id']),
+    ('ix_players_first_name', 'players', ['first_name']),
+    ('ix_players_last_name', 'players', ['last_name']),
+    ('ix_players_position', 'players', ['position']),
+    ('ix_seasons_id', 'seasons', ['id']),
+    ('ix_roster_memberships_id', 'roster_memberships', ['id']),
+    ('ix_roster_memberships_team_id', 'roster_memberships', ['team_id']),
+    ('ix_roster_memberships_player_id', 'roster_memberships', ['player_id']),
+    ('idx_team_season', 'roster_memberships', ['team_id', 'season_id']),
+]
+
+# Built under a temporary name, then attached to the constraint (which takes
+# the constraint's name).
+NEW_UNIQUE_INDEX = 'unique_roster_membership_new'
+LOCK_TIMEOUT = '5s'
+
+
+def _swap_unique_constraint() -> None:
+    """Point unique_roster_membership at NEW_UNIQUE_INDEX, which must already exist."""
+    op.execute(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'")
+    op.execute('ALTER TABLE roster_memberships DROP CONSTRAINT unique_roster_membership')
+    op.execute(
+        'ALTER TABLE roster_memberships ADD CONSTRAINT unique_roster_membership '
+        f'UNIQUE USING INDEX {NEW_UNIQUE_INDEX}'
+    )
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            NEW_UNIQUE_INDEX, 'roster_memberships', ['team_id', 'season_id', 'player_id'],
+            unique=True, postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'idx_player_name', 'players', ['last_name', 'first_name'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+    _swap_unique_constraint()
+
+    with op.get_context().autocommit_block():
+        for name, table, _ in REDUNDANT_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in REDUNDANT_INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+        op.create_index(
+            NEW_UNIQUE_INDEX, 'roster_memberships', ['team_id', 'player_id', 'season_id'],
+            unique=True, postgresql_concurrently=True, if_not_exists=True,
+        )
+
+    _swap_unique_constraint()
+
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_player_name', table_name='players', postgresql_concurrently=True, if_exists=True)
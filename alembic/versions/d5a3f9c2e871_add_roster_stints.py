@@ -0,0 +1,103 @@
+"""add roster stints: dated memberships with a GiST range index
+
+Revision ID: d5a3f9c2e871
+Revises: c4e8f1a2b9d7
+Create Date: 2026-10-18 17:00:00.000000
+
+- seasons gain start_date / end_date, backfilled as [Oct 1 of year - 1,
+  Jul 1 of year), the same default as app.models.season_dates().
+- roster_memberships gain start_date / end_date, backfilled from their
+  season, so every existing membership becomes a full-season stint.
+- unique_roster_membership is rebuilt as (team_id, season_id, player_id,
+  start_date), so a player can have several stints with one team per season.
+  The (team_id, season_id) prefix still serves team-season roster lookups.
+- roster_stint_no_overlap: EXCLUDE USING gist (team_id WITH =,
+  daterange(start_date, end_date, '[)') WITH &&, player_id WITH =). It rejects
+  overlapping stints, and its index answers point-in-time roster queries
+  (app/stints.py). btree_gist provides the = operator class for the integers.
+
+The backfill updates every roster row, and the exclusion constraint is built
+under an ACCESS EXCLUSIVE lock: Postgres cannot build it concurrently. The
+unique index is still built concurrently and swapped in under lock_timeout,
+as in c4e8f1a2b9d7. Run this migration in a quiet period.
+
+Downgrade keeps only the earliest stint of each (team, season, player) before
+restoring the old unique constraint; the later stints are deleted. The
+btree_gist extension is left installed.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a3f9c2e871'
+down_revision: Union[str, None] = 'c4e8f1a2b9d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NEW_UNIQUE_INDEX = 'unique_roster_membership_new'
+LOCK_TIMEOUT = '5s'
+
+
+def _swap_unique_constraint() -> None:
+    """Point unique_roster_membership at NEW_UNIQUE_INDEX, which must already exist."""
+    op.execute(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'")
+    op.execute('ALTER TABLE roster_memberships DROP CONSTRAINT unique_roster_membership')
+    op.execute(
+        'ALTER TABLE roster_memberships ADD CONSTRAINT unique_roster_membership '
+        f'UNIQUE USING INDEX {NEW_UNIQUE_INDEX}'
+    )
+
+
+def upgrade() -> None:
+    for table in ('seasons', 'roster_memberships'):
+        op.add_column(table, sa.Column('start_date', sa.Date(), nullable=True))
+        op.add_column(table, sa.Column('end_date', sa.Date(), nullable=True))
+    op.execute(
+        'UPDATE seasons SET start_date = make_date(year - 1, 10, 1), end_date = make_date(year, 7, 1)'
+    )
+    op.execute(
+        'UPDATE roster_memberships AS rm SET start_date = s.start_date, end_date = s.end_date '
+        'FROM seasons AS s WHERE s.id = rm.season_id'
+    )
+    for table in ('seasons', 'roster_memberships'):
+        op.alter_column(table, 'start_date', nullable=False)
+        op.alter_column(table, 'end_date', nullable=False)
+    op.create_check_constraint('ck_roster_stint_dates', 'roster_memberships', 'start_date < end_date')
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            NEW_UNIQUE_INDEX, 'roster_memberships', ['team_id', 'season_id', 'player_id', 'start_date'],
+            unique=True, postgresql_concurrently=True, if_not_exists=True,
+        )
+
+    _swap_unique_constraint()
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    op.execute(
+        'ALTER TABLE roster_memberships ADD CONSTRAINT roster_stint_no_overlap EXCLUDE USING gist '
+        "(team_id WITH =, daterange(start_date, end_date, '[)') WITH &&, player_id WITH =)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('roster_stint_no_overlap', 'roster_memberships')
+    op.execute(
+        'DELETE FROM roster_memberships AS rm USING roster_memberships AS earlier '
+        'WHERE earlier.team_id = rm.team_id AND earlier.season_id = rm.season_id '
+        'AND earlier.player_id = rm.player_id '
+        'AND (earlier.start_date, earlier.id) < (rm.start_date, rm.id)'
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            NEW_UNIQUE_INDEX, 'roster_memberships', ['team_id', 'season_id', 'player_id'],
+            unique=True, postgresql_concurrently=True, if_not_exists=True,
+        )
+
+    _swap_unique_constraint()
+    op.drop_constraint('ck_roster_stint_dates', 'roster_memberships')
+    for table in ('roster_memberships', 'seasons'):
+        op.drop_column(table, 'end_date')
+        op.drop_column(table, 'start_date')
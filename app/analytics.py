@@ -0,0 +1,114 @@
+"""
+Incremental refresh of the team_season_analytics table.
+
+Each row holds a team's roster size, position distribution, and turnover
+against its previous-season roster. Rows are recomputed only for the
+(team, season) pairs a writer touched, plus the same team's next season,
+whose turnover depends on the touched roster.
+
+A refresh costs a handful of set-based statements regardless of how many
+pairs it covers (chunked at 500 pairs): the season list, the memberships of
+the affected rosters and their previous seasons, a delete, and an insert.
+
+Concurrent refreshes: a refresh first takes the roster lock of every team
+it touches (lock_teams() in app/roster_writes.py; writers that hold them
+already, like POST /rosters/batch, just keep them). A second writer touching
+the same team waits until the first commits; its statements then see the
+committed analytics row, so the delete removes it instead of the insert
+tripping unique_team_season_analytics, and the recomputed row includes both
+writers' memberships.
+"""
+
+from collections import Counter, defaultdict
+from typing import Iterable
+
+from sqlalchemy import delete, insert, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.models import Player, RosterMembership, Season, TeamSeasonAnalytics
+from app.roster_writes import lock_teams
+
+CHUNK_SIZE = 500
+
+
+def _chunks(items: list, size: int = CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _season_neighbours(session: Session) -> tuple[dict, dict]:
+    """previous[season_id] and next[season_id] by year order."""
+    ordered = [row.id for row in session.execute(select(Season.id).order_by(Season.year))]
+    previous = dict(zip(ordered[1:], ordered))
+    following = dict(zip(ordered, ordered[1:]))
+    return previous, following
+
+
+def refresh_team_seasons(session: Session, pairs: Iterable[tuple[int, int]]) -> int:
+    """
+    Recompute analytics for (team_id, season_id) pairs and the team's next season.
+
+    Runs inside the caller's transaction (commit to publish). Pairs whose
+    roster is now empty lose their row. Returns the number of rows written.
+    """
+    pairs = set(pairs)
+    if not pairs:
+        return 0
+    lock_teams(session, {team_id for team_id, _ in pairs})
+    previous, following = _season_neighbours(session)
+    targets = pairs | {(t, following[s]) for t, s in pairs if s in following}
+    needed = list(targets | {(t, previous[s]) for t, s in targets if s in previous})
+
+    rosters: dict[tuple[int, int], set] = defaultdict(set)
+    positions: dict[tuple[int, int], Counter] = defaultdict(Counter)
+    for chunk in _chunks(needed):
+        rows = session.execute(
+            select(RosterMembership.team_id, RosterMembership.season_id, RosterMembership.player_id, Player.position)
+            .join(Player, Player.id == RosterMembership.player_id)
+            .where(tuple_(RosterMembership.team_id, RosterMembership.season_id).in_(chunk))
+        )
+        for team_id, season_id, player_id, position in rows:
+            # A player with several stints on the roster counts once.
+            if player_id not in rosters[(team_id, season_id)]:
+                rosters[(team_id, season_id)].add(player_id)
+                positions[(team_id, season_id)][position] += 1
+
+    values = []
+    for team_id, season_id in targets:
+        roster = rosters.get((team_id, season_id))
+        if not roster:
+            continue
+        previous_season_id = previous.get(season_id)
+        previous_roster = rosters.get((team_id, previous_season_id), set())
+        values.append(
+            {
+                "team_id": team_id,
+                "season_id": season_id,
+                "previous_season_id": previous_season_id,
+                "roster_size": len(roster),
+                "position_counts": dict(sorted(positions[(team_id, season_id)].items())),
+                "retained": len(roster & previous_roster),
+                "added": len(roster - previous_roster),
+                "departed": len(previous_roster - roster),
+            }
+        )
+
+    target_list = list(targets)
+    for chunk in _chunks(target_list):
+        session.execute(
+            delete(TeamSeasonAnalytics).where(
+                tuple_(TeamSeasonAnalytics.team_id, TeamSeasonAnalytics.season_id).in_(chunk)
+            )
+        )
+    if values:
+        session.execute(insert(TeamSeasonAnalytics), values)
+    return len(values)
+
+
+def rebuild_all(session: Session) -> int:
+    """Recompute analytics for every (team, season) with roster memberships."""
+    session.execute(delete(TeamSeasonAnalytics))
+    pairs = session.execute(
+        select(RosterMembership.team_id, RosterMembership.season_id).distinct()
+    ).all()
+    return refresh_team_seasons(session, (tuple(p) for p in pairs))
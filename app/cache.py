@@ -0,0 +1,328 @@
+"""
+Response cache for roster reads.
+
+Roster data for past seasons effectively never changes, so read endpoints keep
+their serialized JSON in a cache keyed by (team, season) or by player and skip
+the database entirely on a hit.
+
+Entries carry tags naming the rows they were built from:
+    team_season:<team_id>:<season_id>   a team's roster for one season
+    player:<player_id>                  anything listing one player's memberships
+Inserting or deleting a RosterMembership drops exactly the cached responses
+that included it:
+- writes committed in this process (ORM or Core) are reported at once by
+  app/roster_writes.py, and the cache invalidates the matching tags;
+- writes committed by other processes (the seeder, other API workers) are
+  picked up from the change log: ChangeFeedSync, run as a background task by
+  the lifespan handler, polls max(changes.seq) every CACHE_SYNC_INTERVAL_SECONDS
+  and invalidates the tags of the roster changes committed since its last
+  look. If more than CACHE_SYNC_MAX_CHANGES arrived (e.g. a bulk seed), it
+  clears the whole cache instead of reading them.
+
+The default backend is an in-process LRU with a TTL, sized by env vars:
+    CACHE_MAX_ENTRIES   entries kept before least-recently-used eviction (default 1024, 0 disables)
+    CACHE_TTL_SECONDS   seconds an entry stays valid                      (default 300)
+    CACHE_SYNC_INTERVAL_SECONDS  seconds between change log polls         (default 1)
+To share entries across processes, subclass CacheBackend (e.g. over Redis)
+and install it with set_cache_backend().
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from sqlalchemy import func, select
+from starlette.concurrency import run_in_threadpool
+
+from app.config import get_settings
+from app.db import SessionLocal
+from app.models import Change
+from app.roster_writes import on_roster_commit
+
+logger = logging.getLogger(__name__)
+
+CACHE_SYNC_MAX_CHANGES = 10_000
+
+
+class CacheBackend(ABC):
+    """Storage interface for the response cache."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, tags: Iterable[str]) -> None:
+        ...
+
+    @abstractmethod
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Drop every entry carrying any of tags; return how many were dropped."""
+
+    @abstractmethod
+    def clear(self) -> int:
+        """Drop every entry; return how many were dropped."""
+
+    def stats(self) -> dict:
+        return {}
+
+
+class LRUCacheBackend(CacheBackend):
+    """Thread-safe in-process LRU cache with a per-entry TTL and tag index."""
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # key -> (expires_at, value, tags); order is least- to most-recently used
+        self._entries: OrderedDict = OrderedDict()
+        self._keys_by_tag: dict[str, set] = {}
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, tags: Iterable[str]) -> None:
+        if self.max_entries <= 0:
+            return
+        tags = frozenset(tags)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value, tags)
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        dropped = 0
+        with self._lock:
+            for tag in tags:
+                for key in self._keys_by_tag.pop(tag, ()):
+                    if key in self._entries:
+                        self._remove(key)
+                        dropped += 1
+        return dropped
+
+    def clear(self) -> int:
+        with self._lock:
+            dropped = len(self._entries)
+            self._entries.clear()
+            self._keys_by_tag.clear()
+        return dropped
+
+    def _remove(self, key: str) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "lru",
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+def team_season_tag(team_id: int, season_id: int) -> str:
+    return f"team_season:{team_id}:{season_id}"
+
+
+def player_tag(player_id: int) -> str:
+    return f"player:{player_id}"
+
+
+class ResponseCache:
+    """
+    Cache front end used by endpoints and writers; counts hits and misses.
+
+    A reader can load rows, a write commit and invalidate, and the reader then
+    cache what it loaded before the write. To keep that stale response out,
+    every invalidation bumps a generation counter and stamps the tags it
+    dropped with it. Readers take generation() before reading and pass it to
+    set(), which skips the write if any of its tags (or the whole cache) was
+    invalidated since.
+    """
+
+    def __init__(self, backend: CacheBackend) -> None:
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+        self.stale_sets = 0
+        self._generation = 0
+        self._cleared_at = 0
+        # tag -> generation of its last invalidation; one entry per team-season
+        # or player ever written, so it stays as small as those tables.
+        self._tag_generations: dict[str, int] = {}
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def generation(self) -> int:
+        """Take before reading the rows of a response that will be passed to set()."""
+        with self._lock:
+            return self._generation
+
+    def set(self, key: str, value: bytes, tags: Iterable[str], generation: Optional[int] = None) -> None:
+        """Store value, unless generation is given and tags were invalidated since."""
+        tags = list(tags)
+        # Held across the backend write: an invalidation either stamps the
+        # tags first (and this set is skipped) or drops the entry after it.
+        with self._lock:
+            if generation is not None and (
+                self._cleared_at > generation
+                or any(self._tag_generations.get(tag, 0) > generation for tag in tags)
+            ):
+                self.stale_sets += 1
+                return
+            self.backend.set(key, value, tags)
+
+    def invalidate_memberships(self, memberships: Iterable[tuple[int, int, int]]) -> None:
+        """Invalidate responses built from the given (team_id, season_id, player_id) rows."""
+        tags = set()
+        for team_id, season_id, player_id in memberships:
+            tags.add(team_season_tag(team_id, season_id))
+            tags.add(player_tag(player_id))
+        if not tags:
+            return
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                self._tag_generations[tag] = self._generation
+        dropped = self.backend.invalidate_tags(tags)
+        with self._lock:
+            self.invalidated += dropped
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._cleared_at = self._generation
+        dropped = self.backend.clear()
+        with self._lock:
+            self.invalidated += dropped
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            data = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "invalidated": self.invalidated,
+                "stale_sets": self.stale_sets,
+            }
+        data.update(self.backend.stats())
+        return data
+
+
+response_cache = ResponseCache(
+    LRUCacheBackend(
+        max_entries=get_settings().cache_max_entries,
+        ttl=get_settings().cache_ttl_seconds,
+    )
+)
+
+
+def set_cache_backend(backend: CacheBackend) -> None:
+    """Swap the storage behind response_cache (e.g. for a cross-process backend)."""
+    response_cache.backend = backend
+
+
+# ---- Write-through invalidation ----
+
+# Invalidate only once the rows are committed, so a concurrent reader can't
+# re-cache the old roster between invalidation and commit (readers that
+# loaded it before the commit are turned away by the generation check).
+on_roster_commit(response_cache.invalidate_memberships)
+
+
+# ---- Cross-process invalidation ----
+
+class ChangeFeedSync:
+    """Invalidates the cache for roster changes other processes committed, via the change log."""
+
+    def __init__(self, cache: ResponseCache, interval: float, max_changes: int = CACHE_SYNC_MAX_CHANGES) -> None:
+        self.cache = cache
+        self.interval = interval
+        self.max_changes = max_changes
+        self.last_seq: Optional[int] = None
+        self.clears = 0
+        self.last_error: Optional[str] = None
+
+    def sync(self) -> None:
+        """Invalidate entries for roster changes logged since the last call (blocking)."""
+        with SessionLocal() as db:
+            latest = db.execute(select(func.max(Change.seq))).scalar_one() or 0
+            last_seq = self.last_seq
+            if last_seq is None or latest < last_seq or latest - last_seq > self.max_changes:
+                # First look (nothing cached predates it), a reset log, or too
+                # many changes to read: start over from an empty cache.
+                if last_seq is not None:
+                    self.cache.clear()
+                    self.clears += 1
+            elif latest > last_seq:
+                rows = db.execute(
+                    select(Change.data).where(
+                        Change.seq > last_seq,
+                        Change.seq <= latest,
+                        Change.entity == "roster_membership",
+                    )
+                ).scalars()
+                self.cache.invalidate_memberships(
+                    (data["team_id"], data["season_id"], data["player_id"]) for data in rows
+                )
+        # Seqs become visible in commit order (app/change_log.py), so nothing
+        # at or below latest can still show up.
+        self.last_seq = latest
+
+    async def run(self) -> None:
+        """Poll the change log forever, every interval seconds (run as a task)."""
+        while True:
+            try:
+                await run_in_threadpool(self.sync)
+            except Exception as exc:
+                self.last_error = repr(exc)
+                logger.exception("response cache change log sync failed")
+            else:
+                self.last_error = None
+            await asyncio.sleep(self.interval)
+
+    def status(self) -> dict:
+        return {"last_seq": self.last_seq, "clears": self.clears, "last_error": self.last_error}
+
+
+cache_sync = ChangeFeedSync(response_cache, interval=get_settings().cache_sync_interval_seconds)
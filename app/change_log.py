@@ -0,0 +1,102 @@
+"""
+Append-only change log behind GET /changes.
+
+Every insert or delete of a Team, Player, or RosterMembership adds a row to
+the changes table, in the same transaction as the write, with a monotonically
+increasing seq. Clients sync by asking for the changes after the last seq they
+saw, so the cost follows how much changed rather than the size of the data.
+
+How rows get there (the same split as app/roster_writes.py):
+- ORM inserts and deletes are collected by an after_flush hook;
+- Core statements bypass the ORM (the seeder's bulk upserts, POST
+  /rosters/batch), so their callers report the rows with record_changes().
+Collected changes are written by a before_commit hook; rolled-back writes are
+discarded. Updates of existing rows are not logged, and nothing in the API or
+seeder makes any.
+
+Ordering: on Postgres the before_commit hook takes a transaction-level
+advisory lock before it draws seq values. The lock is held until the commit
+completes, so seqs become visible in commit order. A reader that has seen seq
+N will therefore never later find a newly committed row with a smaller seq. A
+plain sequence gives no such guarantee when transactions commit concurrently.
+"""
+
+from datetime import date
+from typing import Iterable, Mapping
+
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models import Change, Player, RosterMembership, Team
+
+INSERT = "insert"
+DELETE = "delete"
+
+# model -> (entity name in the log, columns copied into the change's data)
+TRACKED = {
+    Team: ("team", ("name", "abbreviation")),
+    Player: ("player", ("first_name", "last_name", "position")),
+    RosterMembership: (
+        "roster_membership",
+        ("team_id", "player_id", "season_id", "start_date", "end_date"),
+    ),
+}
+
+# Arbitrary constant naming the advisory lock that serializes change log commits.
+CHANGE_LOG_LOCK_KEY = 0x6E62615F63686E67
+
+CHANGES_PAGE_SIZE = 500
+MAX_CHANGES_PAGE_SIZE = 5000
+WRITE_CHUNK_SIZE = 5000
+
+_PENDING_KEY = "pending_changes"
+
+
+def _change(model, op: str, row) -> dict:
+    """A changes row for an ORM object or a mapping of its columns."""
+    entity, fields = TRACKED[model]
+    if not isinstance(row, Mapping):
+        row = {name: getattr(row, name) for name in ("id", *fields)}
+    data = {f: row[f].isoformat() if isinstance(row[f], date) else row[f] for f in fields}
+    return {"entity": entity, "op": op, "entity_id": row["id"], "data": data}
+
+
+def record_changes(session: Session, model, op: str, rows: Iterable[Mapping]) -> None:
+    """
+    Log Core-statement inserts or deletes of model rows in session's transaction.
+
+    rows are mappings holding id and the model's tracked columns, e.g. the
+    .mappings() of an INSERT/DELETE ... RETURNING.
+    """
+    session.info.setdefault(_PENDING_KEY, []).extend(_change(model, op, row) for row in rows)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_orm_changes(session, flush_context) -> None:
+    # new/deleted still hold the pre-flush state here; new rows have their ids.
+    changes = [
+        _change(type(obj), op, obj)
+        for op, objects in ((INSERT, session.new), (DELETE, session.deleted))
+        for obj in objects
+        if type(obj) in TRACKED
+    ]
+    if changes:
+        session.info.setdefault(_PENDING_KEY, []).extend(changes)
+
+
+@event.listens_for(Session, "before_commit")
+def _write_changes(session) -> None:
+    # Commit flushes after this hook; flush now so ORM changes are collected.
+    session.flush()
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    if session.get_bind().dialect.name == "postgresql":
+        session.execute(select(func.pg_advisory_xact_lock(CHANGE_LOG_LOCK_KEY)))
+    for start in range(0, len(pending), WRITE_CHUNK_SIZE):
+        session.execute(insert(Change), pending[start : start + WRITE_CHUNK_SIZE])
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back_changes(session, previous_transaction) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,42 @@
+"""
+HTTP conditional requests (ETag / If-None-Match) for JSON read endpoints.
+
+Every read response carries a strong ETag: a hash of its serialized body. A
+client that sends the ETag back in If-None-Match gets an empty 304 when
+nothing changed. Combined with the response cache (app/cache.py), an
+unchanged roster is answered without touching the database, without
+serializing, and without resending the payload. Cache entries are invalidated
+on roster writes, so the ETag changes as soon as the data does.
+"""
+
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+def etag_for(body: bytes) -> str:
+    """Strong ETag for a response body."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        # If-None-Match uses weak comparison: W/"x" matches "x".
+        if candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def conditional_json_response(request: Request, body: bytes) -> Response:
+    """Serve serialized JSON with an ETag, or a 304 if the client already has it."""
+    etag = etag_for(body)
+    headers = {"ETag": etag}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
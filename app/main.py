@@ -1,6 +1,91 @@
-from fastapi import FastAPI
+import asyncio
+import tempfile
+from collections import Counter
+from contextlib import asynccontextmanager
+from datetime import date
+from typing import Optional
 
-app = FastAPI()
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import String, and_, bindparam, func, select, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, contains_eager, joinedload
+
+from app.cache import cache_sync, player_tag, response_cache, team_season_tag
+from app.change_log import CHANGES_PAGE_SIZE, MAX_CHANGES_PAGE_SIZE
+from app.conditional import conditional_json_response
+from app.config import get_settings
+from app.db import (
+    async_pool_metrics,
+    dispose_engines,
+    get_async_engine,
+    get_db,
+    get_engine,
+    pool_metrics,
+)
+from app.models import Change, Player, RosterMembership, Season, Team, TeamSeasonAnalytics
+from app.observability import RequestMetricsMiddleware, route_metrics
+from app.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor
+from app.read_model import read_model
+from app.replicas import get_async_read_db, get_read_db, replica_router
+from app.roster_batch import KEY_FIELDS, apply_roster_batch
+from app.roster_export import MEDIA_TYPES, stream_roster_export
+from app.schemas import (
+    ChangePage,
+    PlayerHistoryPage,
+    PlayerPage,
+    PlayerResolveRequest,
+    PlayerResolveResult,
+    PlayerResponse,
+    RosterBatchRequest,
+    RosterBatchResponse,
+    RosterMembershipDetail,
+    TeamResolveRequest,
+    TeamResolveResult,
+    TeammatePath,
+    TeammateResponse,
+    TeamSeasonAnalyticsResponse,
+)
+from app.search import MIN_QUERY_LENGTH, normalize_query, player_search
+from app.stints import active_on
+from app.teammates import teammate_graph
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Engines are built here instead of at import time; connections are
+    # still opened lazily by the pools.
+    get_engine()
+    get_async_engine()
+    background = [asyncio.create_task(teammate_graph.warm())]
+    if get_settings().cache_max_entries > 0:
+        background.append(asyncio.create_task(cache_sync.run()))
+    if read_model.enabled:
+        background.append(asyncio.create_task(read_model.run()))
+    if replica_router.replicas:
+        background.append(asyncio.create_task(replica_router.run_health_checks()))
+    yield
+    for task in background:
+        task.cancel()
+    await replica_router.dispose()
+    await dispose_engines()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(RequestMetricsMiddleware)
+
+_roster_adapter = TypeAdapter(list[RosterMembershipDetail])
+_players_adapter = TypeAdapter(list[PlayerResponse])
+_teammates_adapter = TypeAdapter(list[TeammateResponse])
+_path_adapter = TypeAdapter(TeammatePath)
+
+
+def _conditional(request: Request, adapter: TypeAdapter, data) -> Response:
+    """Serialize data (ORM objects allowed) with adapter; respond with an ETag or 304."""
+    body = adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+    return conditional_json_response(request, body)
 
 
 @app.get("/health")
@@ -8,3 +93,590 @@ async def health():
     """Health check endpoint to verify the API is running."""
     return {"status": "ok"}
 
+
+@app.get("/health/pool")
+async def pool_health():
+    """Internal: connection pool checkout/checkin counts and wait times per engine."""
+    return {"sync": pool_metrics.snapshot(), "async": async_pool_metrics.snapshot()}
+
+
+@app.get("/health/replicas")
+async def replica_health():
+    """Internal: read replica health, reads served per replica, and primary fallbacks."""
+    return replica_router.status()
+
+
+@app.get("/health/read-model")
+async def read_model_health():
+    """Internal: in-memory read model state, data version, size, and load time."""
+    return read_model.status()
+
+
+@app.get("/health/cache")
+async def cache_health():
+    """Internal: response cache hit/miss counters, size, and change log sync state."""
+    return {**response_cache.stats(), "change_log_sync": cache_sync.status()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Internal: per-route latency and SQL query histograms in Prometheus text format."""
+    return PlainTextResponse(
+        route_metrics.render(), media_type="text/plain; version=0.0.4"
+    )
+
+
+@app.get(
+    "/teams/{abbreviation}/seasons/{year}/roster",
+    response_model=list[RosterMembershipDetail],
+)
+async def get_team_season_roster(
+    abbreviation: str,
+    year: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    A team's roster for one season, with team, player, and season nested.
+    Every stint is listed, so a player who left and came back appears twice.
+
+    The whole roster comes back in one query: team, season, and player are
+    joined in a single statement (the filter hits the (team_id, season_id)
+    prefix of unique_roster_membership) and the joined rows populate the
+    nested objects via contains_eager. A second query
+    runs only when the roster is empty, to tell "unknown team/season" (404)
+    apart from an empty roster.
+
+    Non-empty rosters are served from the response cache until a membership
+    for that (team, season) is written. With the read model enabled
+    (app/read_model.py), misses are answered from memory without SQL.
+    """
+    abbreviation = abbreviation.upper()
+    cache_key = f"roster:{abbreviation}:{year}"
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return conditional_json_response(request, cached)
+
+    generation = response_cache.generation()
+    model = read_model.current()
+    if model is not None:
+        team = model.teams_by_abbreviation.get(abbreviation)
+        season = model.seasons_by_year.get(year)
+        if team is None:
+            raise HTTPException(status_code=404, detail=f"Team {abbreviation} not found")
+        if season is None:
+            raise HTTPException(status_code=404, detail=f"Season {year} not found")
+        memberships = model.roster(team.id, season.id)
+        if not memberships:
+            return conditional_json_response(request, b"[]")
+    else:
+        memberships = await _query_roster(db, abbreviation, Season.year == year)
+    if memberships:
+        body = _roster_adapter.dump_json(
+            _roster_adapter.validate_python(memberships, from_attributes=True)
+        )
+        first = memberships[0]
+        response_cache.set(
+            cache_key, body, tags=[team_season_tag(first.team_id, first.season_id)], generation=generation
+        )
+        return conditional_json_response(request, body)
+
+    team_id, season_id = (
+        await db.execute(
+            select(
+                select(Team.id).where(Team.abbreviation == abbreviation).scalar_subquery(),
+                select(Season.id).where(Season.year == year).scalar_subquery(),
+            )
+        )
+    ).one()
+    if team_id is None:
+        raise HTTPException(status_code=404, detail=f"Team {abbreviation} not found")
+    if season_id is None:
+        raise HTTPException(status_code=404, detail=f"Season {year} not found")
+    return conditional_json_response(request, b"[]")
+
+
+async def _query_roster(db: AsyncSession, abbreviation: str, *criteria) -> list:
+    """A team's memberships matching criteria, with team, season, and player loaded, in one join."""
+    stmt = (
+        select(RosterMembership)
+        .join(RosterMembership.team)
+        .join(RosterMembership.season)
+        .join(RosterMembership.player)
+        .where(Team.abbreviation == abbreviation, *criteria)
+        .options(
+            contains_eager(RosterMembership.team),
+            contains_eager(RosterMembership.season),
+            contains_eager(RosterMembership.player),
+        )
+        .order_by(Player.last_name, Player.first_name, RosterMembership.start_date, RosterMembership.id)
+    )
+    return (await db.execute(stmt)).scalars().all()
+
+
+@app.get("/teams/{abbreviation}/roster", response_model=list[RosterMembershipDetail])
+async def get_team_roster_as_of(
+    abbreviation: str,
+    request: Request,
+    as_of: Optional[date] = Query(None, description="Roster date (YYYY-MM-DD); defaults to today."),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    A team's roster on one date: every stint that covers as_of.
+
+    Mid-season moves show up here: a player traded on February 8 is on the old
+    team's roster through February 7 and on the new team's from February 8.
+    On Postgres the stint filter is an index scan of the GiST index behind
+    roster_stint_no_overlap (see app/stints.py), not a scan of every stint the
+    team ever had. An empty roster is only a 404 if the team is unknown.
+    """
+    abbreviation = abbreviation.upper()
+    memberships = await _query_roster(db, abbreviation, active_on(as_of or date.today()))
+    if not memberships:
+        team_id = (
+            await db.execute(select(Team.id).where(Team.abbreviation == abbreviation))
+        ).scalar_one_or_none()
+        if team_id is None:
+            raise HTTPException(status_code=404, detail=f"Team {abbreviation} not found")
+    return _conditional(request, _roster_adapter, memberships)
+
+
+@app.post("/teams/resolve", response_model=list[TeamResolveResult])
+async def resolve_teams(
+    body: TeamResolveRequest, db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Map each abbreviation (case-insensitive) to its team id in one IN query.
+
+    Results are in input order, one per input; unknown abbreviations come back
+    with id null and found false.
+    """
+    wanted = {a.upper() for a in body.abbreviations}
+    ids = {}
+    model = read_model.current()
+    if model is not None:
+        ids = model.team_ids(wanted)
+    elif wanted:
+        rows = await db.execute(
+            select(Team.abbreviation, Team.id).where(Team.abbreviation.in_(wanted))
+        )
+        ids = dict(rows.all())
+    results = []
+    for abbreviation in body.abbreviations:
+        team_id = ids.get(abbreviation.upper())
+        results.append(
+            {"abbreviation": abbreviation, "id": team_id, "found": team_id is not None}
+        )
+    return results
+
+
+@app.get("/players", response_model=PlayerPage)
+async def list_players(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """All players ordered by id, keyset-paginated (?cursor= from the previous page)."""
+    after_id = decode_cursor(cursor, 1)[0] if cursor else None
+    model = read_model.current()
+    if model is not None:
+        players = model.players_after(after_id, limit + 1)
+    else:
+        stmt = select(Player).order_by(Player.id).limit(limit + 1)
+        if after_id is not None:
+            stmt = stmt.where(Player.id > after_id)
+        players = (await db.execute(stmt)).scalars().all()
+    # One extra row tells us whether another page exists without a COUNT.
+    next_cursor = encode_cursor(players[limit - 1].id) if len(players) > limit else None
+    page = PlayerPage.model_validate(
+        {"items": players[:limit], "next_cursor": next_cursor}, from_attributes=True
+    )
+    return conditional_json_response(request, page.model_dump_json().encode())
+
+
+@app.get("/players/search", response_model=list[PlayerResponse])
+async def search_players(
+    request: Request,
+    q: str = Query(..., min_length=MIN_QUERY_LENGTH),
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Typeahead player search: every whitespace-separated fragment of q must
+    appear in the player's full name, case-insensitively ("lebr jam").
+    Ranked exact > full-name prefix > first/last-name prefix > substring.
+
+    Answered from the in-process index in app/search.py; the only database
+    work per request is a max(id) freshness check.
+    """
+    tokens = normalize_query(q)
+    if not tokens:
+        raise HTTPException(status_code=422, detail="q must contain a search term")
+    index = await player_search.get_index(db)
+    return _conditional(request, _players_adapter, index.search(tokens, limit))
+
+
+def _players_named(dialect: str, names: set[tuple[str, str]]):
+    """(first_name, last_name, id) of the players with any of names, by id."""
+    stmt = select(Player.first_name, Player.last_name, Player.id).order_by(Player.id)
+    if dialect != "postgresql":
+        return stmt.where(tuple_(Player.first_name, Player.last_name).in_(names))
+    first_names, last_names = zip(*names)
+    wanted = (
+        func.unnest(
+            bindparam("first_names", list(first_names), type_=ARRAY(String)),
+            bindparam("last_names", list(last_names), type_=ARRAY(String)),
+        )
+        .table_valued("first_name", "last_name")
+        .render_derived(name="wanted")
+    )
+    return stmt.join(
+        wanted,
+        and_(Player.first_name == wanted.c.first_name, Player.last_name == wanted.c.last_name),
+    )
+
+
+@app.post("/players/resolve", response_model=list[PlayerResolveResult])
+async def resolve_players(
+    body: PlayerResolveRequest, db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Map each (first_name, last_name) to a player id in one query.
+
+    Names match exactly, like the seeder's get_or_create_player; if several
+    players share a name the lowest id wins. Results are in input order, one
+    per input; unknown names come back with id null and found false.
+
+    On Postgres the names are joined as unnest(first_names, last_names): two
+    array parameters and a flat hash join however many names come in. An
+    OR'd (first, last) IN list there makes the planner cost one index probe
+    per pair, and planning alone took longer than running the query.
+    """
+    wanted = {(p.first_name, p.last_name) for p in body.players}
+    ids: dict[tuple[str, str], int] = {}
+    model = read_model.current()
+    if model is not None:
+        ids = model.player_ids_for(wanted)
+    elif wanted:
+        rows = await db.execute(_players_named(db.get_bind().dialect.name, wanted))
+        for first_name, last_name, player_id in rows:
+            ids.setdefault((first_name, last_name), player_id)
+    results = []
+    for p in body.players:
+        player_id = ids.get((p.first_name, p.last_name))
+        results.append(
+            {
+                "first_name": p.first_name,
+                "last_name": p.last_name,
+                "id": player_id,
+                "found": player_id is not None,
+            }
+        )
+    return results
+
+
+@app.get("/players/{player_id}/history", response_model=PlayerHistoryPage)
+async def get_player_history(
+    player_id: int,
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Every roster membership for a player across seasons (trades, free agency).
+
+    Ordered by season year, then membership id, and keyset-paginated on that
+    pair. Memberships are found through idx_player_season, or in the read
+    model when it is enabled. Pages are served from the response cache until
+    one of the player's memberships is written.
+    """
+    cache_key = f"player_history:{player_id}:{cursor or ''}:{limit}"
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return conditional_json_response(request, cached)
+
+    generation = response_cache.generation()
+    after = decode_cursor(cursor, 2) if cursor else None
+    model = read_model.current()
+    if model is not None:
+        player = model.players.get(player_id)
+        if player is None:
+            raise HTTPException(status_code=404, detail=f"Player {player_id} not found")
+        memberships = model.history(player_id, after, limit + 1)
+    else:
+        player = await db.get(Player, player_id)
+        if player is None:
+            raise HTTPException(status_code=404, detail=f"Player {player_id} not found")
+
+        stmt = (
+            select(RosterMembership)
+            .join(RosterMembership.team)
+            .join(RosterMembership.season)
+            .where(RosterMembership.player_id == player_id)
+            .options(
+                contains_eager(RosterMembership.team),
+                contains_eager(RosterMembership.season),
+            )
+            .order_by(Season.year, RosterMembership.id)
+            .limit(limit + 1)
+        )
+        if after is not None:
+            stmt = stmt.where(tuple_(Season.year, RosterMembership.id) > tuple_(*after))
+        memberships = (await db.execute(stmt)).scalars().all()
+        # The player is already in the session's identity map, so the nested
+        # player on each membership resolves without another query.
+    next_cursor = None
+    if len(memberships) > limit:
+        last = memberships[limit - 1]
+        next_cursor = encode_cursor(last.season.year, last.id)
+    page = PlayerHistoryPage.model_validate(
+        {"player": player, "items": memberships[:limit], "next_cursor": next_cursor},
+        from_attributes=True,
+    )
+    body = page.model_dump_json().encode()
+    response_cache.set(cache_key, body, tags=[player_tag(player_id)], generation=generation)
+    return conditional_json_response(request, body)
+
+
+@app.get("/players/{player_id}/teammates", response_model=list[TeammateResponse])
+async def get_teammates(
+    player_id: int,
+    request: Request,
+    current: bool = False,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Everyone who shared a roster with the player, most seasons together first.
+
+    current=true keeps only teammates on a roster in the latest season.
+    Answered from the in-memory teammate graph (app/teammates.py); the
+    database is only asked for the returned players' names.
+    """
+    graph = await teammate_graph.get_graph(db)
+    if not graph.has_player(player_id) and await db.get(Player, player_id) is None:
+        raise HTTPException(status_code=404, detail=f"Player {player_id} not found")
+    season_id = graph.latest_season_id() if current else None
+    teammates = graph.teammates(player_id, season_id)[:limit]
+    players = {
+        p.id: p
+        for p in (
+            await db.execute(select(Player).where(Player.id.in_([t[0] for t in teammates])))
+        ).scalars()
+    }
+    return _conditional(
+        request,
+        _teammates_adapter,
+        [
+            {"player": players[teammate_id], "seasons_together": count, "last_season": year}
+            for teammate_id, count, year in teammates
+            if teammate_id in players
+        ],
+    )
+
+
+@app.get("/players/{player_id}/path/{other_id}", response_model=TeammatePath)
+async def get_teammate_path(
+    player_id: int, other_id: int, request: Request, db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Shortest chain of teammates connecting two players ("degrees of separation").
+
+    links[i] is the team-season players[i] and players[i + 1] shared. Found by
+    bidirectional BFS over the in-memory teammate graph.
+    """
+    graph = await teammate_graph.get_graph(db)
+    path = graph.shortest_path(player_id, other_id)
+    if path is None:
+        found = (
+            await db.execute(select(Player.id).where(Player.id.in_([player_id, other_id])))
+        ).scalars().all()
+        if player_id == other_id and found:
+            path = [player_id]
+        else:
+            for missing in (player_id, other_id):
+                if missing not in found:
+                    raise HTTPException(status_code=404, detail=f"Player {missing} not found")
+            raise HTTPException(
+                status_code=404,
+                detail=f"Players {player_id} and {other_id} were never connected through teammates",
+            )
+
+    player_ids, links = path[0::2], path[1::2]
+    players = {
+        p.id: p
+        for p in (await db.execute(select(Player).where(Player.id.in_(player_ids)))).scalars()
+    }
+    teams = {
+        t.id: t
+        for t in (
+            await db.execute(select(Team).where(Team.id.in_({team_id for team_id, _ in links})))
+        ).scalars()
+    }
+    return _conditional(
+        request,
+        _path_adapter,
+        {
+            "degrees": len(links),
+            "players": [players[pid] for pid in player_ids],
+            "links": [
+                {
+                    "team": teams[team_id],
+                    "season": {"id": season_id, "year": graph.season_years[season_id]},
+                }
+                for team_id, season_id in links
+            ],
+        },
+    )
+
+
+@app.post("/rosters/batch", response_model=RosterBatchResponse)
+def apply_roster_moves(body: RosterBatchRequest, db: Session = Depends(get_db)):
+    """
+    Add and remove up to 10,000 roster memberships each in one transaction.
+
+    Additions are stints: start_date / end_date default to the season's, so a
+    mid-season trade is a removal plus two dated additions. A removal deletes
+    every stint of the player with that team in that season.
+
+    Items are validated in bulk and written set-based (see app/roster_batch.py);
+    additions that already exist or overlap an existing stint are left alone
+    rather than failing the batch. Each item gets a status: inserted,
+    already_present, deleted, not_found, invalid (unknown team/player/season
+    id, or dates outside the season), or duplicate (repeats an earlier item;
+    for additions, resolves to the same stint as one).
+    """
+    added, removed = apply_roster_batch(
+        db,
+        ((m.team_id, m.player_id, m.season_id, m.start_date, m.end_date) for m in body.add),
+        ((m.team_id, m.player_id, m.season_id) for m in body.remove),
+    )
+    db.commit()
+    results = [
+        {"op": op, **dict(zip(KEY_FIELDS, key)), "status": status, "detail": detail}
+        for op, items in (("add", added), ("remove", removed))
+        for key, status, detail in items
+    ]
+    return {"counts": dict(Counter(r["status"] for r in results)), "results": results}
+
+
+def _analytics_query():
+    return (
+        select(TeamSeasonAnalytics)
+        .join(TeamSeasonAnalytics.team)
+        .join(TeamSeasonAnalytics.season)
+        .options(
+            contains_eager(TeamSeasonAnalytics.team),
+            contains_eager(TeamSeasonAnalytics.season),
+            joinedload(TeamSeasonAnalytics.previous_season),
+        )
+    )
+
+
+@app.get(
+    "/analytics/teams/{abbreviation}/seasons/{year}",
+    response_model=TeamSeasonAnalyticsResponse,
+)
+async def get_team_season_analytics(
+    abbreviation: str, year: int, db: AsyncSession = Depends(get_async_read_db)
+):
+    """Roster size, position counts, and turnover vs. the previous season (precomputed)."""
+    abbreviation = abbreviation.upper()
+    stmt = _analytics_query().where(Team.abbreviation == abbreviation, Season.year == year)
+    analytics = (await db.execute(stmt)).scalar_one_or_none()
+    if analytics is None:
+        raise HTTPException(
+            status_code=404, detail=f"No roster analytics for {abbreviation} in {year}"
+        )
+    return analytics
+
+
+@app.get("/analytics/teams", response_model=list[TeamSeasonAnalyticsResponse])
+async def list_team_season_analytics(
+    season: Optional[int] = None, db: AsyncSession = Depends(get_async_read_db)
+):
+    """League-wide analytics for every team-season, or one season with ?season=."""
+    stmt = _analytics_query().order_by(Season.year, Team.abbreviation)
+    if season is not None:
+        stmt = stmt.where(Season.year == season)
+    return (await db.execute(stmt)).scalars().all()
+
+
+@app.get("/changes", response_model=ChangePage)
+async def list_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(CHANGES_PAGE_SIZE, ge=1, le=MAX_CHANGES_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Inserts and deletes of teams, players, and roster memberships after seq `since`.
+
+    Keyset-paged on the changes primary key, oldest first. Clients keep the
+    last next_since and poll with it; to bootstrap, note latest_seq, do a full
+    pull, then sync from that seq. Seqs become visible in commit order (see
+    app/change_log.py), so nothing is skipped.
+    """
+    changes = (
+        await db.execute(
+            select(Change).where(Change.seq > since).order_by(Change.seq).limit(limit + 1)
+        )
+    ).scalars().all()
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    latest_seq = (await db.execute(select(func.max(Change.seq)))).scalar_one() or 0
+    return {
+        "items": changes,
+        "next_since": changes[-1].seq if changes else since,
+        "has_more": has_more,
+        "latest_seq": latest_seq,
+    }
+
+
+@app.get("/export/roster-matrix.npz", response_class=StreamingResponse)
+def export_roster_matrix(db: Session = Depends(get_read_db)):
+    """
+    League-wide team x player x season memberships as a NumPy .npz archive
+    (COO index arrays plus team/player/season lookups; see app/matrix_export.py).
+
+    A plain `def` endpoint: the export reads with a blocking server-side
+    cursor, so FastAPI runs it in the threadpool.
+    """
+    # Imported here: numpy is the slowest import in the app and only this
+    # endpoint needs it.
+    from app.matrix_export import write_roster_matrix
+
+    # Spools to disk past 16 MB so large exports don't sit in memory.
+    out = tempfile.SpooledTemporaryFile(max_size=16 * 1024 * 1024)
+    write_roster_matrix(db, out)
+    out.seek(0)
+
+    def chunks():
+        with out:
+            while chunk := out.read(64 * 1024):
+                yield chunk
+
+    return StreamingResponse(
+        chunks(),
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": 'attachment; filename="roster-matrix.npz"'},
+    )
+
+
+@app.get("/export/rosters", response_class=StreamingResponse)
+def export_rosters(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    season: Optional[int] = None,
+    team: Optional[str] = None,
+):
+    """
+    Every roster membership (optionally one season and/or team) as NDJSON or
+    CSV, streamed from a server-side cursor in constant memory.
+    """
+    filename = f"rosters.{format}"
+    return StreamingResponse(
+        stream_roster_export(format, season, team),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,108 @@
+"""
+Vectorized export of the league-wide team x player x season membership matrix.
+
+The export is a NumPy .npz archive of flat arrays instead of one JSON object
+per roster row:
+
+    team_idx, player_idx, season_idx   int32, one entry per (team, player, season)
+                                       with at least one stint (COO coordinates
+                                       into the lookups below)
+    team_ids, team_abbreviations, team_names
+    player_ids, player_first_names, player_last_names, player_positions
+    season_ids, season_years
+
+Lookup arrays are sorted by database id, so entity k of the lookup is index k
+in the coordinate arrays. For example, a season's player x team matrix is
+    mask = season_idx == k
+    scipy.sparse.coo_matrix((np.ones(mask.sum()), (player_idx[mask], team_idx[mask])))
+
+Rows are read with a server-side cursor in partitions of PARTITION_SIZE.
+Database ids are mapped to dense indexes with np.searchsorted over each
+partition, so no ORM objects and no per-row Python lookups are created.
+"""
+
+from typing import BinaryIO
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Player, RosterMembership, Season, Team
+
+PARTITION_SIZE = 50_000
+
+
+def _stream(session: Session, stmt):
+    """Yield lists of row tuples from a server-side cursor."""
+    result = session.execute(
+        stmt, execution_options={"stream_results": True, "yield_per": PARTITION_SIZE}
+    )
+    for partition in result.partitions():
+        yield partition
+
+
+def _columns(session: Session, stmt, dtypes: list) -> list[np.ndarray]:
+    """Read a (small-width) query into one NumPy array per column."""
+    chunks: list[list[np.ndarray]] = [[] for _ in dtypes]
+    for partition in _stream(session, stmt):
+        for i, column in enumerate(zip(*partition)):
+            chunks[i].append(np.asarray(column, dtype=dtypes[i]))
+    return [
+        np.concatenate(parts) if parts else np.empty(0, dtype=dtypes[i])
+        for i, parts in enumerate(chunks)
+    ]
+
+
+def build_roster_matrix(session: Session) -> dict[str, np.ndarray]:
+    """Read every roster membership and the entity lookups into NumPy arrays."""
+    team_ids, team_abbreviations, team_names = _columns(
+        session,
+        select(Team.id, Team.abbreviation, Team.name).order_by(Team.id),
+        [np.int64, np.str_, np.str_],
+    )
+    player_ids, first_names, last_names, positions = _columns(
+        session,
+        select(Player.id, Player.first_name, Player.last_name, Player.position).order_by(Player.id),
+        [np.int64, np.str_, np.str_, np.str_],
+    )
+    season_ids, season_years = _columns(
+        session, select(Season.id, Season.year).order_by(Season.id), [np.int64, np.int32]
+    )
+
+    coords: dict[str, list[np.ndarray]] = {"team_idx": [], "player_idx": [], "season_idx": []}
+    # One entry per (team, player, season) however many stints it has. Ordered
+    # like unique_roster_membership, so the index provides the order.
+    stmt = (
+        select(RosterMembership.team_id, RosterMembership.player_id, RosterMembership.season_id)
+        .distinct()
+        .order_by(RosterMembership.team_id, RosterMembership.season_id, RosterMembership.player_id)
+    )
+    for partition in _stream(session, stmt):
+        raw = np.asarray(partition, dtype=np.int64)
+        coords["team_idx"].append(np.searchsorted(team_ids, raw[:, 0]).astype(np.int32))
+        coords["player_idx"].append(np.searchsorted(player_ids, raw[:, 1]).astype(np.int32))
+        coords["season_idx"].append(np.searchsorted(season_ids, raw[:, 2]).astype(np.int32))
+
+    arrays = {
+        name: np.concatenate(parts) if parts else np.empty(0, dtype=np.int32)
+        for name, parts in coords.items()
+    }
+    arrays.update(
+        team_ids=team_ids,
+        team_abbreviations=team_abbreviations,
+        team_names=team_names,
+        player_ids=player_ids,
+        player_first_names=first_names,
+        player_last_names=last_names,
+        player_positions=positions,
+        season_ids=season_ids,
+        season_years=season_years,
+    )
+    return arrays
+
+
+def write_roster_matrix(session: Session, out: BinaryIO) -> int:
+    """Write the compressed .npz export to out; returns the number of memberships."""
+    arrays = build_roster_matrix(session)
+    np.savez_compressed(out, **arrays)
+    return len(arrays["team_idx"])
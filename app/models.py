@@ -5,11 +5,46 @@ These models represent the core entities: Teams, Players, Seasons, and
 the relationships between them through RosterMembership.
 """
 
-from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint, Index
+from datetime import date
+
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    CheckConstraint,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    JSON,
+    String,
+    UniqueConstraint,
+    event,
+    func,
+    literal_column,
+)
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import relationship
 from app.db import Base
 
 
+def season_dates(year: int) -> tuple[date, date]:
+    """
+    Default [start, end) dates of the season stored as year.
+
+    The season ending in year: October 1 of the year before through June 30
+    (end is exclusive, so July 1). The seeder uses it for new seasons, and the
+    migration that added the columns backfilled existing ones the same way.
+    """
+    return date(year - 1, 10, 1), date(year, 7, 1)
+
+
+def stint_range(start, end):
+    """daterange(start, end, '[)'): the expression the stint exclusion constraint indexes."""
+    return func.daterange(start, end, literal_column("'[)'"))
+
+
 class Team(Base):
     """
     Represents an NBA team.
@@ -18,8 +53,8 @@ class Team(Base):
     """
     __tablename__ = "teams"
     
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, nullable=False, index=True)  # e.g., "Los Angeles Lakers"
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)  # e.g., "Los Angeles Lakers"
     abbreviation = Column(String(3), nullable=False, unique=True, index=True)  # e.g., "LAL"
     
     # Relationship: one team can have many roster memberships
@@ -34,13 +69,18 @@ class Player(Base):
     """
     __tablename__ = "players"
     
-    id = Column(Integer, primary_key=True, index=True)
-    first_name = Column(String, nullable=False, index=True)
-    last_name = Column(String, nullable=False, index=True)
-    position = Column(String, nullable=False, index=True)  # e.g., "PG", "SG", "SF", "PF", "C"
+    id = Column(Integer, primary_key=True)
+    first_name = Column(String, nullable=False)
+    last_name = Column(String, nullable=False)
+    position = Column(String, nullable=False)  # e.g., "PG", "SG", "SF", "PF", "C"
     
     # Relationship: one player can have many roster memberships (across different teams/seasons)
     roster_memberships = relationship("RosterMembership", back_populates="player")
+    
+    __table_args__ = (
+        # Name lookups (resolve endpoint, seeder get-or-create) match both columns
+        Index("idx_player_name", "last_name", "first_name"),
+    )
 
 
 class Season(Base):
@@ -48,12 +88,15 @@ class Season(Base):
     Represents an NBA season.
     
     Example: 2023-24 season, 2024-25 season, etc.
-    We store just the year (e.g., 2024) to represent the season.
+    The year (e.g., 2024) identifies the season; start_date and end_date bound
+    it as [start_date, end_date), normally season_dates(year).
     """
     __tablename__ = "seasons"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     year = Column(Integer, nullable=False, unique=True, index=True)  # e.g., 2024
+    start_date = Column(Date, nullable=False)  # e.g., 2023-10-01
+    end_date = Column(Date, nullable=False)  # e.g., 2024-07-01 (exclusive)
     
     # Relationship: one season can have many roster memberships
     roster_memberships = relationship("RosterMembership", back_populates="season")
@@ -61,7 +104,7 @@ class Season(Base):
 
 class RosterMembership(Base):
     """
-    Represents a player being on a team's roster for a specific season.
+    Represents one stint of a player on a team's roster within a season.
     
     Why this model exists:
     - A player can be on different teams in different seasons (trades, free agency)
@@ -71,28 +114,115 @@ class RosterMembership(Base):
     Example: LeBron James was on the Lakers in 2023-24 season, 
              but was on the Cavaliers in 2017-18 season.
     
-    The unique constraint ensures a player can only be on a team once per season
-    (prevents duplicate entries).
+    A stint covers [start_date, end_date): a player traded on February 8 has
+    one stint ending 02-08 and another, on the new team, starting 02-08.
+    Full-season stints use the season's dates. A player can have several
+    stints with the same team in one season, but on Postgres an exclusion
+    constraint rejects stints of the same player and team that overlap. Its
+    GiST index also answers "who was on team T on date D" (see app/stints.py).
     """
     __tablename__ = "roster_memberships"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     
     # Foreign keys: links to Team, Player, and Season
-    team_id = Column(Integer, ForeignKey("teams.id"), nullable=False, index=True)
-    player_id = Column(Integer, ForeignKey("players.id"), nullable=False, index=True)
+    # (team_id and player_id are indexed as the leading columns of the
+    # unique constraint and idx_player_season below)
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
+    player_id = Column(Integer, ForeignKey("players.id"), nullable=False)
     season_id = Column(Integer, ForeignKey("seasons.id"), nullable=False, index=True)
+    start_date = Column(Date, nullable=False)  # first day on the roster
+    end_date = Column(Date, nullable=False)  # first day off the roster (exclusive)
     
     # Relationships: connect back to the related models
     team = relationship("Team", back_populates="roster_memberships")
     player = relationship("Player", back_populates="roster_memberships")
     season = relationship("Season", back_populates="roster_memberships")
     
-    # Unique constraint: a player can only be on a team once per season
-    # This prevents duplicate roster entries
+    # Unique constraint: one stint per team, season, player and start date.
+    # This prevents duplicate roster entries. Its (team_id, season_id) prefix
+    # is also the index for "get all players on a team in a season".
     __table_args__ = (
-        UniqueConstraint("team_id", "player_id", "season_id", name="unique_roster_membership"),
-        # Index for faster queries like "get all players on a team in a season"
-        Index("idx_team_season", "team_id", "season_id"),
+        UniqueConstraint("team_id", "season_id", "player_id", "start_date", name="unique_roster_membership"),
+        CheckConstraint("start_date < end_date", name="ck_roster_stint_dates"),
+        # No overlapping stints of a player on a team; the GiST index behind it
+        # serves point-in-time roster queries. Postgres only (needs btree_gist).
+        ExcludeConstraint(
+            (team_id, "="),
+            (stint_range(start_date, end_date), "&&"),
+            (player_id, "="),
+            name="roster_stint_no_overlap",
+            using="gist",
+        ).ddl_if(dialect="postgresql"),
+        # Index for a player's career history across seasons
+        Index("idx_player_season", "player_id", "season_id"),
     )
 
+
+# The exclusion constraint compares integer columns with = inside GiST.
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
+
+
+
+class TeamSeasonAnalytics(Base):
+    """
+    Precomputed roster aggregates for one team in one season.
+    
+    Derived data: rebuilt from roster_memberships by app/analytics.py whenever
+    a (team, season) roster changes, so reads never aggregate on the fly.
+    
+    Turnover compares the roster with the same team's roster in the previous
+    season (the closest earlier year in the seasons table):
+    - retained: on both rosters
+    - added: on this roster only
+    - departed: on the previous roster only
+    """
+    __tablename__ = "team_season_analytics"
+    
+    id = Column(Integer, primary_key=True)
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
+    season_id = Column(Integer, ForeignKey("seasons.id"), nullable=False)
+    previous_season_id = Column(Integer, ForeignKey("seasons.id"), nullable=True)
+    
+    roster_size = Column(Integer, nullable=False)
+    position_counts = Column(JSON, nullable=False)  # e.g., {"PG": 3, "C": 2}
+    retained = Column(Integer, nullable=False)
+    added = Column(Integer, nullable=False)
+    departed = Column(Integer, nullable=False)
+    refreshed_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    
+    team = relationship("Team")
+    season = relationship("Season", foreign_keys=[season_id])
+    previous_season = relationship("Season", foreign_keys=[previous_season_id])
+    
+    # One row per team per season; also the lookup index for the analytics endpoints
+    __table_args__ = (
+        UniqueConstraint("team_id", "season_id", name="unique_team_season_analytics"),
+    )
+
+
+class Change(Base):
+    """
+    One insert or delete of a team, player, or roster membership.
+    
+    Append-only log behind GET /changes; written by app/change_log.py in the
+    same transaction as the change itself. seq orders the log: clients ask for
+    the changes after the last seq they have seen.
+    
+    Example: seq 812, entity "roster_membership", op "delete", entity_id 4411,
+             data {"team_id": 14, "player_id": 1, "season_id": 3,
+                   "start_date": "2023-10-01", "end_date": "2024-07-01"}
+    """
+    __tablename__ = "changes"
+    
+    # BIGSERIAL on Postgres; SQLite only auto-increments INTEGER primary keys
+    seq = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    entity = Column(String, nullable=False)  # "team", "player", or "roster_membership"
+    op = Column(String, nullable=False)  # "insert" or "delete"
+    entity_id = Column(Integer, nullable=False)  # no foreign key: deleted rows stay in the log
+    data = Column(JSON, nullable=False)  # the row's columns, e.g. {"name": ..., "abbreviation": ...}
+    changed_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
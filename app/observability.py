@@ -0,0 +1,217 @@
+"""
+Per-request timing and SQL query instrumentation.
+
+RequestMetricsMiddleware times every request, and engine event hooks count
+the SQL statements each request runs and the time spent in them (sync and
+async engines alike; the counters follow the request through the threadpool
+and SQLAlchemy's greenlets via a context variable). The numbers are exposed
+in three places:
+- a Server-Timing response header, e.g.
+      Server-Timing: app;dur=12.4, db;dur=3.1;desc="4 queries"
+  (visible in browser dev tools next to each request). Headers go out
+  before the body, so for streamed responses it covers only the work done
+  before the first byte;
+- GET /metrics, in the Prometheus text format: per-route latency and
+  queries-per-request histograms, plus DB time totals;
+- a warning log on the "app.observability" logger for requests slower than
+  SLOW_REQUEST_MS (default 500), listing their statements grouped by text
+  with a count each, so an N+1 pattern shows up as one statement run N times.
+
+Routes are labelled by their path template (/players/{player_id}/history),
+not the raw path, so label cardinality stays bounded.
+"""
+
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.routing import Match
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Distinct statement texts kept per request for the slow-request log.
+MAX_TRACKED_STATEMENTS = 200
+
+
+class RequestStats:
+    """SQL counters for one request."""
+
+    __slots__ = ("queries", "db_seconds", "statements")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.db_seconds = 0.0
+        # statement text -> [executions, seconds]
+        self.statements: dict[str, list] = {}
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.queries += 1
+        self.db_seconds += seconds
+        entry = self.statements.get(statement)
+        if entry is not None:
+            entry[0] += 1
+            entry[1] += seconds
+        elif len(self.statements) < MAX_TRACKED_STATEMENTS:
+            self.statements[statement] = [1, seconds]
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count statements run on engine (for async engines, pass engine.sync_engine)."""
+
+    # The start time lives on the execution context, which is discarded with
+    # the statement, so a statement that raises (and never reaches
+    # after_cursor_execute) leaves nothing behind on the connection.
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        if context is not None and _current.get() is not None:
+            context._query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop(conn, cursor, statement, parameters, context, executemany):
+        stats = _current.get()
+        started = getattr(context, "_query_started", None)
+        if stats is not None and started is not None:
+            stats.record(statement, time.perf_counter() - started)
+            context._query_started = None
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense."""
+
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += value
+        self.count += 1
+
+
+class RouteMetrics:
+    """Latency, query count, and DB time per (method, route, status)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._latency: dict[tuple, Histogram] = {}
+        self._queries: dict[tuple, Histogram] = {}
+        self._db_seconds: dict[tuple, float] = {}
+
+    def observe(self, labels: tuple, seconds: float, stats: RequestStats) -> None:
+        with self._lock:
+            if labels not in self._latency:
+                self._latency[labels] = Histogram(LATENCY_BUCKETS)
+                self._queries[labels] = Histogram(QUERY_COUNT_BUCKETS)
+                self._db_seconds[labels] = 0.0
+            self._latency[labels].observe(seconds)
+            self._queries[labels].observe(stats.queries)
+            self._db_seconds[labels] += stats.db_seconds
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, help_text, series in (
+                ("http_request_duration_seconds", "Request latency.", self._latency),
+                ("http_request_db_queries", "SQL statements per request.", self._queries),
+            ):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for labels, hist in sorted(series.items()):
+                    base = _label_text(labels)
+                    for bound, count in zip(hist.buckets, hist.counts):
+                        lines.append(f'{name}_bucket{{{base},le="{bound}"}} {count}')
+                    lines.append(f'{name}_bucket{{{base},le="+Inf"}} {hist.count}')
+                    lines.append(f"{name}_sum{{{base}}} {hist.total}")
+                    lines.append(f"{name}_count{{{base}}} {hist.count}")
+            name = "http_request_db_seconds_total"
+            lines.append(f"# HELP {name} Time spent in SQL statements.")
+            lines.append(f"# TYPE {name} counter")
+            for labels, seconds in sorted(self._db_seconds.items()):
+                lines.append(f"{name}{{{_label_text(labels)}}} {seconds}")
+        return "\n".join(lines) + "\n"
+
+
+def _label_text(labels: tuple) -> str:
+    method, route, status = labels
+    return f'method="{method}",route="{route}",status="{status}"'
+
+
+route_metrics = RouteMetrics()
+
+
+def _route_template(scope) -> str:
+    app = scope.get("app")
+    for route in getattr(getattr(app, "router", None), "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+
+def _log_slow_request(scope, elapsed: float, stats: RequestStats) -> None:
+    lines = [
+        f"slow request {scope['method']} {scope['path']}: {elapsed * 1000:.1f} ms, "
+        f"{stats.queries} queries, {stats.db_seconds * 1000:.1f} ms in SQL"
+    ]
+    by_time = sorted(stats.statements.items(), key=lambda item: item[1][1], reverse=True)
+    for statement, (count, seconds) in by_time:
+        lines.append(f"  {count}x {seconds * 1000:.1f} ms  {' '.join(statement.split())}")
+    logger.warning("\n".join(lines))
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware recording latency and SQL stats for every HTTP request."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self.slow_request_seconds = get_settings().slow_request_ms / 1000
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                header = (
+                    f'app;dur={elapsed_ms:.1f}, '
+                    f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries"'
+                )
+                message["headers"] = [*message.get("headers", ()), (b"server-timing", header.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            elapsed = time.perf_counter() - started
+            route_metrics.observe((scope["method"], _route_template(scope), status), elapsed, stats)
+            if elapsed >= self.slow_request_seconds:
+                _log_slow_request(scope, elapsed, stats)
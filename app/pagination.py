@@ -0,0 +1,34 @@
+"""
+Keyset (cursor) pagination helpers.
+
+List endpoints page with an opaque cursor instead of OFFSET: the cursor encodes
+the sort key of the last row returned, and the next page is fetched with
+"WHERE sort_key > cursor", which is an index seek no matter how deep the client
+has paged.
+"""
+
+import base64
+import json
+
+from fastapi import HTTPException
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(*key) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor string."""
+    raw = json.dumps(list(key), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """Decode a cursor produced by encode_cursor; 400 if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+    if not isinstance(key, list) or len(key) != size or not all(isinstance(k, int) for k in key):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return key
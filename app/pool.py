@@ -0,0 +1,154 @@
+"""
+Connection pool configuration and telemetry.
+
+Pool settings come from the DB_POOL_* environment variables (see
+app/config.py) so they can be tuned per deployment without code changes.
+
+PoolMetrics counts checkouts, checkins, new connections, and invalidations,
+and records how long callers waited for a connection, so pool sizes can be
+chosen from data. The numbers are served by GET /health/pool.
+"""
+
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.config import get_settings
+
+
+def pool_settings_from_env() -> dict:
+    """Pool settings as create_engine keyword arguments."""
+    settings = get_settings()
+    return {
+        "pool_size": settings.pool_size,
+        "max_overflow": settings.max_overflow,
+        "pool_timeout": settings.pool_timeout,
+        "pool_recycle": settings.pool_recycle,
+        "pool_pre_ping": settings.pool_pre_ping,
+    }
+
+
+class PoolMetrics:
+    """Thread-safe counters and checkout wait times for one engine's pool."""
+
+    # Recent wait samples kept for percentiles; older samples only feed the totals.
+    WINDOW = 1024
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._recent_waits: deque = deque(maxlen=self.WINDOW)
+        self._engine = None
+
+    def attach(self, engine: Engine) -> None:
+        """Subscribe to the engine's pool events."""
+        self._engine = engine
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.checkins += 1
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def observe_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            self._recent_waits.append(seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            recent = list(self._recent_waits)
+            data = {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_ms": {
+                    "count": self.wait_count,
+                    "mean": (self.wait_total / self.wait_count * 1000) if self.wait_count else 0.0,
+                    "p50": percentile(recent, 50) * 1000,
+                    "p99": percentile(recent, 99) * 1000,
+                    "max": self.wait_max * 1000,
+                },
+            }
+        # Read the pool through the engine: dispose() swaps in a new pool object.
+        pool = self._engine.pool if self._engine is not None else None
+        if isinstance(pool, QueuePool):
+            data["pool"] = {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+            }
+        return data
+
+
+def percentile(samples, pct: float) -> float:
+    """Nearest-rank percentile of samples (0.0 when empty); shared with the bench scripts."""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class _TimedCheckoutMixin:
+    """Times QueuePool._do_get, i.e. how long a caller waited for a connection."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.observe_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.observe_wait(time.perf_counter() - started)
+        return connection
+
+
+def engine_pool_kwargs(url: str, metrics: PoolMetrics, is_async: bool = False) -> dict:
+    """
+    create_engine keyword arguments for an env-configured, instrumented pool.
+
+    SQLite (local development) keeps SQLAlchemy's default pool, which doesn't
+    accept the sizing options; its checkouts are still counted via events.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    base = AsyncAdaptedQueuePool if is_async else QueuePool
+    # The metrics ride on the class so they survive pool.recreate() on dispose().
+    poolclass = type(f"Instrumented{base.__name__}", (_TimedCheckoutMixin, base), {"metrics": metrics})
+    return {"poolclass": poolclass, **pool_settings_from_env()}
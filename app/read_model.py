@@ -0,0 +1,356 @@
+"""
+Compact in-process read model of the league dataset.
+
+With READ_MODEL_ENABLED=true the API keeps teams, players, seasons and roster
+memberships in memory. The roster, player list, player history and resolve
+endpoints answer from it instead of running ORM queries:
+- teams, players and seasons are __slots__ rows keyed by id, plus lookups by
+  abbreviation, year and (first_name, last_name);
+- memberships are six parallel int arrays (id, team, player, season, and
+  stint start/end dates as ordinals);
+- two precomputed indexes map (team, season) and player to membership
+  positions, already in each endpoint's sort order.
+At league scale (~100k memberships) the model takes about 5 MB. A request
+only allocates the few view objects it serializes.
+
+Versioning: each model records a data version, the (row count, max id) of the
+four tables. A background task started by the lifespan handler checks the
+version every READ_MODEL_CHECK_INTERVAL_SECONDS. When the version has moved,
+it loads a new model in a worker thread and swaps it in with one reference
+assignment; requests already running keep the snapshot they started with.
+Roster writes committed in this process (on_roster_commit) make the current
+model stale at once, and endpoints fall back to the database until the next
+load, so clients read their own writes. In-place updates of existing rows are
+not part of the version; neither the API nor the seeder makes any.
+"""
+
+import asyncio
+import bisect
+import logging
+import sys
+import time
+from array import array
+from datetime import date
+from typing import Iterable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import get_settings
+from app.models import Player, RosterMembership, Season, Team
+from app.replicas import read_session
+from app.roster_writes import on_roster_commit
+
+logger = logging.getLogger(__name__)
+
+VERSION_TABLES = (
+    ("teams", Team),
+    ("players", Player),
+    ("seasons", Season),
+    ("roster_memberships", RosterMembership),
+)
+VERSION_KEYS = [f"{name}_{part}" for name, _ in VERSION_TABLES for part in ("count", "max_id")]
+
+
+class TeamRow:
+    __slots__ = ("id", "name", "abbreviation")
+
+    def __init__(self, id: int, name: str, abbreviation: str) -> None:
+        self.id = id
+        self.name = name
+        self.abbreviation = abbreviation
+
+
+class PlayerRow:
+    __slots__ = ("id", "first_name", "last_name", "position")
+
+    def __init__(self, id: int, first_name: str, last_name: str, position: str) -> None:
+        self.id = id
+        self.first_name = first_name
+        self.last_name = last_name
+        self.position = position
+
+
+class SeasonRow:
+    __slots__ = ("id", "year")
+
+    def __init__(self, id: int, year: int) -> None:
+        self.id = id
+        self.year = year
+
+
+class MembershipView:
+    """One membership with its team, player and season attached, built per request."""
+
+    __slots__ = (
+        "id", "team_id", "player_id", "season_id", "start_date", "end_date", "team", "player", "season"
+    )
+
+    def __init__(
+        self, id: int, team: TeamRow, player: PlayerRow, season: SeasonRow, start_date: date, end_date: date
+    ) -> None:
+        self.id = id
+        self.team_id = team.id
+        self.player_id = player.id
+        self.season_id = season.id
+        self.start_date = start_date
+        self.end_date = end_date
+        self.team = team
+        self.player = player
+        self.season = season
+
+
+def data_version(db: Session) -> tuple:
+    """(row count, max id) per table in VERSION_TABLES, in one round trip."""
+    columns = []
+    for _, model in VERSION_TABLES:
+        columns.append(select(func.count()).select_from(model).scalar_subquery())
+        columns.append(select(func.max(model.id)).scalar_subquery())
+    return tuple(db.execute(select(*columns)).one())
+
+
+class LeagueReadModel:
+    """Immutable snapshot of the four league tables with precomputed indexes."""
+
+    def __init__(self, version: tuple, generation: int) -> None:
+        self.version = version
+        self.generation = generation
+        self.teams: dict[int, TeamRow] = {}
+        self.teams_by_abbreviation: dict[str, TeamRow] = {}
+        self.seasons: dict[int, SeasonRow] = {}
+        self.seasons_by_year: dict[int, SeasonRow] = {}
+        self.players: dict[int, PlayerRow] = {}
+        self.player_ids = array("i")  # ascending, for keyset pages
+        self.player_ids_by_name: dict[tuple[str, str], int] = {}
+        self.membership_ids = array("i")
+        self.membership_teams = array("i")
+        self.membership_players = array("i")
+        self.membership_seasons = array("i")
+        self.membership_starts = array("i")  # date.toordinal()
+        self.membership_ends = array("i")
+        self._rosters: dict[tuple[int, int], array] = {}
+        self._histories: dict[int, array] = {}
+        self.loaded_at = time.monotonic()
+        self.load_ms = 0.0
+        self.memory_bytes = 0
+
+    @classmethod
+    def load(cls, db: Session, version: tuple, generation: int) -> "LeagueReadModel":
+        started = time.perf_counter()
+        model = cls(version, generation)
+        for id, name, abbreviation in db.execute(select(Team.id, Team.name, Team.abbreviation)):
+            model.teams[id] = model.teams_by_abbreviation[abbreviation] = TeamRow(id, name, abbreviation)
+        for id, year in db.execute(select(Season.id, Season.year)):
+            model.seasons[id] = model.seasons_by_year[year] = SeasonRow(id, year)
+        players = db.execute(
+            select(Player.id, Player.first_name, Player.last_name, Player.position).order_by(Player.id)
+        )
+        for id, first_name, last_name, position in players:
+            model.players[id] = PlayerRow(id, first_name, last_name, position)
+            model.player_ids.append(id)
+            # Same rule as POST /players/resolve: the lowest id wins a shared name.
+            model.player_ids_by_name.setdefault((first_name, last_name), id)
+        rows = db.execute(
+            select(
+                RosterMembership.id,
+                RosterMembership.team_id,
+                RosterMembership.player_id,
+                RosterMembership.season_id,
+                RosterMembership.start_date,
+                RosterMembership.end_date,
+            ).order_by(RosterMembership.id)
+        )
+        for id, team_id, player_id, season_id, start_date, end_date in rows:
+            model.membership_ids.append(id)
+            model.membership_teams.append(team_id)
+            model.membership_players.append(player_id)
+            model.membership_seasons.append(season_id)
+            model.membership_starts.append(start_date.toordinal())
+            model.membership_ends.append(end_date.toordinal())
+        model._build_indexes()
+        model.load_ms = (time.perf_counter() - started) * 1000
+        model.memory_bytes = model._approximate_size()
+        return model
+
+    def _build_indexes(self) -> None:
+        rosters: dict[tuple[int, int], list[int]] = {}
+        histories: dict[int, list[int]] = {}
+        for pos in range(len(self.membership_ids)):
+            player_id = self.membership_players[pos]
+            rosters.setdefault((self.membership_teams[pos], self.membership_seasons[pos]), []).append(pos)
+            histories.setdefault(player_id, []).append(pos)
+        players, seasons = self.players, self.seasons
+        # Positions follow membership id, so stable sorts keep id as the tie-break.
+        for key, positions in rosters.items():
+            positions.sort(
+                key=lambda pos: (
+                    players[self.membership_players[pos]].last_name,
+                    players[self.membership_players[pos]].first_name,
+                    self.membership_starts[pos],
+                )
+            )
+            self._rosters[key] = array("i", positions)
+        for player_id, positions in histories.items():
+            positions.sort(key=lambda pos: seasons[self.membership_seasons[pos]].year)
+            self._histories[player_id] = array("i", positions)
+
+    def _approximate_size(self) -> int:
+        """Bytes held by the model's containers, rows and strings (sys.getsizeof based)."""
+        size = 0
+        for rows in (self.teams, self.seasons, self.players):
+            size += sys.getsizeof(rows)
+            for row in rows.values():
+                size += sys.getsizeof(row) + sum(
+                    sys.getsizeof(getattr(row, name)) for name in row.__slots__ if name != "id"
+                )
+        for lookup in (self.teams_by_abbreviation, self.seasons_by_year, self.player_ids_by_name):
+            size += sys.getsizeof(lookup)
+        size += sum(sys.getsizeof(key) for key in self.player_ids_by_name)
+        for arr in (
+            self.player_ids,
+            self.membership_ids,
+            self.membership_teams,
+            self.membership_players,
+            self.membership_seasons,
+            self.membership_starts,
+            self.membership_ends,
+        ):
+            size += sys.getsizeof(arr)
+        for index in (self._rosters, self._histories):
+            size += sys.getsizeof(index) + sum(sys.getsizeof(arr) for arr in index.values())
+        size += sum(sys.getsizeof(key) for key in self._rosters)
+        return size
+
+    @property
+    def membership_count(self) -> int:
+        return len(self.membership_ids)
+
+    def membership(self, pos: int) -> MembershipView:
+        return MembershipView(
+            self.membership_ids[pos],
+            self.teams[self.membership_teams[pos]],
+            self.players[self.membership_players[pos]],
+            self.seasons[self.membership_seasons[pos]],
+            date.fromordinal(self.membership_starts[pos]),
+            date.fromordinal(self.membership_ends[pos]),
+        )
+
+    def roster(self, team_id: int, season_id: int) -> list[MembershipView]:
+        """A team-season roster ordered by last name, first name."""
+        return [self.membership(pos) for pos in self._rosters.get((team_id, season_id), ())]
+
+    def players_after(self, after_id: Optional[int], count: int) -> list[PlayerRow]:
+        """Up to count players with id > after_id (from the start when None), by id."""
+        start = 0 if after_id is None else bisect.bisect_right(self.player_ids, after_id)
+        return [self.players[id] for id in self.player_ids[start : start + count]]
+
+    def history(self, player_id: int, after: Optional[tuple[int, int]], count: int) -> list[MembershipView]:
+        """Up to count of a player's memberships after (season year, membership id), in that order."""
+        result = []
+        for pos in self._histories.get(player_id, ()):
+            key = (self.seasons[self.membership_seasons[pos]].year, self.membership_ids[pos])
+            if after is not None and key <= tuple(after):
+                continue
+            result.append(self.membership(pos))
+            if len(result) == count:
+                break
+        return result
+
+    def team_ids(self, abbreviations: Iterable[str]) -> dict[str, int]:
+        return {
+            abbreviation: self.teams_by_abbreviation[abbreviation].id
+            for abbreviation in abbreviations
+            if abbreviation in self.teams_by_abbreviation
+        }
+
+    def player_ids_for(self, names: Iterable[tuple[str, str]]) -> dict[tuple[str, str], int]:
+        return {name: self.player_ids_by_name[name] for name in names if name in self.player_ids_by_name}
+
+
+class ReadModelService:
+    """Holds the current read model and reloads it when the data version moves."""
+
+    def __init__(self, enabled: bool, check_interval: float) -> None:
+        self.enabled = enabled
+        self.check_interval = check_interval
+        self.model: Optional[LeagueReadModel] = None
+        self.loads = 0
+        self.last_error: Optional[str] = None
+        # Bumped by every roster commit in this process; a model loaded
+        # before the latest bump is stale.
+        self._generation = 0
+
+    def current(self) -> Optional[LeagueReadModel]:
+        """The model to answer from, or None to use the database."""
+        model = self.model
+        if model is None or model.generation != self._generation:
+            return None
+        return model
+
+    def note_write(self, memberships=None) -> None:
+        self._generation += 1
+
+    def refresh(self) -> bool:
+        """Load and swap in a new model if the data changed; True if it did (blocking)."""
+        generation = self._generation
+        with read_session() as db:
+            version = data_version(db)
+            model = self.model
+            if model is not None and model.version == version and model.generation == generation:
+                return False
+            new_model = LeagueReadModel.load(db, version, generation)
+        self.model = new_model
+        self.loads += 1
+        logger.info(
+            "read model loaded: %d players, %d memberships, %.0f ms, ~%.1f MB",
+            len(new_model.players),
+            new_model.membership_count,
+            new_model.load_ms,
+            new_model.memory_bytes / 1e6,
+        )
+        return True
+
+    async def run(self) -> None:
+        """Check the data version forever, every check_interval seconds (run as a task)."""
+        while True:
+            try:
+                await run_in_threadpool(self.refresh)
+            except Exception as exc:
+                self.last_error = repr(exc)
+                logger.exception("read model refresh failed; endpoints use the database meanwhile")
+            else:
+                self.last_error = None
+            await asyncio.sleep(self.check_interval)
+
+    def status(self) -> dict:
+        model = self.model
+        status = {
+            "enabled": self.enabled,
+            "loaded": model is not None,
+            "serving": self.current() is not None,
+            "loads": self.loads,
+            "last_error": self.last_error,
+        }
+        if model is not None:
+            status.update(
+                {
+                    "version": dict(zip(VERSION_KEYS, model.version)),
+                    "teams": len(model.teams),
+                    "players": len(model.players),
+                    "seasons": len(model.seasons),
+                    "memberships": model.membership_count,
+                    "memory_bytes": model.memory_bytes,
+                    "load_ms": round(model.load_ms, 1),
+                    "age_seconds": round(time.monotonic() - model.loaded_at, 1),
+                }
+            )
+        return status
+
+
+_settings = get_settings()
+read_model = ReadModelService(
+    enabled=_settings.read_model_enabled,
+    check_interval=_settings.read_model_check_interval_seconds,
+)
+on_roster_commit(read_model.note_write)
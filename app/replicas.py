@@ -0,0 +1,262 @@
+"""
+Read-replica routing for read-only endpoints.
+
+With DATABASE_REPLICA_URLS set (comma-separated), read-only endpoints take
+their session from get_read_db / get_async_read_db instead of get_db /
+get_async_db, and each session goes to the next healthy replica in
+round-robin order. Writes (POST /rosters/batch) and the seeder keep using the
+primary. With no replicas configured the read dependencies simply hand out
+primary sessions.
+
+Falling back to the primary:
+- a background task (started by the API's lifespan handler) runs SELECT 1
+  on every replica each REPLICA_CHECK_INTERVAL_SECONDS and takes failing
+  replicas out of rotation until a check succeeds again;
+- a read session connects before it is handed out, so a replica that fails
+  between checks is marked unhealthy and the request quietly uses the
+  primary instead. Replica connections time out after
+  REPLICA_CHECK_TIMEOUT_SECONDS too (the driver's connect timeout), so a
+  replica that accepts the TCP connection but never answers can't hang the
+  request;
+- for REPLICA_WRITE_GRACE_SECONDS after this process commits a roster write,
+  reads go to the primary, so a lagging replica can't serve (and the response
+  cache can't store) the roster as it was before the write.
+
+Engines for a replica are created on first use, like the primary's. Local
+testing works with two SQLite files:
+    DATABASE_URL=sqlite:///primary.db DATABASE_REPLICA_URLS=sqlite:///replica.db
+GET /health/replicas shows each replica's state and how many reads it served.
+"""
+
+import asyncio
+import itertools
+import logging
+import math
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.db import AsyncSessionLocal, SessionLocal, to_async_url
+from app.observability import instrument_engine
+from app.pool import PoolMetrics, engine_pool_kwargs
+from app.roster_writes import on_roster_commit
+
+logger = logging.getLogger(__name__)
+
+# Connection failures that take a replica out of rotation.
+CONNECTION_ERRORS = (DBAPIError, OSError, asyncio.TimeoutError)
+
+
+def connect_timeout_args(url: str, timeout: float) -> dict:
+    """create_engine connect_args bounding how long url's driver may take to connect."""
+    driver = make_url(url).get_driver_name()
+    if driver == "asyncpg":
+        return {"connect_args": {"timeout": timeout}}
+    if driver == "psycopg2":
+        # libpq takes whole seconds and treats anything under 2 as 2.
+        return {"connect_args": {"connect_timeout": max(2, math.ceil(timeout))}}
+    return {}
+
+
+class Replica:
+    """One read replica: lazily created sync/async engines plus health state."""
+
+    def __init__(self, url: str, connect_timeout: float) -> None:
+        self.url = url
+        self.connect_timeout = connect_timeout
+        self.healthy = True
+        self.last_error: Optional[str] = None
+        self.last_checked: Optional[float] = None
+        self.reads = 0
+        self.pool_metrics = PoolMetrics()
+        self.async_pool_metrics = PoolMetrics()
+        self._engine: Optional[Engine] = None
+        self._async_engine: Optional[AsyncEngine] = None
+        self._lock = threading.Lock()
+
+    def engine(self) -> Engine:
+        with self._lock:
+            if self._engine is None:
+                engine = create_engine(
+                    self.url,
+                    **engine_pool_kwargs(self.url, self.pool_metrics),
+                    **connect_timeout_args(self.url, self.connect_timeout),
+                )
+                self.pool_metrics.attach(engine)
+                instrument_engine(engine)
+                self._engine = engine
+        return self._engine
+
+    def async_engine(self) -> AsyncEngine:
+        with self._lock:
+            if self._async_engine is None:
+                url = to_async_url(self.url)
+                engine = create_async_engine(
+                    url,
+                    **engine_pool_kwargs(url, self.async_pool_metrics, is_async=True),
+                    **connect_timeout_args(url, self.connect_timeout),
+                )
+                self.async_pool_metrics.attach(engine.sync_engine)
+                instrument_engine(engine.sync_engine)
+                self._async_engine = engine
+        return self._async_engine
+
+    def mark(self, healthy: bool, error: Optional[BaseException] = None) -> None:
+        if self.healthy and not healthy:
+            logger.warning("replica %s out of rotation: %r", self.display_url, error)
+        elif healthy and not self.healthy:
+            logger.warning("replica %s back in rotation", self.display_url)
+        self.healthy = healthy
+        self.last_error = None if error is None else repr(error)
+        self.last_checked = time.monotonic()
+
+    async def _ping(self) -> None:
+        async with self.async_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def check(self, timeout: float) -> bool:
+        # The timeout covers connecting too: an unreachable host hangs in connect().
+        try:
+            await asyncio.wait_for(self._ping(), timeout)
+        except CONNECTION_ERRORS as exc:
+            self.mark(False, exc)
+        else:
+            self.mark(True)
+        return self.healthy
+
+    async def dispose(self) -> None:
+        if self._async_engine is not None:
+            await self._async_engine.dispose()
+        if self._engine is not None:
+            self._engine.dispose()
+
+    @property
+    def display_url(self) -> str:
+        return make_url(self.url).render_as_string(hide_password=True)
+
+    def status(self) -> dict:
+        return {
+            "url": self.display_url,
+            "healthy": self.healthy,
+            "last_error": self.last_error,
+            "seconds_since_check": (
+                None if self.last_checked is None else round(time.monotonic() - self.last_checked, 1)
+            ),
+            "reads": self.reads,
+            "pool": {
+                "sync": self.pool_metrics.snapshot(),
+                "async": self.async_pool_metrics.snapshot(),
+            },
+        }
+
+
+class ReplicaRouter:
+    """Chooses a healthy replica per read session, or None for the primary."""
+
+    def __init__(self, urls, check_interval: float, check_timeout: float, write_grace: float) -> None:
+        self.replicas = [Replica(url, check_timeout) for url in urls]
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self.write_grace = write_grace
+        self.primary_reads = 0
+        self._last_write = float("-inf")
+        self._turn = itertools.count()
+
+    def choose(self) -> Optional[Replica]:
+        if not self.replicas or time.monotonic() - self._last_write < self.write_grace:
+            return None
+        healthy = [r for r in self.replicas if r.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._turn) % len(healthy)]
+
+    def note_write(self, memberships=None) -> None:
+        self._last_write = time.monotonic()
+
+    async def check_all(self) -> None:
+        await asyncio.gather(*(r.check(self.check_timeout) for r in self.replicas))
+
+    async def run_health_checks(self) -> None:
+        """Check every replica forever, every check_interval seconds (run as a task)."""
+        while True:
+            await self.check_all()
+            await asyncio.sleep(self.check_interval)
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.dispose()
+
+    def status(self) -> dict:
+        return {
+            "replicas": [r.status() for r in self.replicas],
+            "primary_reads": self.primary_reads,
+        }
+
+
+_settings = get_settings()
+replica_router = ReplicaRouter(
+    _settings.database_replica_urls,
+    check_interval=_settings.replica_check_interval_seconds,
+    check_timeout=_settings.replica_check_timeout_seconds,
+    write_grace=_settings.replica_write_grace_seconds,
+)
+on_roster_commit(replica_router.note_write)
+
+
+def read_session() -> Session:
+    """A Session on a healthy replica, or on the primary if none is usable."""
+    replica = replica_router.choose()
+    if replica is not None:
+        db = SessionLocal(bind=replica.engine())
+        try:
+            db.connection()
+        except CONNECTION_ERRORS as exc:
+            db.close()
+            replica.mark(False, exc)
+        else:
+            replica.reads += 1
+            return db
+    replica_router.primary_reads += 1
+    return SessionLocal()
+
+
+async def async_read_session() -> AsyncSession:
+    """Async counterpart of read_session."""
+    replica = replica_router.choose()
+    if replica is not None:
+        db = AsyncSessionLocal(bind=replica.async_engine())
+        try:
+            await db.connection()
+        except CONNECTION_ERRORS as exc:
+            await db.close()
+            replica.mark(False, exc)
+        else:
+            replica.reads += 1
+            return db
+    replica_router.primary_reads += 1
+    return AsyncSessionLocal()
+
+
+def get_read_db():
+    """Like get_db, but for read-only `def` endpoints: routed to a replica when possible."""
+    db = read_session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db():
+    """Like get_async_db, but for read-only `async def` endpoints: routed to a replica when possible."""
+    db = await async_read_session()
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -0,0 +1,222 @@
+"""
+Set-based application of a batch of roster additions and removals.
+
+A batch (e.g. a trade deadline's worth of moves) is applied in the caller's
+transaction with a few statements per BATCH_CHUNK_SIZE items instead of one
+round trip per row:
+- validation: one IN query per referenced table finds unknown team, player,
+  and season ids; the season query also fills in missing stint dates;
+- removals: DELETE ... WHERE (team_id, player_id, season_id) IN (...) RETURNING,
+  which removes every stint of the player with that team in that season;
+- additions: INSERT ... VALUES ... ON CONFLICT DO NOTHING RETURNING. With no
+  conflict target, both unique_roster_membership and the Postgres exclusion
+  constraint on overlapping stints turn a conflicting item into a no-op.
+RETURNING tells which items actually changed a row, so every item gets its
+own status. Removals run before additions, so a batch may remove and re-add
+the same membership, e.g. replace a full-season stint with the two halves of
+a mid-season trade. Before writing, a batch takes the roster lock of every
+team it names (lock_teams() in app/roster_writes.py), so concurrent batches
+touching the same teams run one after the other instead of deadlocking on
+each other's deleted and re-inserted rows.
+
+SQLite (local runs) gets the same statements through its own INSERT ... ON
+CONFLICT; it has no exclusion constraint, so overlapping stints with
+different start dates are not rejected there.
+
+Both statements are Core, so the written rows are reported with
+mark_roster_writes() for cache invalidation and with record_changes() for the
+change log, and team_season_analytics is refreshed for the touched rosters
+before the caller commits.
+"""
+
+from datetime import date
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.analytics import refresh_team_seasons
+from app.change_log import DELETE, INSERT, record_changes
+from app.models import Player, RosterMembership, Season, Team
+from app.roster_writes import lock_teams, mark_roster_writes, team_season_pairs
+
+BATCH_CHUNK_SIZE = 5000
+
+INSERTED = "inserted"
+ALREADY_PRESENT = "already_present"
+DELETED = "deleted"
+NOT_FOUND = "not_found"
+INVALID = "invalid"
+DUPLICATE = "duplicate"
+
+# Field names of an item key: additions use all five, removals the first three.
+KEY_FIELDS = ("team_id", "player_id", "season_id", "start_date", "end_date")
+
+Stint = tuple[int, int, int, Optional[date], Optional[date]]
+
+_INSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+def _chunks(items: list, size: int = BATCH_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _existing_ids(session: Session, model, ids: set) -> set:
+    found = set()
+    for chunk in _chunks(sorted(ids)):
+        found.update(session.execute(select(model.id).where(model.id.in_(chunk))).scalars())
+    return found
+
+
+def _season_dates(session: Session, ids: set) -> dict[int, tuple[date, date]]:
+    found = {}
+    for chunk in _chunks(sorted(ids)):
+        rows = session.execute(
+            select(Season.id, Season.start_date, Season.end_date).where(Season.id.in_(chunk))
+        )
+        found.update((id, (start, end)) for id, start, end in rows)
+    return found
+
+
+def _validate(session: Session, keys: list[Stint]) -> tuple[dict, dict]:
+    """
+    Check additions; return (errors, stints).
+
+    errors maps each key with an unknown id or dates outside its season to a
+    message; stints maps every other key to the stint to insert, with missing
+    dates taken from the season.
+    """
+    seasons = _season_dates(session, {k[2] for k in keys})
+    known = {
+        "team_id": _existing_ids(session, Team, {k[0] for k in keys}),
+        "player_id": _existing_ids(session, Player, {k[1] for k in keys}),
+        "season_id": seasons.keys(),
+    }
+    errors, stints = {}, {}
+    for key in keys:
+        missing = [name for name, value in zip(known, key) if value not in known[name]]
+        if missing:
+            errors[key] = "unknown " + ", ".join(missing)
+            continue
+        season_start, season_end = seasons[key[2]]
+        start, end = key[3] or season_start, key[4] or season_end
+        if not season_start <= start < end <= season_end:
+            errors[key] = f"stint must satisfy {season_start} <= start_date < end_date <= {season_end}"
+            continue
+        stints[key] = (*key[:3], start, end)
+    return errors, stints
+
+
+_RETURNED = (
+    RosterMembership.id,
+    RosterMembership.team_id,
+    RosterMembership.player_id,
+    RosterMembership.season_id,
+    RosterMembership.start_date,
+    RosterMembership.end_date,
+)
+
+
+def _key(row) -> tuple[int, int, int]:
+    return row["team_id"], row["player_id"], row["season_id"]
+
+
+def _stint(row) -> Stint:
+    return (*_key(row), row["start_date"], row["end_date"])
+
+
+def _delete(session: Session, keys: list[tuple[int, int, int]]) -> set:
+    """Delete the given memberships' stints; return the (team_id, player_id, season_id) keys removed."""
+    removed = set()
+    for chunk in _chunks(keys):
+        rows = session.execute(
+            delete(RosterMembership)
+            .where(
+                tuple_(
+                    RosterMembership.team_id, RosterMembership.player_id, RosterMembership.season_id
+                ).in_(chunk)
+            )
+            .returning(*_RETURNED)
+        ).mappings().all()
+        record_changes(session, RosterMembership, DELETE, rows)
+        removed.update(_key(r) for r in rows)
+    return removed
+
+
+def _insert(session: Session, stints: list[Stint]) -> set:
+    """Insert the given stints unless present or overlapping one; return the stints inserted."""
+    insert = _INSERTS[session.get_bind().dialect.name]
+    inserted = set()
+    for chunk in _chunks(stints):
+        rows = session.execute(
+            insert(RosterMembership)
+            .values([dict(zip(KEY_FIELDS, stint)) for stint in chunk])
+            .on_conflict_do_nothing()
+            .returning(*_RETURNED)
+        ).mappings().all()
+        record_changes(session, RosterMembership, INSERT, rows)
+        inserted.update(_stint(r) for r in rows)
+    return inserted
+
+
+def _statuses(keys: list, outcome, identity=lambda key: key) -> list[tuple[tuple, str, str]]:
+    """
+    (key, status, detail) per item in input order.
+
+    Items whose identity(key) matches an earlier item's are DUPLICATE, so
+    two spellings of the same stint get one outcome between them.
+    """
+    seen = set()
+    results = []
+    for key in keys:
+        if identity(key) in seen:
+            results.append((key, DUPLICATE, "repeats an earlier item in this batch"))
+            continue
+        seen.add(identity(key))
+        results.append((key, *outcome(key)))
+    return results
+
+
+def apply_roster_batch(
+    session: Session,
+    additions: Iterable[Stint],
+    removals: Iterable[tuple[int, int, int]],
+) -> tuple[list, list]:
+    """
+    Apply removals, then additions, in session's transaction.
+
+    additions are (team_id, player_id, season_id, start_date, end_date) with
+    None dates meaning the season's; removals are (team_id, player_id,
+    season_id). Returns (addition_results, removal_results): one (key,
+    status, detail) tuple per input item, in input order. Nothing is committed.
+    """
+    additions = list(additions)
+    removals = list(removals)
+    errors, stints = _validate(session, list(dict.fromkeys(additions)))
+
+    lock_teams(session, [k[0] for k in removals] + [k[0] for k in stints])
+    removed = _delete(session, list(dict.fromkeys(removals)))
+    inserted = _insert(session, list(dict.fromkeys(stints.values())))
+
+    # Core statements bypass the ORM flush hooks; report the rows explicitly.
+    written = {(t, s, p) for t, p, s in removed} | {(t, s, p) for t, p, s, _, _ in inserted}
+    mark_roster_writes(session, written)
+    refresh_team_seasons(session, team_season_pairs(written))
+
+    def addition_outcome(key):
+        if key in errors:
+            return INVALID, errors[key]
+        if stints[key] in inserted:
+            return INSERTED, None
+        return ALREADY_PRESENT, "the same or an overlapping stint exists"
+
+    def removal_outcome(key):
+        return (DELETED, None) if key in removed else (NOT_FOUND, None)
+
+    # An addition with omitted dates and one spelling out the season's dates
+    # resolve to the same stint: dedupe on the resolved stint.
+    addition_results = _statuses(additions, addition_outcome, lambda key: stints.get(key, key))
+    return addition_results, _statuses(removals, removal_outcome)
@@ -0,0 +1,96 @@
+"""
+Streaming full-table roster export (NDJSON or CSV).
+
+Rows are read through a server-side cursor with yield_per and written out one
+partition at a time, so memory stays constant and the first bytes go out as
+soon as the first partition arrives, however large the table is. Rows are
+plain Core tuples; no ORM or Pydantic objects are built.
+
+The generator opens and closes its own session (on a read replica when one
+is configured): it runs after the endpoint has returned, when a
+request-scoped session may already be closed.
+"""
+
+import csv
+import io
+import json
+from datetime import date
+from typing import Iterator, Optional
+
+from sqlalchemy import select
+
+from app.models import Player, RosterMembership, Season, Team
+from app.replicas import read_session
+
+PARTITION_SIZE = 1000
+
+EXPORT_COLUMNS = [
+    "id",
+    "season_year",
+    "team_abbreviation",
+    "team_name",
+    "player_id",
+    "first_name",
+    "last_name",
+    "position",
+    "start_date",
+    "end_date",
+]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def roster_export_query(season: Optional[int] = None, team: Optional[str] = None):
+    stmt = (
+        select(
+            RosterMembership.id,
+            Season.year.label("season_year"),
+            Team.abbreviation.label("team_abbreviation"),
+            Team.name.label("team_name"),
+            Player.id.label("player_id"),
+            Player.first_name,
+            Player.last_name,
+            Player.position,
+            RosterMembership.start_date,
+            RosterMembership.end_date,
+        )
+        .join(Team, Team.id == RosterMembership.team_id)
+        .join(Player, Player.id == RosterMembership.player_id)
+        .join(Season, Season.id == RosterMembership.season_id)
+        # Primary-key order: a stable order that needs no sort step.
+        .order_by(RosterMembership.id)
+    )
+    if season is not None:
+        stmt = stmt.where(Season.year == season)
+    if team is not None:
+        stmt = stmt.where(Team.abbreviation == team.upper())
+    return stmt
+
+
+def _format_ndjson(partition) -> bytes:
+    return "".join(
+        json.dumps(dict(zip(EXPORT_COLUMNS, row)), separators=(",", ":"), default=date.isoformat) + "\n"
+        for row in partition
+    ).encode()
+
+
+def _format_csv(partition) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(partition)
+    return buffer.getvalue().encode()
+
+
+def stream_roster_export(
+    fmt: str, season: Optional[int] = None, team: Optional[str] = None
+) -> Iterator[bytes]:
+    """Yield the export in fmt ("ndjson" or "csv"), one encoded partition at a time."""
+    formatter = _format_csv if fmt == "csv" else _format_ndjson
+    if fmt == "csv":
+        yield _format_csv([EXPORT_COLUMNS])
+    with read_session() as db:
+        result = db.execute(
+            roster_export_query(season, team),
+            execution_options={"stream_results": True, "yield_per": PARTITION_SIZE},
+        )
+        for partition in result.partitions():
+            yield formatter(partition)
@@ -0,0 +1,98 @@
+"""
+Per-session tracking of RosterMembership writes.
+
+Several read-side structures (the response cache, precomputed analytics, ...)
+must react when roster memberships change. This module records which
+(team_id, season_id, player_id) rows a session wrote and hands them to
+subscribers once the commit has succeeded:
+- ORM writes are collected automatically by an after_flush hook.
+- Core statements (bulk INSERT ... ON CONFLICT, bulk DELETE) bypass the ORM,
+  so their callers report the affected rows with mark_roster_writes().
+Rolled-back writes are discarded.
+
+Writers that must not interleave with another transaction's writes to the
+same rosters (batch roster moves, the analytics refresh) call lock_teams()
+first: on Postgres it takes a transaction-level advisory lock per team, in
+team id order, so a second writer waits for the first to commit instead of
+deadlocking with it or working from a stale read. SQLite serializes writers
+by itself.
+"""
+
+from typing import Callable, Iterable
+
+from sqlalchemy import bindparam, event, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+from sqlalchemy.types import Integer
+
+from app.models import RosterMembership
+
+_PENDING_KEY = "pending_roster_writes"
+
+# Arbitrary constant naming the per-team roster locks: the first key of the
+# two-key pg_advisory_xact_lock form; the team id is the second.
+ROSTER_LOCK_CLASS = 0x6E62726C
+
+# Volatile target-list functions are evaluated after ORDER BY, so the locks
+# are taken in team id order.
+_LOCK_TEAMS = text(
+    "SELECT pg_advisory_xact_lock(:lock_class, team_id) "
+    "FROM unnest(:team_ids) AS team_id ORDER BY team_id"
+).bindparams(bindparam("team_ids", type_=ARRAY(Integer)))
+
+_commit_callbacks: list[Callable[[set], None]] = []
+
+
+def mark_roster_writes(session: Session, memberships: Iterable[tuple[int, int, int]]) -> None:
+    """Record (team_id, season_id, player_id) rows written in session's transaction."""
+    session.info.setdefault(_PENDING_KEY, set()).update(memberships)
+
+
+def lock_teams(session: Session, team_ids: Iterable[int]) -> None:
+    """Hold the teams' roster locks until session's transaction ends (Postgres only)."""
+    team_ids = sorted(set(team_ids))
+    if team_ids and session.get_bind().dialect.name == "postgresql":
+        session.execute(_LOCK_TEAMS, {"lock_class": ROSTER_LOCK_CLASS, "team_ids": team_ids})
+
+
+def pending_roster_writes(session: Session) -> set:
+    """Rows written in session's current transaction so far (flushes ORM changes first)."""
+    session.flush()
+    return set(session.info.get(_PENDING_KEY, ()))
+
+
+def team_season_pairs(memberships: Iterable[tuple[int, int, int]]) -> set:
+    """Distinct (team_id, season_id) pairs of the given membership rows."""
+    return {(team_id, season_id) for team_id, season_id, _ in memberships}
+
+
+def on_roster_commit(callback: Callable[[set], None]) -> Callable[[set], None]:
+    """Call callback(rows) after every commit that wrote roster memberships."""
+    _commit_callbacks.append(callback)
+    return callback
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_roster_writes(session, flush_context) -> None:
+    # new/dirty/deleted still hold the pre-flush state here.
+    mark_roster_writes(
+        session,
+        (
+            (obj.team_id, obj.season_id, obj.player_id)
+            for obj in (*session.new, *session.dirty, *session.deleted)
+            if isinstance(obj, RosterMembership)
+        ),
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_committed_roster_writes(session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        for callback in _commit_callbacks:
+            callback(pending)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back_roster_writes(session, previous_transaction) -> None:
+    session.info.pop(_PENDING_KEY, None)
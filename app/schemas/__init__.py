@@ -5,9 +5,10 @@ Use *Response schemas as response_model in FastAPI so ORM objects are serialized
 correctly (Config.from_attributes = True).
 """
 
-from typing import Optional
+from datetime import date, datetime
+from typing import Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 # ---- Team ----
@@ -69,11 +70,15 @@ class RosterMembershipBase(BaseModel):
 
 
 class RosterMembershipCreate(RosterMembershipBase):
-    pass
+    """A stint [start_date, end_date); either date left out defaults to the season's."""
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
 
 
 class RosterMembershipResponse(RosterMembershipBase):
     id: int
+    start_date: date
+    end_date: date
 
     class Config:
         from_attributes = True
@@ -84,3 +89,130 @@ class RosterMembershipDetail(RosterMembershipResponse):
     team: Optional[TeamResponse] = None
     player: Optional[PlayerResponse] = None
     season: Optional[SeasonResponse] = None
+
+
+# ---- Analytics ----
+class TeamSeasonAnalyticsResponse(BaseModel):
+    """Precomputed roster size, position distribution, and turnover for one team-season."""
+    team: TeamResponse
+    season: SeasonResponse
+    previous_season: Optional[SeasonResponse] = None
+    roster_size: int
+    position_counts: dict[str, int]
+    retained: int
+    added: int
+    departed: int
+    refreshed_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+# ---- Pagination ----
+class PlayerPage(BaseModel):
+    """One page of players; pass next_cursor back as ?cursor= for the next page."""
+    items: list[PlayerResponse]
+    next_cursor: Optional[str] = None
+
+
+class PlayerHistoryPage(BaseModel):
+    """One page of a player's roster memberships, oldest season first."""
+    player: PlayerResponse
+    items: list[RosterMembershipDetail]
+    next_cursor: Optional[str] = None
+
+
+# ---- Teammates ----
+class TeammateResponse(BaseModel):
+    """A player who shared at least one roster with the requested player."""
+    player: PlayerResponse
+    seasons_together: int
+    last_season: int
+
+
+class TeammateLink(BaseModel):
+    """The roster two consecutive players in a path shared."""
+    team: TeamResponse
+    season: SeasonResponse
+
+
+class TeammatePath(BaseModel):
+    """Shortest teammate chain: links[i] connects players[i] and players[i + 1]."""
+    degrees: int
+    players: list[PlayerResponse]
+    links: list[TeammateLink]
+
+
+# ---- Batch resolve ----
+MAX_RESOLVE_ITEMS = 1000
+
+
+class PlayerName(BaseModel):
+    first_name: str
+    last_name: str
+
+
+class PlayerResolveRequest(BaseModel):
+    players: list[PlayerName] = Field(..., max_length=MAX_RESOLVE_ITEMS)
+
+
+class PlayerResolveResult(PlayerName):
+    """id is None (and found False) when no player has this exact name."""
+    id: Optional[int] = None
+    found: bool
+
+
+class TeamResolveRequest(BaseModel):
+    abbreviations: list[str] = Field(..., max_length=MAX_RESOLVE_ITEMS)
+
+
+class TeamResolveResult(BaseModel):
+    """id is None (and found False) when no team has this abbreviation."""
+    abbreviation: str
+    id: Optional[int] = None
+    found: bool
+
+
+# ---- Batch roster writes ----
+MAX_BATCH_ITEMS = 10_000
+
+
+class RosterBatchRequest(BaseModel):
+    """Memberships to add and to remove; removals are applied first."""
+    add: list[RosterMembershipCreate] = Field(default_factory=list, max_length=MAX_BATCH_ITEMS)
+    remove: list[RosterMembershipBase] = Field(default_factory=list, max_length=MAX_BATCH_ITEMS)
+
+
+class RosterBatchItemResult(RosterMembershipBase):
+    op: Literal["add", "remove"]
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    status: Literal["inserted", "already_present", "deleted", "not_found", "invalid", "duplicate"]
+    detail: Optional[str] = None
+
+
+class RosterBatchResponse(BaseModel):
+    """Per-status counts plus one result per item (additions, then removals)."""
+    counts: dict[str, int]
+    results: list[RosterBatchItemResult]
+
+
+# ---- Change feed ----
+class ChangeResponse(BaseModel):
+    seq: int
+    entity: Literal["team", "player", "roster_membership"]
+    op: Literal["insert", "delete"]
+    entity_id: int
+    data: dict
+    changed_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ChangePage(BaseModel):
+    """Changes after ?since=, oldest first; pass next_since back as ?since= to continue."""
+    items: list[ChangeResponse]
+    next_since: int
+    has_more: bool
+    latest_seq: int
@@ -0,0 +1,209 @@
+"""
+In-process player name search for typeahead.
+
+The players table is loaded into a PlayerSearchIndex and searched in memory,
+so GET /players/search does not scan the table per keystroke. The index has:
+- a trigram posting list per three-character fragment of "first last"
+  (lowercased), used to find substring matches such as "bron";
+- a posting list per one- and two-character word prefix, used for fragments
+  shorter than three characters ("jo");
+- the full names in sorted order, for "name starts with the query" lookups.
+
+A query like "lebr jam" is split into lowercase tokens and a player matches
+when every token appears in their full name. When every fragment is shorter
+than three characters there is no trigram to look them up by, so the first
+fragment must also start a word of the name ("jo" finds "Jokic", not "Mojo").
+
+Results are ranked:
+    0  full name equals the query          ("lebron james")
+    1  full name starts with the query     ("lebron ja")
+    2  first or last name starts with the first token ("jam" -> James ...)
+    3  any other match                     ("bron")
+then alphabetically by last name, first name, id.
+
+Freshness: ORM writes to players in this process mark the index stale (see
+the Session hook below). Writes from other processes, such as the seeder, are
+noticed when max(players.id) changes; the index is also rebuilt every
+SEARCH_INDEX_TTL_SECONDS (default 600) to pick up renames made elsewhere.
+"""
+
+import asyncio
+import bisect
+import heapq
+import time
+from typing import Optional
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import get_settings
+from app.models import Player
+
+MIN_QUERY_LENGTH = 2
+MAX_TOKENS = 5
+
+
+def normalize_query(q: str) -> list[str]:
+    """Lowercase the query and split it into at most MAX_TOKENS tokens."""
+    return q.lower().split()[:MAX_TOKENS]
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class PlayerSearchIndex:
+    """
+    Immutable name index over a snapshot of the players table.
+
+    Players are stored sorted by (last_name, first_name, id), so a player's
+    position in the arrays is also its tie-break order and every posting list
+    is already in result order; a search can stop as soon as it has `limit`
+    results for a rank instead of scoring every candidate.
+    """
+
+    __slots__ = (
+        "ids", "first_names", "last_names", "positions",
+        "_full", "_first_lower", "_last_lower", "_sorted_full",
+        "_postings", "_short_prefixes", "max_id", "built_at",
+    )
+
+    def __init__(self, rows) -> None:
+        """rows: iterable of (id, first_name, last_name, position)."""
+        rows = sorted(rows, key=lambda r: (r[2], r[1], r[0]))
+        self.ids = [r[0] for r in rows]
+        self.first_names = [r[1] for r in rows]
+        self.last_names = [r[2] for r in rows]
+        self.positions = [r[3] for r in rows]
+        self._first_lower = [name.lower() for name in self.first_names]
+        self._last_lower = [name.lower() for name in self.last_names]
+        self._full = [f"{f} {l}" for f, l in zip(self._first_lower, self._last_lower)]
+        # (full name, idx) in name order: "starts with the query" is one bisect range.
+        self._sorted_full = sorted((full, idx) for idx, full in enumerate(self._full))
+
+        postings: dict[str, list[int]] = {}
+        short_prefixes: dict[str, list[int]] = {}
+        for idx, full in enumerate(self._full):
+            for gram in _trigrams(full):
+                postings.setdefault(gram, []).append(idx)
+            for prefix in {word[:n] for word in full.split() for n in (1, 2)}:
+                short_prefixes.setdefault(prefix, []).append(idx)
+        self._postings = postings
+        self._short_prefixes = short_prefixes
+        self.max_id = max(self.ids, default=None)
+        self.built_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _name_prefix_matches(self, phrase: str) -> list[int]:
+        """Players whose full name starts with phrase (ranks 0 and 1)."""
+        sorted_full = self._sorted_full
+        i = bisect.bisect_left(sorted_full, (phrase,))
+        found = []
+        while i < len(sorted_full) and sorted_full[i][0].startswith(phrase):
+            found.append(sorted_full[i][1])
+            i += 1
+        return found
+
+    def _candidates(self, tokens: list[str]) -> list[int]:
+        """A superset of the matches, ascending by idx (i.e. in result order)."""
+        long_grams = [g for t in tokens if len(t) >= 3 for g in _trigrams(t)]
+        if long_grams:
+            # The rarest trigram bounds the candidates; substring checks do the rest.
+            return min((self._postings.get(g, []) for g in long_grams), key=len)
+        return self._short_prefixes.get(tokens[0][:2], [])
+
+    def search(self, tokens: list[str], limit: int) -> list[dict]:
+        """Best `limit` players matching every token (see module docstring)."""
+        if not tokens:
+            return []
+        phrase = " ".join(tokens)
+        first_token = tokens[0]
+        full, first_lower, last_lower = self._full, self._first_lower, self._last_lower
+
+        # Ranks 0-1: exact name first, then the rest of the name-prefix range.
+        results = heapq.nsmallest(
+            limit, self._name_prefix_matches(phrase), key=lambda i: (full[i] != phrase, i)
+        )
+        chosen = set(results)
+
+        # Ranks 2-3: walk candidates in result order and stop once the page is full.
+        for want_name_prefix in (True, False):
+            if len(results) >= limit:
+                break
+            for i in self._candidates(tokens):
+                if i in chosen or not all(t in full[i] for t in tokens):
+                    continue
+                name_prefix = first_lower[i].startswith(first_token) or last_lower[i].startswith(first_token)
+                if name_prefix != want_name_prefix:
+                    continue
+                results.append(i)
+                chosen.add(i)
+                if len(results) >= limit:
+                    break
+
+        return [
+            {
+                "id": self.ids[i],
+                "first_name": self.first_names[i],
+                "last_name": self.last_names[i],
+                "position": self.positions[i],
+            }
+            for i in results
+        ]
+
+
+class PlayerSearchService:
+    """Holds the current index and rebuilds it from the database when stale."""
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self.index: Optional[PlayerSearchIndex] = None
+        self.stale = True
+        self._lock = asyncio.Lock()
+
+    async def get_index(self, db: AsyncSession) -> PlayerSearchIndex:
+        index = self.index
+        if index is not None and not self.stale and time.monotonic() - index.built_at < self.ttl:
+            # One index-only lookup notices players added by other processes.
+            max_id = (await db.execute(select(func.max(Player.id)))).scalar_one()
+            if max_id == index.max_id:
+                return index
+        async with self._lock:
+            if self.index is not index:
+                return self.index  # another request rebuilt it while we waited
+            self.stale = False
+            rows = (
+                await db.execute(
+                    select(Player.id, Player.first_name, Player.last_name, Player.position)
+                )
+            ).all()
+            # Building is CPU-bound; keep it off the event loop.
+            self.index = await run_in_threadpool(PlayerSearchIndex, rows)
+            return self.index
+
+    def invalidate(self) -> None:
+        self.stale = True
+
+
+player_search = PlayerSearchService(ttl=get_settings().search_index_ttl_seconds)
+
+
+@event.listens_for(Session, "after_flush")
+def _note_player_writes(session, flush_context) -> None:
+    if any(isinstance(obj, Player) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info["players_written"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_player_writes(session) -> None:
+    if session.info.pop("players_written", False):
+        player_search.invalidate()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_player_writes(session, previous_transaction) -> None:
+    session.info.pop("players_written", None)
@@ -0,0 +1,62 @@
+"""
+Point-in-time roster queries over stint date ranges.
+
+A roster membership is a stint [start_date, end_date). "Who was on team T on
+date D" is the stints of T whose range contains D. On Postgres, active_on()
+renders as
+
+    daterange(start_date, end_date, '[)') @> D
+
+which is the expression indexed by the roster_stint_no_overlap exclusion
+constraint (GiST over team_id, the range and player_id), so together with
+team_id = T it is answered by an index scan instead of a scan of every stint
+the team ever had. Other databases (SQLite in local runs) get the equivalent
+start_date <= D AND end_date > D.
+"""
+
+from datetime import date
+
+from sqlalchemy import Boolean, Date, and_, bindparam
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ColumnElement
+from sqlalchemy.sql.visitors import InternalTraversal
+
+from app.models import RosterMembership, stint_range
+
+
+class StintCovers(ColumnElement):
+    """Boolean SQL expression: the stint covers the given date."""
+
+    type = Boolean()
+    _is_implicitly_boolean = True
+    inherit_cache = True
+    # Traversed so the statement cache keys on the columns and the date parameter.
+    _traverse_internals = [
+        ("start", InternalTraversal.dp_clauseelement),
+        ("end", InternalTraversal.dp_clauseelement),
+        ("on", InternalTraversal.dp_clauseelement),
+    ]
+
+    def __init__(self, start, end, on) -> None:
+        self.start = start
+        self.end = end
+        self.on = on
+
+
+@compiles(StintCovers)
+def _covers_default(element, compiler, **kw):
+    return compiler.process(and_(element.start <= element.on, element.end > element.on), **kw)
+
+
+@compiles(StintCovers, "postgresql")
+def _covers_postgresql(element, compiler, **kw):
+    return compiler.process(stint_range(element.start, element.end).op("@>")(element.on), **kw)
+
+
+def active_on(on: date) -> StintCovers:
+    """WHERE clause for roster memberships whose stint covers the date on."""
+    return StintCovers(
+        RosterMembership.start_date,
+        RosterMembership.end_date,
+        bindparam("as_of", on, type_=Date),
+    )
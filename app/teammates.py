@@ -0,0 +1,304 @@
+"""
+In-memory teammate graph for connection queries.
+
+Two players are teammates when they share a (team, season) roster. The graph
+is bipartite: players on one side, team-seasons on the other. Both sides get
+dense integer indexes and their adjacency is held in compact int arrays:
+    _rosters[ts]       player indexes on team-season ts
+    _memberships[p]    team-season indexes player p was on
+so a player's teammates are the union of a few rosters. Teammate lists, and
+shortest teammate paths found by bidirectional breadth-first search, take
+milliseconds at league-history scale, with no recursive self-joins on
+roster_memberships.
+
+Freshness, as for the player search index (app/search.py):
+- roster writes committed in this process mark their (team, season) dirty
+  (via on_roster_commit), and the next query re-reads just those rosters;
+- inserts from other processes, such as the seeder, are noticed when
+  max(roster_memberships.id) moves past what the graph has seen, which
+  triggers a full rebuild;
+- the graph is also rebuilt every TEAMMATE_GRAPH_TTL_SECONDS (default 600)
+  to pick up deletions made elsewhere.
+The API's lifespan handler builds the graph in the background at startup.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from array import array
+from typing import Iterable, Optional
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.config import get_settings
+from app.db import AsyncSessionLocal
+from app.models import RosterMembership, Season
+from app.roster_writes import on_roster_commit
+
+logger = logging.getLogger(__name__)
+
+# (team_id, season_id) pairs re-read per query when refreshing dirty rosters.
+REFRESH_CHUNK_SIZE = 500
+
+
+class TeammateGraph:
+    """Player <-> team-season adjacency over dense integer indexes."""
+
+    def __init__(self, season_years: dict[int, int]) -> None:
+        self.season_years = dict(season_years)
+        self._player_index: dict[int, int] = {}
+        self._player_ids = array("q")
+        self._memberships: list[array] = []
+        self._ts_index: dict[tuple[int, int], int] = {}
+        self._ts_keys: list[tuple[int, int]] = []
+        self._rosters: list[array] = []
+        self.max_membership_id = 0
+        self.built_at = time.monotonic()
+
+    @classmethod
+    def from_rows(cls, rows, season_years: dict[int, int]) -> "TeammateGraph":
+        """rows: iterable of (membership_id, team_id, season_id, player_id)."""
+        graph = cls(season_years)
+        rosters: dict[tuple[int, int], list[int]] = {}
+        for membership_id, team_id, season_id, player_id in rows:
+            rosters.setdefault((team_id, season_id), []).append(player_id)
+            graph.max_membership_id = max(graph.max_membership_id, membership_id)
+        graph.set_rosters(rosters)
+        return graph
+
+    def __len__(self) -> int:
+        return len(self._player_ids)
+
+    def _player(self, player_id: int) -> int:
+        idx = self._player_index.get(player_id)
+        if idx is None:
+            idx = self._player_index[player_id] = len(self._player_ids)
+            self._player_ids.append(player_id)
+            self._memberships.append(array("i"))
+        return idx
+
+    def _team_season(self, key: tuple[int, int]) -> int:
+        idx = self._ts_index.get(key)
+        if idx is None:
+            idx = self._ts_index[key] = len(self._ts_keys)
+            self._ts_keys.append(key)
+            self._rosters.append(array("i"))
+        return idx
+
+    def set_rosters(self, rosters: dict[tuple[int, int], Iterable[int]]) -> None:
+        """Replace the player list of each given (team_id, season_id) (empty to clear)."""
+        for key, player_ids in rosters.items():
+            ts = self._team_season(key)
+            new = {self._player(pid) for pid in player_ids}
+            old = set(self._rosters[ts])
+            for p in old - new:
+                self._memberships[p].remove(ts)
+            for p in sorted(new - old):
+                self._memberships[p].append(ts)
+            self._rosters[ts] = array("i", sorted(new))
+
+    def has_player(self, player_id: int) -> bool:
+        idx = self._player_index.get(player_id)
+        return idx is not None and len(self._memberships[idx]) > 0
+
+    def latest_season_id(self) -> Optional[int]:
+        if not self.season_years:
+            return None
+        return max(self.season_years, key=self.season_years.get)
+
+    def teammates(self, player_id: int, season_id: Optional[int] = None) -> list[tuple[int, int, int]]:
+        """
+        (teammate_id, seasons_together, last_season_year) for every teammate.
+
+        With season_id, only teammates on some roster in that season count.
+        Sorted by seasons together (desc), last season (desc), then id.
+        """
+        p = self._player_index.get(player_id)
+        if p is None:
+            return []
+        together: dict[int, list] = {}
+        for ts in self._memberships[p]:
+            year = self.season_years.get(self._ts_keys[ts][1], 0)
+            for q in self._rosters[ts]:
+                if q == p:
+                    continue
+                entry = together.get(q)
+                if entry is None:
+                    together[q] = [1, year]
+                else:
+                    entry[0] += 1
+                    entry[1] = max(entry[1], year)
+        if season_id is not None:
+            together = {
+                q: entry
+                for q, entry in together.items()
+                if any(self._ts_keys[ts][1] == season_id for ts in self._memberships[q])
+            }
+        ranked = sorted(
+            together.items(), key=lambda item: (-item[1][0], -item[1][1], self._player_ids[item[0]])
+        )
+        return [(self._player_ids[q], count, year) for q, (count, year) in ranked]
+
+    def shortest_path(self, from_id: int, to_id: int) -> Optional[list]:
+        """
+        Fewest-hop teammate chain from one player to another.
+
+        Returns [player_id, (team_id, season_id), player_id, ...] alternating
+        players and the roster they shared, or None when not connected.
+        Bidirectional BFS: the side with the smaller frontier expands one full
+        level at a time, and each team-season roster is scanned at most once
+        per side.
+        """
+        a = self._player_index.get(from_id)
+        b = self._player_index.get(to_id)
+        if a is None or b is None:
+            return None
+        if a == b:
+            return [from_id]
+        memberships, rosters = self._memberships, self._rosters
+        # player -> (previous player, shared team-season), per side
+        parents = ({a: None}, {b: None})
+        scanned = (set(), set())
+        frontiers = ([a], [b])
+        meeting = None
+        while frontiers[0] and frontiers[1] and meeting is None:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            mine, other, seen = parents[side], parents[1 - side], scanned[side]
+            next_frontier = []
+            for p in frontiers[side]:
+                for ts in memberships[p]:
+                    if ts in seen:
+                        continue
+                    seen.add(ts)
+                    for q in rosters[ts]:
+                        if q in mine:
+                            continue
+                        mine[q] = (p, ts)
+                        if q in other:
+                            meeting = q
+                            break
+                        next_frontier.append(q)
+                    if meeting is not None:
+                        break
+                if meeting is not None:
+                    break
+            frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+        if meeting is None:
+            return None
+
+        def walk(side: int) -> list:
+            chain, node = [], meeting
+            while parents[side][node] is not None:
+                prev, ts = parents[side][node]
+                chain.append((ts, prev))
+                node = prev
+            return chain
+
+        path = [self._player_ids[meeting]]
+        for ts, prev in walk(0):
+            path[:0] = [self._player_ids[prev], self._ts_keys[ts]]
+        for ts, nxt in walk(1):
+            path += [self._ts_keys[ts], self._player_ids[nxt]]
+        return path
+
+
+class TeammateGraphService:
+    """Holds the current graph; rebuilds or patches it from the database when stale."""
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self.graph: Optional[TeammateGraph] = None
+        self._lock = asyncio.Lock()
+        self._dirty: set[tuple[int, int]] = set()
+        self._dirty_lock = threading.Lock()
+
+    def mark_dirty(self, memberships: Iterable[tuple[int, int, int]]) -> None:
+        """on_roster_commit callback: re-read these (team, season) rosters on next use."""
+        with self._dirty_lock:
+            self._dirty.update((team_id, season_id) for team_id, season_id, _ in memberships)
+
+    def _take_dirty(self) -> set:
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty, set()
+        return dirty
+
+    async def get_graph(self, db: AsyncSession) -> TeammateGraph:
+        graph = self.graph
+        max_id = None
+        if graph is not None and time.monotonic() - graph.built_at < self.ttl:
+            # One index-only lookup notices rows inserted by other processes.
+            max_id = (await db.execute(select(func.max(RosterMembership.id)))).scalar_one() or 0
+            if max_id == graph.max_membership_id and not self._dirty:
+                return graph
+        async with self._lock:
+            if self.graph is not graph:
+                return self.graph  # another request rebuilt it while we waited
+            if max_id is not None:
+                # Patch the rosters written here; rebuild only if rows also
+                # arrived from elsewhere.
+                await self._refresh(db, graph, self._take_dirty())
+                if max_id <= graph.max_membership_id:
+                    return graph
+            self._take_dirty()
+            self.graph = await self._build(db)
+            return self.graph
+
+    async def warm(self) -> None:
+        """Build the graph ahead of the first query (run as a startup task)."""
+        try:
+            async with AsyncSessionLocal() as db:
+                await self.get_graph(db)
+        except Exception:
+            logger.exception("building the teammate graph at startup failed; will retry on first use")
+
+    async def _build(self, db: AsyncSession) -> TeammateGraph:
+        season_years = dict((await db.execute(select(Season.id, Season.year))).all())
+        rows = (
+            await db.execute(
+                select(
+                    RosterMembership.id,
+                    RosterMembership.team_id,
+                    RosterMembership.season_id,
+                    RosterMembership.player_id,
+                )
+            )
+        ).all()
+        # Building is CPU-bound; keep it off the event loop.
+        return await run_in_threadpool(TeammateGraph.from_rows, rows, season_years)
+
+    async def _refresh(self, db: AsyncSession, graph: TeammateGraph, pairs: set) -> None:
+        """Re-read the given (team_id, season_id) rosters into graph."""
+        if not pairs:
+            return
+        rosters: dict[tuple[int, int], list[int]] = {pair: [] for pair in pairs}
+        pair_list = list(pairs)
+        for start in range(0, len(pair_list), REFRESH_CHUNK_SIZE):
+            chunk = pair_list[start : start + REFRESH_CHUNK_SIZE]
+            rows = await db.execute(
+                select(
+                    RosterMembership.id,
+                    RosterMembership.team_id,
+                    RosterMembership.season_id,
+                    RosterMembership.player_id,
+                ).where(tuple_(RosterMembership.team_id, RosterMembership.season_id).in_(chunk))
+            )
+            for membership_id, team_id, season_id, player_id in rows:
+                rosters[(team_id, season_id)].append(player_id)
+                graph.max_membership_id = max(graph.max_membership_id, membership_id)
+        unknown_seasons = {season_id for _, season_id in pairs} - graph.season_years.keys()
+        if unknown_seasons:
+            graph.season_years.update(
+                (
+                    await db.execute(
+                        select(Season.id, Season.year).where(Season.id.in_(unknown_seasons))
+                    )
+                ).all()
+            )
+        graph.set_rosters(rosters)
+
+
+teammate_graph = TeammateGraphService(ttl=get_settings().teammate_graph_ttl_seconds)
+on_roster_commit(teammate_graph.mark_dirty)
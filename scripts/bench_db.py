@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Compare sync vs async database session latency under concurrent load.
+
+Run from project root against a seeded database:
+    python scripts/bench_db.py --requests 2000 --concurrency 100
+
+Both paths run the same roster query (one team's roster for one season) the
+way a single uvicorn worker would serve it:
+- sync:  a blocking Session per request, dispatched to Starlette's threadpool
+         (what FastAPI does for `def` endpoints using get_db).
+- async: an AsyncSession per request on the event loop (get_async_db).
+
+Prints p50/p99 latency and throughput for each path.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Run from project root so "app" is importable
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import func, select
+from starlette.concurrency import run_in_threadpool
+
+from app.db import AsyncSessionLocal, SessionLocal, get_async_engine
+from app.models import RosterMembership
+from app.pool import percentile
+
+
+def pick_team_season() -> tuple[int, int]:
+    """Use the largest (team, season) roster in the database as the benchmark query."""
+    with SessionLocal() as db:
+        row = db.execute(
+            select(RosterMembership.team_id, RosterMembership.season_id)
+            .group_by(RosterMembership.team_id, RosterMembership.season_id)
+            .order_by(func.count().desc())
+            .limit(1)
+        ).first()
+    if row is None:
+        raise SystemExit("No roster rows found; seed the database first (python scripts/seed.py).")
+    return row.team_id, row.season_id
+
+
+def roster_query(team_id: int, season_id: int):
+    return select(RosterMembership).where(
+        RosterMembership.team_id == team_id, RosterMembership.season_id == season_id
+    )
+
+
+def sync_request(team_id: int, season_id: int) -> None:
+    with SessionLocal() as db:
+        db.execute(roster_query(team_id, season_id)).scalars().all()
+
+
+async def async_request(team_id: int, season_id: int) -> None:
+    async with AsyncSessionLocal() as db:
+        (await db.execute(roster_query(team_id, season_id))).scalars().all()
+
+
+async def run_load(call, requests: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    wall = time.perf_counter() - started
+    return {
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "req_per_sec": requests / wall,
+    }
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    team_id, season_id = pick_team_season()
+
+    async def sync_call() -> None:
+        await run_in_threadpool(sync_request, team_id, season_id)
+
+    async def async_call() -> None:
+        await async_request(team_id, season_id)
+
+    paths = {"sync": sync_call, "async": async_call}
+    print(
+        f"{args.requests} requests, concurrency {args.concurrency}, roster query team_id={team_id} season_id={season_id}"
+    )
+    for name, call in paths.items():
+        # Warm up the pool so connection setup isn't counted as request latency.
+        await run_load(call, min(args.concurrency, args.requests), args.concurrency)
+        result = await run_load(call, args.requests, args.concurrency)
+        print(
+            f"  {name:>5}: p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms, "
+            f"mean {result['mean_ms']:.2f} ms, {result['req_per_sec']:,.0f} req/s"
+        )
+    await get_async_engine().dispose()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async DB sessions.")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    asyncio.run(main_async(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Before/after benchmark for the index rationalization migration (c4e8f1a2b9d7).
+
+Run from project root against a disposable Postgres database (its public
+schema is dropped and recreated):
+    python scripts/bench_indexes.py --database-url postgresql://localhost/nba_bench
+
+The same synthetic league (scripts/generate_league.py, fixed --seed) is loaded
+into two schemas, both built by "alembic upgrade head" so the current seeder
+and the stint columns work:
+    before  head with c4e8f1a2b9d7 undone: its REDUNDANT_INDEXES recreated,
+            idx_player_name dropped, and unique_roster_membership in the old
+            (team_id, player_id, season_id, ...) column order
+    after   head as migrated
+For each schema it measures:
+- seeding: seed.py --bulk into empty tables, then the idempotent rerun;
+- writes: batches of roster memberships (INSERT ... ON CONFLICT DO NOTHING)
+  and of players, each batch rolled back, as rows/s;
+- reads: the main read queries (team-season roster, player history, resolve
+  players by name, season export) with random keys, p50/p95 ms, plus the
+  indexes each query's plan uses (EXPLAIN);
+- index footprint: total index size and index count of the league tables.
+Results go to bench-results/indexes-<timestamp>.json; the summary prints
+each metric before -> after.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Run from project root so "app" and the sibling bench_suite are importable
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from sqlalchemy import String, and_, bindparam, create_engine, func, insert, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Engine, make_url
+
+from app.pool import percentile
+from bench_suite import RESULTS_DIR, git_commit, run_script
+
+RATIONALIZATION_REVISION = "c4e8f1a2b9d7"
+LEAGUE_TABLES = ("teams", "players", "seasons", "roster_memberships")
+
+
+def reset_database(engine: Engine) -> None:
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("DROP SCHEMA public CASCADE"))
+        conn.execute(text("CREATE SCHEMA public"))
+
+
+def load_migration(revision: str):
+    """The module of an Alembic revision, for its index lists."""
+    path = next((ROOT / "alembic" / "versions").glob(f"{revision}_*.py"))
+    spec = importlib.util.spec_from_file_location(f"migration_{revision}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def restore_original_indexes(engine: Engine) -> None:
+    """Undo the rationalization migration's index changes on a head schema."""
+    migration = load_migration(RATIONALIZATION_REVISION)
+    with engine.begin() as conn:
+        for name, table, columns in migration.REDUNDANT_INDEXES:
+            conn.execute(text(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})"))
+        conn.execute(text("DROP INDEX idx_player_name"))
+        # The stint migration appended start_date to the unique key; keep it,
+        # with the original leading columns.
+        conn.execute(text("ALTER TABLE roster_memberships DROP CONSTRAINT unique_roster_membership"))
+        conn.execute(
+            text(
+                "ALTER TABLE roster_memberships ADD CONSTRAINT unique_roster_membership "
+                "UNIQUE (team_id, player_id, season_id, start_date)"
+            )
+        )
+
+
+SCHEMAS = {"before": restore_original_indexes, "after": None}
+
+
+def index_footprint(engine: Engine) -> dict:
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text(
+                "SELECT relname, pg_indexes_size(relid), "
+                "(SELECT count(*) FROM pg_index WHERE indrelid = relid) "
+                "FROM pg_stat_user_tables WHERE relname = ANY(:tables)"
+            ),
+            {"tables": list(LEAGUE_TABLES)},
+        ).all()
+    return {
+        "index_bytes": sum(r[1] for r in rows),
+        "index_count": sum(r[2] for r in rows),
+        "per_table": {r[0]: {"index_bytes": r[1], "index_count": r[2]} for r in rows},
+    }
+
+
+def dataset_keys(engine: Engine, seed: int) -> dict:
+    from app.models import Player, Season, Team
+
+    rng = random.Random(seed)
+    with engine.connect() as conn:
+        teams = conn.execute(select(Team.id, Team.abbreviation)).all()
+        seasons = conn.execute(select(Season.id, Season.year, Season.start_date, Season.end_date)).all()
+        players = conn.execute(select(Player.id, Player.first_name, Player.last_name)).all()
+    return {"teams": teams, "seasons": seasons, "players": rng.sample(players, min(len(players), 2000))}
+
+
+def read_queries(keys: dict) -> dict:
+    """name -> function(rng) returning a statement shaped like the endpoint's query."""
+    from app.models import Player, RosterMembership, Season, Team
+
+    teams, seasons, players = keys["teams"], keys["seasons"], keys["players"]
+    return {
+        # GET /teams/{abbreviation}/seasons/{year}/roster
+        "roster": lambda rng: (
+            select(RosterMembership.id, Team.name, Season.year, Player.first_name, Player.last_name)
+            .join(RosterMembership.team)
+            .join(RosterMembership.season)
+            .join(RosterMembership.player)
+            .where(Team.abbreviation == rng.choice(teams)[1], Season.year == rng.choice(seasons)[1])
+            .order_by(Player.last_name, Player.first_name)
+        ),
+        # GET /players/{id}/history
+        "player_history": lambda rng: (
+            select(RosterMembership.id, Team.abbreviation, Season.year)
+            .join(RosterMembership.team)
+            .join(RosterMembership.season)
+            .where(RosterMembership.player_id == rng.choice(players)[0])
+            .order_by(Season.year, RosterMembership.id)
+            .limit(51)
+        ),
+        # POST /players/resolve (100 names), joined as unnest(first, last) arrays
+        "resolve_players": lambda rng: resolve_players_query(
+            Player, [(p[1], p[2]) for p in rng.sample(players, min(len(players), 100))]
+        ),
+        # GET /export/rosters?season=
+        "export_season": lambda rng: (
+            select(RosterMembership.id, RosterMembership.team_id, RosterMembership.player_id)
+            .join(RosterMembership.season)
+            .where(Season.year == rng.choice(seasons)[1])
+            .order_by(RosterMembership.id)
+        ),
+    }
+
+
+def resolve_players_query(Player, names: list):
+    first_names, last_names = zip(*names)
+    wanted = (
+        func.unnest(
+            bindparam("first_names", list(first_names), type_=ARRAY(String)),
+            bindparam("last_names", list(last_names), type_=ARRAY(String)),
+        )
+        .table_valued("first_name", "last_name")
+        .render_derived(name="wanted")
+    )
+    return (
+        select(Player.first_name, Player.last_name, Player.id)
+        .join(wanted, and_(Player.first_name == wanted.c.first_name, Player.last_name == wanted.c.last_name))
+        .order_by(Player.id)
+    )
+
+
+def plan_indexes(plan) -> set:
+    """Every "Index Name" in an EXPLAIN (FORMAT JSON) plan tree."""
+    found = set()
+    if isinstance(plan, dict):
+        if "Index Name" in plan:
+            found.add(plan["Index Name"])
+        for value in plan.values():
+            found |= plan_indexes(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            found |= plan_indexes(item)
+    return found
+
+
+def bench_reads(engine: Engine, keys: dict, runs: int, seed: int) -> dict:
+    results = {}
+    with engine.connect() as conn:
+        conn.execute(text("ANALYZE"))
+        for name, make_query in read_queries(keys).items():
+            rng = random.Random(seed)
+            samples = []
+            for _ in range(runs):
+                stmt = make_query(rng)
+                started = time.perf_counter()
+                conn.execute(stmt).all()
+                samples.append((time.perf_counter() - started) * 1000)
+            compiled = make_query(random.Random(seed)).compile(
+                dialect=engine.dialect, compile_kwargs={"literal_binds": True}
+            )
+            plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar_one()
+            results[name] = {
+                "p50_ms": round(percentile(samples, 50), 3),
+                "p95_ms": round(percentile(samples, 95), 3),
+                "indexes_used": sorted(plan_indexes(plan)),
+            }
+    return results
+
+
+def bench_writes(engine: Engine, keys: dict, batches: int, batch_size: int, seed: int) -> dict:
+    """Rows/s for batches of roster memberships and players, each rolled back."""
+    from app.models import Player, RosterMembership
+
+    rng = random.Random(seed)
+    team_ids = [t[0] for t in keys["teams"]]
+    seasons = keys["seasons"]
+    player_ids = [p[0] for p in keys["players"]]
+    timings = {"roster_insert": 0.0, "player_insert": 0.0}
+    with engine.connect() as conn:
+        for batch in range(batches):
+            memberships = []
+            for _ in range(batch_size):
+                season = rng.choice(seasons)
+                memberships.append(
+                    {
+                        "team_id": rng.choice(team_ids),
+                        "player_id": rng.choice(player_ids),
+                        "season_id": season.id,
+                        "start_date": season.start_date,
+                        "end_date": season.end_date,
+                    }
+                )
+            new_players = [
+                {"first_name": f"Bench{batch}", "last_name": f"Player{n}", "position": rng.choice(["PG", "SF", "C"])}
+                for n in range(batch_size)
+            ]
+            for name, stmt, params in (
+                (
+                    "roster_insert",
+                    # No conflict target, so overlapping stints (the exclusion
+                    # constraint) are skipped too, as in the bulk seeder.
+                    pg_insert(RosterMembership).values(memberships).on_conflict_do_nothing(),
+                    None,
+                ),
+                ("player_insert", insert(Player), new_players),
+            ):
+                trans = conn.begin()
+                started = time.perf_counter()
+                conn.execute(stmt, params)
+                timings[name] += time.perf_counter() - started
+                trans.rollback()
+    return {name: round(batches * batch_size / seconds, 1) for name, seconds in timings.items()}
+
+
+def bench_schema(label: str, prepare, args: argparse.Namespace, env: dict, data_dir: Path) -> dict:
+    engine = create_engine(args.database_url)
+    reset_database(engine)
+    run_script(["-m", "alembic", "upgrade", "head"], env)
+    if prepare is not None:
+        prepare(engine)
+    with (data_dir / "rosters.json").open() as f:
+        roster_rows = len(json.load(f))
+    seed = {}
+    for mode in ("initial", "rerun"):
+        seconds, _ = run_script(["scripts/seed.py", "--data-dir", str(data_dir), "--bulk"], env)
+        seed[mode] = {"seconds": round(seconds, 3), "rows_per_second": round(roster_rows / seconds, 1)}
+    keys = dataset_keys(engine, args.seed)
+    result = {
+        "indexes": "pre-" + RATIONALIZATION_REVISION if prepare is not None else "head",
+        "seed": seed,
+        "writes_rows_per_second": bench_writes(engine, keys, args.write_batches, args.write_batch_size, args.seed),
+        "reads": bench_reads(engine, keys, args.runs, args.seed),
+        "footprint": index_footprint(engine),
+    }
+    engine.dispose()
+    print(
+        f"{label}: seed {seed['initial']['rows_per_second']:,.0f} rows/s (rerun {seed['rerun']['rows_per_second']:,.0f}), "
+        f"{result['footprint']['index_count']} indexes, {result['footprint']['index_bytes'] / 1e6:.1f} MB"
+    )
+    return result
+
+
+def print_summary(before: dict, after: dict) -> None:
+    def line(label: str, old, new, higher_is_better: bool) -> None:
+        change = (new - old) / old if old else 0.0
+        better = change > 0 if higher_is_better else change < 0
+        print(f"  {label:<36} {old:>12} -> {new:>12} ({change:+.1%}{', better' if better and change else ''})")
+
+    print("Before -> after:")
+    for mode in ("initial", "rerun"):
+        line(f"seed {mode} rows/s", before["seed"][mode]["rows_per_second"], after["seed"][mode]["rows_per_second"], True)
+    for name in before["writes_rows_per_second"]:
+        line(f"{name} rows/s", before["writes_rows_per_second"][name], after["writes_rows_per_second"][name], True)
+    for name in before["reads"]:
+        line(f"{name} p50 ms", before["reads"][name]["p50_ms"], after["reads"][name]["p50_ms"], False)
+        line(f"{name} p95 ms", before["reads"][name]["p95_ms"], after["reads"][name]["p95_ms"], False)
+    line("index bytes", before["footprint"]["index_bytes"], after["footprint"]["index_bytes"], False)
+    line("index count", before["footprint"]["index_count"], after["footprint"]["index_count"], False)
+    for name in before["reads"]:
+        print(f"  {name} uses: {before['reads'][name]['indexes_used']} -> {after['reads'][name]['indexes_used']}")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the index rationalization migration before and after.")
+    parser.add_argument(
+        "--database-url", required=True, help="Disposable Postgres database (its public schema is dropped)."
+    )
+    parser.add_argument("--data-dir", type=Path, help="Use existing data/*.json-style files instead of generating.")
+    parser.add_argument("--seasons", type=int, default=75)
+    parser.add_argument("--players", type=int, default=5000)
+    parser.add_argument("--rosters", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=200, help="Executions per read query.")
+    parser.add_argument("--write-batches", type=int, default=20)
+    parser.add_argument("--write-batch-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", type=Path, help="Results file (default: bench-results/indexes-<timestamp>.json).")
+    args = parser.parse_args(argv)
+    if make_url(args.database_url).get_backend_name() != "postgresql":
+        parser.error("--database-url must be a Postgres database (the migration uses CREATE INDEX CONCURRENTLY)")
+
+    env = dict(os.environ, DATABASE_URL=args.database_url, ASYNC_DATABASE_URL="")
+    started_at = datetime.now(timezone.utc)
+    with tempfile.TemporaryDirectory(prefix="nba-bench-indexes-") as tmp:
+        data_dir = args.data_dir
+        if data_dir is None:
+            data_dir = Path(tmp) / "league"
+            _, output = run_script(
+                [
+                    "scripts/generate_league.py", "--out", str(data_dir), "--seasons", str(args.seasons),
+                    "--players", str(args.players), "--rosters", str(args.rosters), "--seed", str(args.seed),
+                ],
+                env,
+            )
+            print(output.strip())
+        results = {label: bench_schema(label, prepare, args, env, data_dir) for label, prepare in SCHEMAS.items()}
+
+    print_summary(results["before"], results["after"])
+    document = {
+        "started_at": started_at.isoformat(),
+        "git_commit": git_commit(),
+        "settings": {
+            "runs": args.runs,
+            "write_batches": args.write_batches,
+            "write_batch_size": args.write_batch_size,
+            "seed": args.seed,
+        },
+        **results,
+    }
+    out = args.out or RESULTS_DIR / f"indexes-{started_at.isoformat()[:19].replace(':', '')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(document, indent=2) + "\n")
+    print(f"Results written to {out}")
+
+
+if __name__ == "__main__":
+    main()
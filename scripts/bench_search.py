@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark player name search latency against the 10 ms budget.
+
+Run from project root:
+    python scripts/bench_search.py --synthetic 100000
+
+Builds the same in-process PlayerSearchIndex that GET /players/search uses,
+from the players table plus --synthetic N generated players (held in memory
+only; nothing is written to the database), then times a fixed set of queries.
+
+Prints index build time, p50/p99 latency per query and overall, and whether
+p99 is within budget.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Run from project root so "app" is importable
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import select
+
+from app.db import SessionLocal
+from app.models import Player
+from app.pool import percentile
+from app.search import PlayerSearchIndex, normalize_query
+
+BUDGET_MS = 10.0
+QUERIES = ["lebr jam", "james", "cur", "antetok", "jo", "j", "an da", "bron", "smith", "zz"]
+
+SYLLABLES = ["al", "an", "ba", "bo", "ca", "da", "de", "el", "ja", "jo", "ka", "ke",
+             "la", "le", "ma", "mi", "na", "no", "ra", "ro", "sa", "ta", "te", "vi", "za"]
+POSITIONS = ["PG", "SG", "SF", "PF", "C"]
+
+
+def synthetic_name(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark GET /players/search queries.")
+    parser.add_argument("--synthetic", type=int, default=0, help="Generated players to add (in memory).")
+    parser.add_argument("--repeat", type=int, default=200, help="Runs per query.")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        rows = [
+            tuple(r)
+            for r in db.execute(
+                select(Player.id, Player.first_name, Player.last_name, Player.position)
+            )
+        ]
+    rng = random.Random(args.seed)
+    next_id = max((r[0] for r in rows), default=0) + 1
+    rows.extend(
+        (next_id + i, synthetic_name(rng), synthetic_name(rng), rng.choice(POSITIONS))
+        for i in range(args.synthetic)
+    )
+
+    started = time.perf_counter()
+    index = PlayerSearchIndex(rows)
+    build_ms = (time.perf_counter() - started) * 1000
+    print(
+        f"{len(index)} players, index built in {build_ms:.0f} ms, "
+        f"{args.repeat} runs per query, budget p99 <= {BUDGET_MS:.0f} ms"
+    )
+
+    all_samples = []
+    for q in QUERIES:
+        tokens = normalize_query(q)
+        samples = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            results = index.search(tokens, limit=10)
+            samples.append((time.perf_counter() - started) * 1000)
+        all_samples.extend(samples)
+        print(
+            f"  {q!r:>10}: p50 {percentile(samples, 50):.3f} ms, "
+            f"p99 {percentile(samples, 99):.3f} ms, {len(results)} results"
+        )
+
+    p99 = percentile(all_samples, 99)
+    verdict = "within" if p99 <= BUDGET_MS else "OVER"
+    print(f"  overall: p50 {percentile(all_samples, 50):.3f} ms, p99 {p99:.3f} ms ({verdict} budget)")
+
+
+if __name__ == "__main__":
+    main()
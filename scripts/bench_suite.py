@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+Reproducible benchmark suite: seeder throughput and endpoint latency at league scale.
+
+Run from project root:
+    python scripts/bench_suite.py                                   # temporary SQLite database
+    python scripts/bench_suite.py --database-url postgresql://...   # disposable Postgres
+    python scripts/bench_suite.py --compare bench-results/<earlier>.json
+
+Steps:
+1. Generate a synthetic league (scripts/generate_league.py, fixed --seed) unless
+   --data-dir points at existing data/*.json-style files.
+2. Drop and recreate every table in the target database. Only point
+   --database-url at a database you can throw away.
+3. Seed it with scripts/seed.py (--bulk on Postgres; the bulk statements are
+   Postgres-only, so SQLite uses row-by-row mode), then seed again to time the
+   idempotent no-op pass.
+4. Start the API under uvicorn and drive each endpoint scenario with
+   --concurrency keep-alive HTTP clients for --requests requests, recording
+   latency percentiles, throughput, and SQL queries per request (from the
+   Server-Timing header). The response cache is disabled unless --with-cache,
+   so the numbers reflect the database path. The last scenario, roster_batch,
+   is the write path: each POST /rosters/batch removes BATCH_SCENARIO_ITEMS
+   sampled memberships and re-adds them, so the dataset keeps its shape, and
+   its throughput is also reported in batch items/s.
+5. Profile cold start: time `import app.main` in fresh interpreters, the
+   server's time from launch to its first /health answer, and the latency of
+   the first real request against a fresh server (engine, pool connections,
+   and in-process indexes are all built lazily).
+6. Restart the API with READ_MODEL_ENABLED=true, wait for the in-memory read
+   model to load, and rerun the endpoints it serves, reporting its memory
+   footprint, load time, and requests/sec next to the database path.
+7. Write everything to a JSON file (--out) and, with --compare, print the change
+   against an earlier run and exit 1 if p99 latency or throughput regressed by
+   more than --tolerance.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+# Run from project root so "app" is importable
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.engine import make_url
+
+from app.pool import percentile
+
+RESULTS_DIR = ROOT / "bench-results"
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+# Scenarios app/read_model.py answers when READ_MODEL_ENABLED is on.
+READ_MODEL_SCENARIOS = ("roster", "players_page", "player_history", "resolve_players")
+# Memberships removed and re-added by each roster_batch request.
+BATCH_SCENARIO_ITEMS = 100
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def git_commit() -> str:
+    result = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True
+    )
+    return result.stdout.strip() or "unknown"
+
+
+def run_script(args: list[str], env: dict) -> tuple[float, str]:
+    """Run a scripts/ entry point; return (seconds, stdout)."""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, *args], cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        raise SystemExit(f"{' '.join(args)} failed:\n{result.stdout}{result.stderr}")
+    return elapsed, result.stdout
+
+
+def reset_schema(database_url: str) -> None:
+    from app.db import Base
+    import app.models  # noqa: F401  (registers the tables on Base.metadata)
+
+    engine = create_engine(database_url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+
+def dataset_sample(database_url: str, seed: int) -> dict:
+    """Counts and randomly chosen keys for building requests."""
+    from app.models import Change, Player, RosterMembership, Season, Team
+
+    rng = random.Random(seed)
+    engine = create_engine(database_url)
+    with engine.connect() as conn:
+        counts = {
+            name: conn.execute(select(func.count()).select_from(model)).scalar_one()
+            for name, model in (
+                ("teams", Team), ("players", Player), ("seasons", Season), ("roster_rows", RosterMembership)
+            )
+        }
+        teams = conn.execute(select(Team.abbreviation)).scalars().all()
+        years = conn.execute(select(Season.year)).scalars().all()
+        players = conn.execute(select(Player.id, Player.first_name, Player.last_name)).all()
+        memberships = conn.execute(
+            select(RosterMembership.team_id, RosterMembership.player_id, RosterMembership.season_id).distinct()
+        ).all()
+        latest_seq = conn.execute(select(func.max(Change.seq))).scalar_one() or 0
+    engine.dispose()
+    return {
+        "counts": counts,
+        "teams": teams,
+        "years": years,
+        "players": rng.sample(players, min(len(players), 2000)),
+        "memberships": rng.sample(memberships, min(len(memberships), 2000)),
+        "latest_seq": latest_seq,
+    }
+
+
+def random_season_day(rng: random.Random, year: int) -> date:
+    """A day within the season's default [start, end) dates."""
+    from app.models import season_dates
+
+    start, end = season_dates(year)
+    return start + timedelta(days=rng.randrange((end - start).days))
+
+
+def scenarios(sample: dict) -> dict:
+    """name -> function(rng) returning (method, path, body or None)."""
+    teams, years, players = sample["teams"], sample["years"], sample["players"]
+    return {
+        "roster": lambda rng: (
+            "GET", f"/teams/{rng.choice(teams)}/seasons/{rng.choice(years)}/roster", None
+        ),
+        "roster_as_of": lambda rng: (
+            "GET",
+            f"/teams/{rng.choice(teams)}/roster?as_of={random_season_day(rng, rng.choice(years))}",
+            None,
+        ),
+        "players_page": lambda rng: ("GET", "/players?limit=100", None),
+        "player_history": lambda rng: ("GET", f"/players/{rng.choice(players)[0]}/history", None),
+        "player_search": lambda rng: (
+            "GET", f"/players/search?q={rng.choice(players)[2][:3].lower()}", None
+        ),
+        "analytics_season": lambda rng: ("GET", f"/analytics/teams?season={rng.choice(years)}", None),
+        "resolve_players": lambda rng: (
+            "POST",
+            "/players/resolve",
+            {"players": [{"first_name": p[1], "last_name": p[2]} for p in rng.sample(players, 100)]},
+        ),
+        "changes_page": lambda rng: (
+            "GET", f"/changes?since={rng.randint(0, sample['latest_seq'])}&limit=500", None
+        ),
+        "export_season": lambda rng: ("GET", f"/export/rosters?season={rng.choice(years)}", None),
+        # Writes: keep it last so the read scenarios see the seeded data.
+        "roster_batch": lambda rng: ("POST", "/rosters/batch", roster_batch_body(rng, sample["memberships"])),
+    }
+
+
+def roster_batch_body(rng: random.Random, memberships: list) -> dict:
+    """Remove BATCH_SCENARIO_ITEMS memberships and re-add them as full-season stints."""
+    keys = [
+        {"team_id": t, "player_id": p, "season_id": s}
+        for t, p, s in rng.sample(memberships, min(len(memberships), BATCH_SCENARIO_ITEMS))
+    ]
+    return {"remove": keys, "add": keys}
+
+
+def run_scenario(port: int, make_request, requests: int, concurrency: int, seed: int) -> dict:
+    per_worker = -(-requests // concurrency)
+
+    def worker(worker_id: int) -> list:
+        rng = random.Random(seed * 1000 + worker_id)
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        samples = []
+        for _ in range(per_worker):
+            method, path, body = make_request(rng)
+            payload = json.dumps(body) if body is not None else None
+            headers = {"Content-Type": "application/json"} if payload else {}
+            started = time.perf_counter()
+            conn.request(method, path, body=payload, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            elapsed = time.perf_counter() - started
+            match = SERVER_TIMING_QUERIES.search(response.getheader("server-timing") or "")
+            samples.append((elapsed, response.status, int(match.group(1)) if match else None))
+        conn.close()
+        return samples
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = [s for batch in pool.map(worker, range(concurrency)) for s in batch]
+    wall = time.perf_counter() - started
+
+    latencies = [s[0] * 1000 for s in samples]
+    queries = [s[2] for s in samples if s[2] is not None]
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for s in samples if s[1] >= 400),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(max(latencies), 3),
+        "requests_per_second": round(len(samples) / wall, 1),
+        "mean_queries": round(sum(queries) / len(queries), 2) if queries else None,
+    }
+
+
+def import_time_ms(env: dict, runs: int = 5) -> float:
+    """Median wall time of `import app.main` in a fresh interpreter."""
+    code = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+    samples = []
+    for _ in range(runs):
+        _, output = run_script(["-c", code], env)
+        samples.append(float(output) * 1000)
+    return round(statistics.median(samples), 1)
+
+
+def timed_request(port: int, path: str) -> float:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    started = time.perf_counter()
+    conn.request("GET", path)
+    conn.getresponse().read()
+    elapsed = time.perf_counter() - started
+    conn.close()
+    return round(elapsed * 1000, 3)
+
+
+def start_server(env: dict, port: int) -> tuple[subprocess.Popen, float]:
+    """Launch uvicorn; return the process and seconds until /health answered."""
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return server, time.perf_counter() - started
+        except OSError:
+            time.sleep(0.02)
+    server.terminate()
+    raise SystemExit("API server did not start within 30s")
+
+
+def wait_for_read_model(port: int, timeout: float = 120) -> dict:
+    """Poll /health/read-model until the model is serving; return its status."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        conn.request("GET", "/health/read-model")
+        status = json.loads(conn.getresponse().read())
+        conn.close()
+        if status["serving"]:
+            return status
+        time.sleep(0.1)
+    raise SystemExit(f"read model did not load within {timeout:.0f}s")
+
+
+def run_read_model(env: dict, sample: dict, args: argparse.Namespace, db_results: dict) -> dict:
+    """Rerun READ_MODEL_SCENARIOS against a server answering from the read model."""
+    port = free_port()
+    server, _ = start_server(dict(env, READ_MODEL_ENABLED="true"), port)
+    results = {}
+    try:
+        status = wait_for_read_model(port)
+        print(
+            f"Read model: {status['memberships']:,} memberships, ~{status['memory_bytes'] / 1e6:.1f} MB, "
+            f"loaded in {status['load_ms']} ms"
+        )
+        all_scenarios = scenarios(sample)
+        for name in READ_MODEL_SCENARIOS:
+            result = run_scenario(port, all_scenarios[name], args.requests, args.concurrency, args.seed)
+            results[name] = result
+            before = db_results[name]["requests_per_second"]
+            print(
+                f"  {name:<18} p50 {result['p50_ms']:8.2f} ms  p99 {result['p99_ms']:8.2f} ms  "
+                f"{result['requests_per_second']:8.1f} req/s ({result['requests_per_second'] / before:.1f}x db)  "
+                f"queries {result['mean_queries']}  errors {result['errors']}"
+            )
+    finally:
+        server.terminate()
+        server.wait()
+    return {
+        "memory_bytes": status["memory_bytes"],
+        "load_ms": status["load_ms"],
+        "endpoints": results,
+    }
+
+
+def compare(current: dict, previous: dict, tolerance: float) -> list[str]:
+    """Print per-metric changes; return the regressions."""
+    regressions = []
+
+    def check(label: str, now, before, higher_is_better: bool) -> None:
+        if not now or not before:
+            return
+        change = (now - before) / before
+        worse = -change if higher_is_better else change
+        flag = "REGRESSION" if worse > tolerance else ""
+        print(f"  {label:<40} {before:>10} -> {now:>10} ({change:+.1%}) {flag}")
+        if flag:
+            regressions.append(label)
+
+    print(f"Compared with {previous.get('git_commit')} ({previous.get('started_at')}):")
+    for mode in ("initial", "rerun"):
+        check(
+            f"seed {mode} rows/s",
+            current["seed"][mode]["rows_per_second"],
+            previous.get("seed", {}).get(mode, {}).get("rows_per_second"),
+            higher_is_better=True,
+        )
+    for metric in ("import_ms", "server_ready_ms", "first_request_ms"):
+        check(
+            f"startup {metric}",
+            current["startup"][metric],
+            previous.get("startup", {}).get(metric),
+            higher_is_better=False,
+        )
+    for name, result in current["endpoints"].items():
+        before = previous.get("endpoints", {}).get(name)
+        if before is None:
+            continue
+        check(f"{name} p99 ms", result["p99_ms"], before["p99_ms"], higher_is_better=False)
+        check(f"{name} req/s", result["requests_per_second"], before["requests_per_second"], True)
+    for name, result in current["read_model"]["endpoints"].items():
+        before = previous.get("read_model", {}).get("endpoints", {}).get(name)
+        if before is None:
+            continue
+        check(f"read model {name} p99 ms", result["p99_ms"], before["p99_ms"], higher_is_better=False)
+        check(f"read model {name} req/s", result["requests_per_second"], before["requests_per_second"], True)
+    check(
+        "read model memory bytes",
+        current["read_model"]["memory_bytes"],
+        previous.get("read_model", {}).get("memory_bytes"),
+        higher_is_better=False,
+    )
+    return regressions
+
+
+def run_benchmarks(args: argparse.Namespace, workdir: Path) -> dict:
+    """Generate, seed, and load-test; return the results document."""
+    database_url = args.database_url or f"sqlite:///{workdir / 'bench.db'}"
+    # The scripts and the server get the URL through env; the in-process
+    # helpers (reset_schema, dataset_sample) build their own engines from it,
+    # so app settings are never read here and import order does not matter.
+    env = dict(os.environ, DATABASE_URL=database_url, ASYNC_DATABASE_URL="", READ_MODEL_ENABLED="false")
+    if not args.with_cache:
+        env["CACHE_MAX_ENTRIES"] = "0"
+    started_at = datetime.now(timezone.utc)
+
+    data_dir = args.data_dir
+    if data_dir is None:
+        data_dir = workdir / "league"
+        _, output = run_script(
+            [
+                "scripts/generate_league.py", "--out", str(data_dir), "--seasons", str(args.seasons),
+                "--players", str(args.players), "--rosters", str(args.rosters), "--seed", str(args.seed),
+            ],
+            env,
+        )
+        print(output.strip())
+
+    reset_schema(database_url)
+    is_postgres = make_url(database_url).get_backend_name() == "postgresql"
+    seed_args = ["scripts/seed.py", "--data-dir", str(data_dir)] + (["--bulk"] if is_postgres else [])
+    with (data_dir / "rosters.json").open() as f:
+        roster_rows = len(json.load(f))
+    seed_results = {}
+    for mode in ("initial", "rerun"):
+        seconds, _ = run_script(seed_args, env)
+        seed_results[mode] = {
+            "mode": "bulk" if is_postgres else "row_by_row",
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(roster_rows / seconds, 1),
+        }
+        print(f"Seed ({mode}): {seconds:.2f}s, {roster_rows / seconds:,.0f} roster rows/s")
+
+    sample = dataset_sample(database_url, args.seed)
+    import_ms = import_time_ms(env)
+    port = free_port()
+    server, ready_seconds = start_server(env, port)
+    endpoint_results = {}
+    try:
+        first_path = f"/teams/{sample['teams'][0]}/seasons/{sample['years'][-1]}/roster"
+        startup = {
+            "import_ms": import_ms,
+            "server_ready_ms": round(ready_seconds * 1000, 1),
+            "first_request_ms": timed_request(port, first_path),
+            "second_request_ms": timed_request(port, first_path),
+        }
+        print(
+            f"Startup: import {startup['import_ms']} ms, ready {startup['server_ready_ms']} ms, "
+            f"first request {startup['first_request_ms']} ms (then {startup['second_request_ms']} ms)"
+        )
+        for name, make_request in scenarios(sample).items():
+            result = run_scenario(port, make_request, args.requests, args.concurrency, args.seed)
+            endpoint_results[name] = result
+            print(
+                f"  {name:<18} p50 {result['p50_ms']:8.2f} ms  p99 {result['p99_ms']:8.2f} ms  "
+                f"{result['requests_per_second']:8.1f} req/s  queries {result['mean_queries']}  "
+                f"errors {result['errors']}"
+            )
+            if name == "roster_batch":
+                items = 2 * BATCH_SCENARIO_ITEMS
+                result["items_per_second"] = round(result["requests_per_second"] * items, 1)
+                print(f"  {'':<18} {items} items per batch: {result['items_per_second']:,.0f} items/s")
+    finally:
+        server.terminate()
+        server.wait()
+    read_model_results = run_read_model(env, sample, args, endpoint_results)
+
+    return {
+        "started_at": started_at.isoformat(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "database": make_url(database_url).get_backend_name(),
+        "settings": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "cache": args.with_cache,
+        },
+        "dataset": sample["counts"],
+        "seed": seed_results,
+        "startup": startup,
+        "endpoints": endpoint_results,
+        "read_model": read_model_results,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark seeding and endpoints on synthetic league data.")
+    parser.add_argument(
+        "--database-url",
+        help="Disposable database to benchmark (all tables are dropped). Default: a temporary SQLite file.",
+    )
+    parser.add_argument("--data-dir", type=Path, help="Use existing data/*.json-style files instead of generating.")
+    parser.add_argument("--seasons", type=int, default=75)
+    parser.add_argument("--players", type=int, default=5000)
+    parser.add_argument("--rosters", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint scenario.")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--with-cache", action="store_true", help="Leave the response cache enabled.")
+    parser.add_argument("--out", type=Path, help="Results file (default: bench-results/bench-<timestamp>.json).")
+    parser.add_argument("--compare", type=Path, metavar="PREVIOUS_JSON", help="Earlier results to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before flagging (default 0.2 = 20%%).")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="nba-bench-") as tmp:
+        results = run_benchmarks(args, Path(tmp))
+    out = args.out or RESULTS_DIR / f"bench-{results['started_at'][:19].replace(':', '')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"Results written to {out}")
+
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text()), args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
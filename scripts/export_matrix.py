@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Export the league-wide roster membership matrix as a NumPy .npz archive.
+
+Run from project root:
+    python scripts/export_matrix.py --out roster-matrix.npz
+
+Same arrays as GET /export/roster-matrix.npz; see app/matrix_export.py for the
+layout.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Run from project root so "app" is importable
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.db import SessionLocal
+from app.matrix_export import write_roster_matrix
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Export roster memberships as a .npz matrix.")
+    parser.add_argument("--out", type=Path, default=Path("roster-matrix.npz"))
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    with SessionLocal() as db, args.out.open("wb") as out:
+        memberships = write_roster_matrix(db, out)
+    size_kb = args.out.stat().st_size / 1024
+    print(
+        f"Wrote {memberships} memberships to {args.out} ({size_kb:,.0f} KiB) in {time.perf_counter() - started:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
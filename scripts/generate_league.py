@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic league history in the data/*.json formats.
+
+Run from project root:
+    python scripts/generate_league.py --out data/synthetic
+    python scripts/seed.py --data-dir data/synthetic --bulk
+
+Defaults give a league-scale dataset: 30 teams, 75 seasons, ~5000 players,
+and ~100,000 roster rows. The history is simulated season by season:
+- each season has about rosters / seasons active players, split across teams;
+- players have multi-season careers; those whose career ends retire, and
+  debuting players take their places;
+- most players stay with last season's team, the rest move to the team with
+  the most open slots (free agency / trades).
+The same --seed always produces the same files, so benchmark runs compare
+like with like.
+
+Teams come from data/teams.json (the real 30 franchises); beyond that,
+expansion teams are invented. Player names are unique, since the seeder
+identifies players by (first_name, last_name).
+"""
+
+import argparse
+import json
+import random
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+POSITIONS = ["PG", "SG", "SF", "PF", "C"]
+FIRST_NAMES = [
+    "Aaron", "Andre", "Anthony", "Ben", "Brandon", "Bruce", "Caleb", "Cameron", "Chris", "Dale",
+    "Damian", "Darius", "David", "Derrick", "Devin", "Donovan", "Dwight", "Elijah", "Eric", "Frank",
+    "Gary", "Gordon", "Grant", "Isaiah", "Jalen", "Jamal", "James", "Jason", "Jaylen", "Jerome",
+    "Joel", "John", "Jordan", "Julius", "Justin", "Karl", "Kevin", "Kyle", "Lamar", "Larry",
+    "Luka", "Malik", "Marcus", "Mark", "Michael", "Mikal", "Myles", "Nikola", "Paul", "Reggie",
+    "Robert", "Rudy", "Scottie", "Shai", "Stephen", "Terry", "Tim", "Trae", "Tyler", "Victor",
+    "Walter", "Wesley", "Zach", "Zion",
+]
+SYLLABLES = ["al", "an", "ba", "bo", "ca", "da", "de", "el", "ja", "jo", "ka", "ke", "la",
+             "le", "ma", "mi", "na", "no", "ra", "ro", "sa", "son", "ta", "te", "vi", "za"]
+
+# Probability a player stays with last season's team.
+RETENTION = 0.75
+
+
+def write_json_lines(path: Path, rows: list) -> None:
+    """Write a JSON array with one element per line, like the files in data/."""
+    with path.open("w") as f:
+        f.write("[\n")
+        f.write(",\n".join("  " + json.dumps(row) for row in rows))
+        f.write("\n]\n")
+
+
+def make_teams(count: int) -> list[dict]:
+    with (ROOT / "data" / "teams.json").open() as f:
+        teams = json.load(f)[:count]
+    for n in range(len(teams), count):
+        teams.append({"name": f"Expansion Team {n + 1}", "abbreviation": f"X{n + 1:02d}"})
+    return teams
+
+
+def make_player(rng: random.Random, taken: set) -> dict:
+    while True:
+        first = rng.choice(FIRST_NAMES)
+        last = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+        if (first, last) not in taken:
+            taken.add((first, last))
+            return {"first_name": first, "last_name": last, "position": rng.choice(POSITIONS)}
+
+
+def generate(teams: int, seasons: int, players: int, rosters: int, last_year: int, seed: int) -> dict:
+    """Return {"teams", "players", "seasons", "rosters"} lists in the data/*.json shapes."""
+    rng = random.Random(seed)
+    team_rows = make_teams(teams)
+    abbreviations = [t["abbreviation"] for t in team_rows]
+    years = list(range(last_year - seasons + 1, last_year + 1))
+    active_target = max(teams, round(rosters / seasons))
+    # Mean career length that turns the league over into ~`players` people.
+    debuts = max(1, players - active_target)
+    mean_career = max(1.0, active_target * (seasons - 1) / debuts)
+
+    def career() -> int:
+        return max(1, round(rng.uniform(0.2, 1.8) * mean_career))
+
+    taken: set = set()
+    player_rows: list[dict] = []
+    retires_after: list[int] = []   # last season year of each player's career
+    current_team: dict[int, str] = {}
+    active: list[int] = []
+    roster_rows = []
+
+    for year in years:
+        active = [p for p in active if retires_after[p] >= year]
+        while len(active) < active_target:
+            index = len(player_rows)
+            player_rows.append(make_player(rng, taken))
+            # The first season's veterans are already part-way through their careers.
+            length = career()
+            retires_after.append(year + (rng.randint(0, length - 1) if year == years[0] else length - 1))
+            active.append(index)
+
+        capacity = -(-len(active) // teams)  # ceil
+        team_players: dict[str, list[int]] = {abbr: [] for abbr in abbreviations}
+        movers = []
+        rng.shuffle(active)
+        for p in active:
+            team = current_team.get(p)
+            if team is not None and rng.random() < RETENTION and len(team_players[team]) < capacity:
+                team_players[team].append(p)
+            else:
+                movers.append(p)
+        for p in movers:
+            team = min(abbreviations, key=lambda a: (len(team_players[a]), rng.random()))
+            team_players[team].append(p)
+
+        for abbr in abbreviations:
+            for p in team_players[abbr]:
+                current_team[p] = abbr
+                row = player_rows[p]
+                roster_rows.append(
+                    {
+                        "team_abbreviation": abbr,
+                        "first_name": row["first_name"],
+                        "last_name": row["last_name"],
+                        "season_year": year,
+                    }
+                )
+
+    return {"teams": team_rows, "players": player_rows, "seasons": years, "rosters": roster_rows}
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic league history in data/*.json format.")
+    parser.add_argument("--out", type=Path, default=ROOT / "data" / "synthetic", help="Output directory.")
+    parser.add_argument("--teams", type=int, default=30)
+    parser.add_argument("--seasons", type=int, default=75)
+    parser.add_argument("--players", type=int, default=5000, help="Approximate distinct players.")
+    parser.add_argument("--rosters", type=int, default=100_000, help="Approximate roster rows.")
+    parser.add_argument("--last-year", type=int, default=2025)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="Also write rosters.jsonl for streaming mode (seed.py --rosters-jsonl).",
+    )
+    args = parser.parse_args(argv)
+    if args.teams < 1 or args.teams > 99:
+        parser.error("--teams must be between 1 and 99")
+    if args.seasons < 1:
+        parser.error("--seasons must be at least 1")
+
+    league = generate(args.teams, args.seasons, args.players, args.rosters, args.last_year, args.seed)
+    args.out.mkdir(parents=True, exist_ok=True)
+    for name in ("teams", "players", "rosters"):
+        write_json_lines(args.out / f"{name}.json", league[name])
+    (args.out / "seasons.json").write_text(json.dumps(league["seasons"]) + "\n")
+    if args.jsonl:
+        with (args.out / "rosters.jsonl").open("w") as f:
+            for row in league["rosters"]:
+                f.write(json.dumps(row) + "\n")
+
+    print(
+        f"Wrote {args.out}: {len(league['teams'])} teams, {len(league['seasons'])} seasons, "
+        f"{len(league['players'])} players, {len(league['rosters'])} roster rows"
+    )
+
+
+if __name__ == "__main__":
+    main()
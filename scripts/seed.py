@@ -3,38 +3,82 @@
 Idempotent seed script: loads data/*.json and upserts into Postgres.
 
 Run from project root: python scripts/seed.py (or python -m scripts.seed)
+--data-dir reads the four files from another directory (e.g. the output of
+scripts/generate_league.py).
 
 Avoiding duplicates:
 - Team: get-or-create by abbreviation (unique in DB).
 - Player: get-or-create by (first_name, last_name); no DB unique, so we look up first.
-- Season: get-or-create by year (unique in DB).
-- RosterMembership: get-or-create by (team_id, player_id, season_id) (unique in DB).
+- Season: get-or-create by year (unique in DB); new seasons get season_dates(year).
+- RosterMembership: get-or-create by (team_id, player_id, season_id); new rows
+  are full-season stints (the season's start_date and end_date), which
+  unique_roster_membership keeps unique.
 
 Running the script twice leaves the same row counts; no duplicate teams, players,
 seasons, or roster rows.
+
+Bulk mode (python scripts/seed.py --bulk) stages each file as a VALUES list and
+resolves every table with a handful of set-based statements instead of one
+SELECT + flush per row:
+- Team / Season / RosterMembership: INSERT ... ON CONFLICT DO NOTHING on their
+  unique keys (for rosters, also on the Postgres constraint against
+  overlapping stints, so a stint added mid-season via the API is kept).
+- Player: INSERT ... SELECT ... WHERE NOT EXISTS on (first_name, last_name),
+  since players have no unique constraint to conflict on.
+It is idempotent in the same way and reports rows inserted vs. already present.
+
+Streaming mode (python scripts/seed.py --rosters-jsonl feed.jsonl) reads roster
+rows from a line-delimited JSON file one line at a time, upserts them in batches
+of --batch-size rows, and commits after each batch. The byte offset of the last
+committed batch is written to a checkpoint file so a crashed run resumes where
+it stopped; memory use does not grow with the size of the feed.
+
+Parallel mode (python scripts/seed.py --workers N) seeds teams, players, and
+seasons once, then splits rosters.json by season (or --partition-by team) across
+a process pool. Each worker opens its own connection and runs the set-based
+roster upsert for its partitions; the roster constraints plus ON CONFLICT DO
+NOTHING keep concurrent workers from inserting duplicates.
+
+Bulk, streaming, and parallel modes are Postgres-only (VALUES lists and
+INSERT ... ON CONFLICT); on other databases the script exits with a message
+and only the default row-by-row mode runs.
+
+Every mode records the teams, players, and roster memberships it inserts in
+the change log behind GET /changes (see app/change_log.py).
+
+Every mode refreshes team_season_analytics for the (team, season) rosters it
+touched (see app/analytics.py); --rebuild-analytics recomputes the whole table.
 """
 
+import argparse
 import json
+import os
 import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # Run from project root so "app" is importable
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 
-from dotenv import load_dotenv
-
-load_dotenv(ROOT / ".env")
-
-from sqlalchemy import select
+from sqlalchemy import Integer, String, and_, column, exists, func, insert, select, true, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
-from app.db import SessionLocal
-from app.models import Player, RosterMembership, Season, Team
+from app.db import SessionLocal, get_engine
+from app.analytics import rebuild_all, refresh_team_seasons
+from app.change_log import INSERT, record_changes
+from app.models import Player, RosterMembership, Season, Team, season_dates
+from app.roster_writes import mark_roster_writes, pending_roster_writes, team_season_pairs
 
+DATA_DIR = ROOT / "data"
+DEFAULT_BATCH_SIZE = 5000
 
-def load_json(name: str) -> list:
-    path = ROOT / "data" / name
+
+def load_json(name: str, data_dir: Path = DATA_DIR) -> list:
+    path = data_dir / name
     if not path.exists():
         raise FileNotFoundError(f"Missing data file: {path}")
     with path.open() as f:
@@ -72,7 +116,8 @@ def get_or_create_season(session: Session, year: int) -> Season:
     season = session.execute(stmt).scalar_one_or_none()
     if season:
         return season
-    season = Season(year=year)
+    start_date, end_date = season_dates(year)
+    season = Season(year=year, start_date=start_date, end_date=end_date)
     session.add(season)
     session.flush()
     return season
@@ -86,65 +131,580 @@ def get_or_create_roster(
         RosterMembership.player_id == player_id,
         RosterMembership.season_id == season_id,
     )
-    existing = session.execute(stmt).scalar_one_or_none()
+    existing = session.execute(stmt).scalars().first()
     if existing:
         return existing
-    rm = RosterMembership(team_id=team_id, player_id=player_id, season_id=season_id)
+    season = session.get(Season, season_id)
+    rm = RosterMembership(
+        team_id=team_id,
+        player_id=player_id,
+        season_id=season_id,
+        start_date=season.start_date,
+        end_date=season.end_date,
+    )
     session.add(rm)
     session.flush()
     return rm
 
 
-def main() -> None:
-    teams_data = load_json("teams.json")
-    players_data = load_json("players.json")
-    seasons_data = load_json("seasons.json")
-    rosters_data = load_json("rosters.json")
+# ---- Key resolution cache ----
 
-    db = SessionLocal()
-    try:
-        # Teams (key: abbreviation)
-        for row in teams_data:
-            get_or_create_team(db, row["name"], row["abbreviation"])
-        print(f"Teams: {len(teams_data)} rows (get-or-create by abbreviation)")
-
-        # Players (key: first_name + last_name)
-        for row in players_data:
-            get_or_create_player(
-                db, row["first_name"], row["last_name"], row["position"]
+class KeyResolver:
+    """
+    Natural-key -> id maps for resolving roster rows without per-row queries.
+
+    Loaded once after teams, players, and seasons are seeded (three SELECTs);
+    every roster row then resolves from memory. Hits and misses are counted per
+    entity so skipped rows can be explained.
+    """
+
+    ENTITIES = ("team", "player", "season")
+
+    def __init__(self) -> None:
+        self.team_ids: dict[str, int] = {}
+        self.player_ids: dict[tuple[str, str], int] = {}
+        self.season_ids: dict[int, int] = {}
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+        self.missing_keys: dict[str, set] = defaultdict(set)
+
+    @classmethod
+    def load(cls, session: Session) -> "KeyResolver":
+        resolver = cls()
+        for team_id, abbreviation in session.execute(select(Team.id, Team.abbreviation)):
+            resolver.team_ids[abbreviation] = team_id
+        # Players aren't unique by name; keep the lowest id like a first-match lookup.
+        for player_id, first_name, last_name in session.execute(
+            select(Player.id, Player.first_name, Player.last_name).order_by(Player.id.desc())
+        ):
+            resolver.player_ids[(first_name, last_name)] = player_id
+        for season_id, year in session.execute(select(Season.id, Season.year)):
+            resolver.season_ids[year] = season_id
+        return resolver
+
+    def _lookup(self, entity: str, ids: dict, key):
+        found = ids.get(key)
+        if found is None:
+            self.misses[entity] += 1
+            self.missing_keys[entity].add(key)
+        else:
+            self.hits[entity] += 1
+        return found
+
+    def resolve(self, row: dict) -> tuple[int, int, int] | None:
+        """Return (team_id, player_id, season_id) for a roster row, or None if any key is unknown."""
+        # Look up all three (no short-circuit) so each missing entity is counted.
+        team_id = self._lookup("team", self.team_ids, row["team_abbreviation"])
+        player_id = self._lookup(
+            "player", self.player_ids, (row["first_name"], row["last_name"])
+        )
+        season_id = self._lookup("season", self.season_ids, row["season_year"])
+        if team_id is None or player_id is None or season_id is None:
+            return None
+        return team_id, player_id, season_id
+
+    def report(self, sample: int = 5) -> list[str]:
+        lines = []
+        for entity in self.ENTITIES:
+            line = f"  {entity}: {self.hits[entity]} hits, {self.misses[entity]} misses"
+            missing = sorted(self.missing_keys[entity], key=str)
+            if missing:
+                shown = ", ".join(str(k) for k in missing[:sample])
+                more = f" (+{len(missing) - sample} more)" if len(missing) > sample else ""
+                line += f" - unknown: {shown}{more}"
+            lines.append(line)
+        return lines
+
+
+# ---- Bulk (set-based) mode ----
+
+BULK_CHUNK_SIZE = 5000
+
+
+def _chunks(rows: list, size: int = BULK_CHUNK_SIZE):
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+def _dedupe(rows: list, key) -> list:
+    """Keep the first row per key, matching get-or-create (first writer wins)."""
+    seen = set()
+    unique = []
+    for row in rows:
+        k = key(row)
+        if k in seen:
+            continue
+        seen.add(k)
+        unique.append(row)
+    return unique
+
+
+def bulk_upsert_teams(session: Session, rows: list) -> tuple[int, int]:
+    """Insert missing teams by abbreviation. Returns (inserted, already_present)."""
+    rows = _dedupe(rows, key=lambda r: r["abbreviation"])
+    inserted = 0
+    for chunk in _chunks(rows):
+        stmt = (
+            pg_insert(Team)
+            .values([{"name": r["name"], "abbreviation": r["abbreviation"]} for r in chunk])
+            .on_conflict_do_nothing(index_elements=[Team.abbreviation])
+            .returning(Team.id, Team.name, Team.abbreviation)
+        )
+        new_rows = session.execute(stmt).mappings().all()
+        record_changes(session, Team, INSERT, new_rows)
+        inserted += len(new_rows)
+    return inserted, len(rows) - inserted
+
+
+def bulk_upsert_seasons(session: Session, years: list) -> tuple[int, int]:
+    """Insert missing seasons by year. Returns (inserted, already_present)."""
+    years = _dedupe(years, key=lambda y: y)
+    inserted = 0
+    for chunk in _chunks(years):
+        new_seasons = []
+        for year in chunk:
+            start_date, end_date = season_dates(year)
+            new_seasons.append({"year": year, "start_date": start_date, "end_date": end_date})
+        stmt = (
+            pg_insert(Season)
+            .values(new_seasons)
+            .on_conflict_do_nothing(index_elements=[Season.year])
+            .returning(Season.id)
+        )
+        inserted += len(session.execute(stmt).all())
+    return inserted, len(years) - inserted
+
+
+def bulk_upsert_players(session: Session, rows: list) -> tuple[int, int]:
+    """
+    Insert missing players by (first_name, last_name). Returns (inserted, already_present).
+
+    players has no unique constraint on name, so ON CONFLICT can't be used; the
+    anti-join against existing rows gives the same get-or-create result.
+    """
+    rows = _dedupe(rows, key=lambda r: (r["first_name"], r["last_name"]))
+    inserted = 0
+    for chunk in _chunks(rows):
+        staged = values(
+            column("first_name", String),
+            column("last_name", String),
+            column("position", String),
+            name="staged_players",
+        ).data([(r["first_name"], r["last_name"], r["position"]) for r in chunk])
+        missing = select(
+            staged.c.first_name, staged.c.last_name, staged.c.position
+        ).where(
+            ~exists().where(
+                Player.first_name == staged.c.first_name,
+                Player.last_name == staged.c.last_name,
+            )
+        )
+        stmt = (
+            insert(Player)
+            .from_select(["first_name", "last_name", "position"], missing)
+            .returning(Player.id, Player.first_name, Player.last_name, Player.position)
+        )
+        new_rows = session.execute(stmt).mappings().all()
+        record_changes(session, Player, INSERT, new_rows)
+        inserted += len(new_rows)
+    return inserted, len(rows) - inserted
+
+
+def bulk_upsert_rosters(session: Session, rows: list) -> tuple[int, int, int]:
+    """
+    Resolve roster rows to ids with one join per chunk and insert the missing ones.
+
+    Returns (inserted, already_present, skipped) where skipped rows reference a
+    team, player, or season that does not exist.
+    """
+    rows = _dedupe(
+        rows,
+        key=lambda r: (
+            r["team_abbreviation"], r["first_name"], r["last_name"], r["season_year"]
+        ),
+    )
+    inserted = resolved = 0
+    for chunk in _chunks(rows):
+        staged = values(
+            column("team_abbreviation", String),
+            column("first_name", String),
+            column("last_name", String),
+            column("season_year", Integer),
+            name="staged_rosters",
+        ).data(
+            [
+                (r["team_abbreviation"], r["first_name"], r["last_name"], r["season_year"])
+                for r in chunk
+            ]
+        )
+        matched = (
+            select(
+                Team.id.label("team_id"),
+                Player.id.label("player_id"),
+                Season.id.label("season_id"),
+                Season.start_date,
+                Season.end_date,
+            )
+            .select_from(staged)
+            .join(Team, Team.abbreviation == staged.c.team_abbreviation)
+            .join(
+                Player,
+                and_(
+                    Player.first_name == staged.c.first_name,
+                    Player.last_name == staged.c.last_name,
+                ),
+            )
+            .join(Season, Season.year == staged.c.season_year)
+            .cte("matched")
+        )
+        new_memberships = (
+            pg_insert(RosterMembership)
+            .from_select(["team_id", "player_id", "season_id", "start_date", "end_date"], select(matched))
+            .on_conflict_do_nothing()
+            .returning(
+                RosterMembership.id,
+                RosterMembership.team_id,
+                RosterMembership.season_id,
+                RosterMembership.player_id,
+                RosterMembership.start_date,
+                RosterMembership.end_date,
+            )
+            .cte("new_memberships")
+        )
+        # One statement: the join runs once (the CTE is materialized), and the
+        # matched count rides along on every inserted row, or on a single
+        # all-NULL row when nothing was inserted.
+        matched_count = select(func.count().label("resolved")).select_from(matched).subquery()
+        result = session.execute(
+            select(matched_count.c.resolved, *new_memberships.c).select_from(
+                matched_count.outerjoin(new_memberships, true())
             )
-        print(f"Players: {len(players_data)} rows (get-or-create by name)")
-
-        # Seasons (key: year)
-        for year in seasons_data:
-            get_or_create_season(db, year)
-        print(f"Seasons: {len(seasons_data)} rows (get-or-create by year)")
-
-        # Rosters (key: team_id, player_id, season_id)
-        skipped = 0
-        for row in rosters_data:
-            team = db.execute(
-                select(Team).where(Team.abbreviation == row["team_abbreviation"])
-            ).scalar_one_or_none()
-            player = db.execute(
-                select(Player).where(
-                    Player.first_name == row["first_name"],
-                    Player.last_name == row["last_name"],
-                )
-            ).scalar_one_or_none()
-            season = db.execute(
-                select(Season).where(Season.year == row["season_year"])
-            ).scalar_one_or_none()
-            if not team or not player or not season:
-                skipped += 1
+        ).mappings().all()
+        resolved += result[0]["resolved"]
+        new_rows = [r for r in result if r["id"] is not None]
+        # Core inserts skip the ORM flush hooks; report them explicitly.
+        mark_roster_writes(session, ((r["team_id"], r["season_id"], r["player_id"]) for r in new_rows))
+        record_changes(session, RosterMembership, INSERT, new_rows)
+        inserted += len(new_rows)
+    return inserted, resolved - inserted, len(rows) - resolved
+
+
+def seed_bulk(db: Session, teams_data, players_data, seasons_data, rosters_data) -> None:
+    inserted, present = bulk_upsert_teams(db, teams_data)
+    print(f"Teams: {inserted} inserted, {present} already present")
+
+    inserted, present = bulk_upsert_players(db, players_data)
+    print(f"Players: {inserted} inserted, {present} already present")
+
+    inserted, present = bulk_upsert_seasons(db, seasons_data)
+    print(f"Seasons: {inserted} inserted, {present} already present")
+
+    if rosters_data is None:
+        return
+    inserted, present, skipped = bulk_upsert_rosters(db, rosters_data)
+    print(
+        f"Roster memberships: {inserted} inserted, {present} already present, {skipped} skipped (missing team/player/season)"
+    )
+
+
+def seed_row_by_row(db: Session, teams_data, players_data, seasons_data, rosters_data) -> None:
+    # Teams (key: abbreviation)
+    for row in teams_data:
+        get_or_create_team(db, row["name"], row["abbreviation"])
+    print(f"Teams: {len(teams_data)} rows (get-or-create by abbreviation)")
+
+    # Players (key: first_name + last_name)
+    for row in players_data:
+        get_or_create_player(
+            db, row["first_name"], row["last_name"], row["position"]
+        )
+    print(f"Players: {len(players_data)} rows (get-or-create by name)")
+
+    # Seasons (key: year)
+    for year in seasons_data:
+        get_or_create_season(db, year)
+    print(f"Seasons: {len(seasons_data)} rows (get-or-create by year)")
+
+    if rosters_data is None:
+        return
+
+    # Rosters (key: team_id, player_id, season_id)
+    # Ids come from preloaded maps, so resolving a row costs no queries.
+    resolver = KeyResolver.load(db)
+    skipped = 0
+    for row in rosters_data:
+        ids = resolver.resolve(row)
+        if ids is None:
+            skipped += 1
+            continue
+        get_or_create_roster(db, *ids)
+    print(
+        f"Roster memberships: {len(rosters_data) - skipped} processed, {skipped} skipped (missing team/player/season)"
+    )
+    print("Key resolution:")
+    for line in resolver.report():
+        print(line)
+
+
+# ---- Streaming (JSONL) mode ----
+
+def iter_jsonl(path: Path, start_offset: int = 0):
+    """
+    Yield (end_offset, row) for each non-blank line of a JSONL/NDJSON file.
+
+    end_offset is the byte position just past the line, i.e. where a resumed
+    read should start once this row has been committed.
+    """
+    with path.open("rb") as f:
+        f.seek(start_offset)
+        offset = start_offset
+        for raw in f:
+            offset += len(raw)
+            line = raw.strip()
+            if not line:
                 continue
-            get_or_create_roster(db, team.id, player.id, season.id)
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path} (byte {offset - len(raw)}): invalid JSON: {e}") from e
+            yield offset, row
+
+
+def iter_batches(rows, size: int):
+    """Group (offset, row) pairs into (last_offset, [rows]) batches of at most size rows."""
+    batch = []
+    offset = None
+    for offset, row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield offset, batch
+            batch = []
+    if batch:
+        yield offset, batch
+
+
+def read_checkpoint(checkpoint: Path, source: Path) -> int:
+    """Return the byte offset to resume source from (0 if there is no matching checkpoint)."""
+    if not checkpoint.exists():
+        return 0
+    with checkpoint.open() as f:
+        state = json.load(f)
+    if state.get("source") != str(source.resolve()):
+        return 0
+    return int(state["offset"])
+
+
+def write_checkpoint(checkpoint: Path, source: Path, offset: int) -> None:
+    # Write-then-rename so a crash never leaves a half-written checkpoint.
+    tmp = checkpoint.with_name(checkpoint.name + ".tmp")
+    with tmp.open("w") as f:
+        json.dump({"source": str(source.resolve()), "offset": offset}, f)
+    os.replace(tmp, checkpoint)
+
+
+def stream_rosters(
+    db: Session, path: Path, batch_size: int, checkpoint: Path | None = None
+) -> None:
+    """Upsert roster rows from a JSONL file in committed batches, resuming from checkpoint."""
+    if not path.exists():
+        raise FileNotFoundError(f"Missing data file: {path}")
+    start = read_checkpoint(checkpoint, path) if checkpoint else 0
+    if start:
+        print(f"Resuming {path.name} from byte {start} (checkpoint {checkpoint})")
+
+    inserted = present = skipped = batches = 0
+    for offset, batch in iter_batches(iter_jsonl(path, start), batch_size):
+        i, p, s = bulk_upsert_rosters(db, batch)
+        refresh_team_seasons(db, team_season_pairs(pending_roster_writes(db)))
+        db.commit()
+        if checkpoint:
+            write_checkpoint(checkpoint, path, offset)
+        inserted, present, skipped, batches = inserted + i, present + p, skipped + s, batches + 1
+    print(
+        f"Roster memberships (streamed, {batches} batches): {inserted} inserted, {present} already present, {skipped} skipped (missing team/player/season)"
+    )
+    if checkpoint and checkpoint.exists():
+        checkpoint.unlink()
+
+
+# ---- Parallel (process pool) mode ----
+
+PARTITION_KEYS = {"season": "season_year", "team": "team_abbreviation"}
+
+
+def partition_rosters(rows: list, by: str) -> list[list]:
+    """Split roster rows into one list per season (or team), largest first."""
+    key = PARTITION_KEYS[by]
+    groups = defaultdict(list)
+    for row in rows:
+        groups[row[key]].append(row)
+    return sorted(groups.values(), key=len, reverse=True)
+
+
+def _init_worker() -> None:
+    # Connections inherited from the parent must not be reused in a child process.
+    get_engine().dispose(close=False)
+
+
+def _seed_partition(rows: list) -> dict:
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        inserted, present, skipped = bulk_upsert_rosters(db, rows)
+        touched = team_season_pairs(pending_roster_writes(db))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    return {
+        "touched": touched,
+        "pid": os.getpid(),
+        "rows": len(rows),
+        "inserted": inserted,
+        "present": present,
+        "skipped": skipped,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def seed_rosters_parallel(rows: list, workers: int, partition_by: str) -> set:
+    """
+    Upsert roster partitions across a process pool and print per-worker throughput.
+
+    Returns the (team_id, season_id) pairs the workers inserted into, so the
+    caller can refresh analytics once every partition has committed.
+    """
+    partitions = partition_rosters(rows, partition_by)
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        results = list(pool.map(_seed_partition, partitions))
+    wall = time.perf_counter() - started
+
+    per_worker = defaultdict(lambda: {"rows": 0, "seconds": 0.0, "partitions": 0})
+    for result in results:
+        stats = per_worker[result["pid"]]
+        stats["rows"] += result["rows"]
+        stats["seconds"] += result["seconds"]
+        stats["partitions"] += 1
+
+    inserted = sum(r["inserted"] for r in results)
+    present = sum(r["present"] for r in results)
+    skipped = sum(r["skipped"] for r in results)
+    print(
+        f"Roster memberships ({len(partitions)} partitions by {partition_by}, {workers} workers): {inserted} inserted, {present} already present, {skipped} skipped (missing team/player/season)"
+    )
+    for n, (pid, stats) in enumerate(sorted(per_worker.items()), start=1):
+        rate = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
         print(
-            f"Roster memberships: {len(rosters_data) - skipped} processed, {skipped} skipped (missing team/player/season)"
+            f"  worker {n} (pid {pid}): {stats['rows']} rows in {stats['partitions']} partitions, {stats['seconds']:.2f}s, {rate:,.0f} rows/sec"
+        )
+    total_rate = len(rows) / wall if wall else 0.0
+    print(f"  total: {len(rows)} rows in {wall:.2f}s, {total_rate:,.0f} rows/sec")
+    return set().union(*(r["touched"] for r in results))
+
+
+def refresh_analytics(db: Session, pairs: set) -> None:
+    refreshed = refresh_team_seasons(db, pairs)
+    print(f"Analytics: {refreshed} team-season rows refreshed ({len(pairs)} rosters touched)")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Seed the database from data/*.json.")
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Use set-based INSERT ... ON CONFLICT statements instead of row-by-row get-or-create.",
+    )
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=DATA_DIR,
+        help="Directory holding teams/players/seasons/rosters.json (default: data/).",
+    )
+    parser.add_argument(
+        "--rosters-jsonl",
+        type=Path,
+        metavar="PATH",
+        help="Stream roster rows from a JSONL/NDJSON file instead of data/rosters.json.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Rows per committed batch in streaming mode (default: {DEFAULT_BATCH_SIZE}).",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        metavar="PATH",
+        help="Checkpoint file for resuming a streamed load (default: <feed>.checkpoint).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Upsert rosters.json partitions across N processes (default: 1, no pool).",
+    )
+    parser.add_argument(
+        "--partition-by",
+        choices=sorted(PARTITION_KEYS),
+        default="season",
+        help="How --workers splits rosters.json (default: season).",
+    )
+    parser.add_argument(
+        "--rebuild-analytics",
+        action="store_true",
+        help="Recompute team_season_analytics for every team-season after seeding.",
+    )
+    args = parser.parse_args(argv)
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers > 1 and args.rosters_jsonl:
+        parser.error("--workers cannot be combined with --rosters-jsonl")
+    if args.rosters_jsonl and args.checkpoint is None:
+        args.checkpoint = args.rosters_jsonl.with_name(args.rosters_jsonl.name + ".checkpoint")
+    return args
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    dialect = get_engine().dialect.name
+    if (args.bulk or args.rosters_jsonl or args.workers > 1) and dialect != "postgresql":
+        sys.exit(
+            "--bulk, --rosters-jsonl and --workers use Postgres-only statements "
+            f"(VALUES lists, INSERT ... ON CONFLICT); on {dialect} use the default row-by-row mode."
         )
 
+    teams_data = load_json("teams.json", args.data_dir)
+    players_data = load_json("players.json", args.data_dir)
+    seasons_data = load_json("seasons.json", args.data_dir)
+    # Streamed rosters are read lazily after the reference tables are committed.
+    rosters_data = None if args.rosters_jsonl else load_json("rosters.json", args.data_dir)
+    parallel = args.workers > 1
+
+    seed = seed_bulk if args.bulk else seed_row_by_row
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        # In parallel mode this process only seeds the reference tables; the
+        # workers need them committed before they can resolve roster rows.
+        seed(db, teams_data, players_data, seasons_data, None if parallel else rosters_data)
+        if rosters_data is not None and not parallel:
+            refresh_analytics(db, team_season_pairs(pending_roster_writes(db)))
         db.commit()
-        print("Seed complete. Run again to verify idempotency (same row counts).")
+        if args.rosters_jsonl:
+            stream_rosters(db, args.rosters_jsonl, args.batch_size, args.checkpoint)
+        if parallel:
+            refresh_analytics(db, seed_rosters_parallel(rosters_data, args.workers, args.partition_by))
+            db.commit()
+        if args.rebuild_analytics:
+            print(f"Analytics: {rebuild_all(db)} team-season rows rebuilt")
+            db.commit()
+        print(f"Seed complete in {time.perf_counter() - started:.2f}s. Run again to verify idempotency (same row counts).")
     except Exception:
         db.rollback()
         raise
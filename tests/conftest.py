@@ -0,0 +1,83 @@
+"""
+Shared test setup.
+
+Settings are read once, on first use, so they are pointed at a scratch
+database here, before any test module imports the app. Tests run against a
+temporary SQLite file, or against TEST_DATABASE_URL when it is set (a
+disposable Postgres database: its tables are created and dropped). Replicas,
+the read model, and the response cache are off; cache tests install their
+own backend.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+_DB_PATH = Path(tempfile.mkdtemp()) / "test.db"
+os.environ.update(
+    DATABASE_URL=os.environ.get("TEST_DATABASE_URL") or f"sqlite:///{_DB_PATH}",
+    ASYNC_DATABASE_URL="",
+    DATABASE_REPLICA_URLS="",
+    CACHE_MAX_ENTRIES="0",
+    READ_MODEL_ENABLED="false",
+)
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.db import Base, get_engine
+from app.main import app
+from app.models import Player, RosterMembership, Season, Team, season_dates
+from app.teammates import teammate_graph
+
+
+@pytest.fixture(scope="module")
+def engine():
+    """The app's sync engine over freshly created tables, dropped after the module."""
+    engine = get_engine()
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture(scope="session")
+def client():
+    """
+    A TestClient with the app's lifespan running, so async engines keep one
+    event loop (asyncpg connections are bound to theirs).
+
+    One lifespan for the whole run: its shutdown disposes the engines, and
+    with SQLAlchemy 2.0.23 the async pool rebuilt by dispose() guards its
+    first connect with a thread lock, which deadlocks the next lifespan's
+    concurrent startup connects on their shared event loop. Modules still get
+    fresh tables from the engine fixture.
+    """
+    Base.metadata.create_all(get_engine())
+    with TestClient(app) as client:
+        # Let the startup teammate graph build finish so it cannot run
+        # statements in the middle of a test.
+        client.portal.call(teammate_graph.warm)
+        yield client
+
+
+def add_season(db: Session, year: int) -> Season:
+    start_date, end_date = season_dates(year)
+    season = Season(year=year, start_date=start_date, end_date=end_date)
+    db.add(season)
+    return season
+
+
+def add_roster(db: Session, team: Team, season: Season, size: int, position: str = "SF") -> list[Player]:
+    """size new players, each with a full-season stint on team in season."""
+    players = []
+    for n in range(size):
+        player = Player(first_name=f"{team.abbreviation}{season.year}n{n}", last_name="Player", position=position)
+        db.add(
+            RosterMembership(
+                team=team, player=player, season=season, start_date=season.start_date, end_date=season.end_date
+            )
+        )
+        players.append(player)
+    return players
@@ -0,0 +1,90 @@
+"""
+Incremental team-season analytics refresh, including two writers refreshing
+the same team-season at once (run with TEST_DATABASE_URL to exercise the
+Postgres locking; SQLite serializes the writers by itself).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from conftest import add_roster, add_season
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.analytics import rebuild_all, refresh_team_seasons
+from app.models import Player, RosterMembership, Season, Team, TeamSeasonAnalytics
+
+
+@pytest.fixture(scope="module")
+def league(engine):
+    with Session(engine) as db:
+        team = Team(name="Team ANL", abbreviation="ANL")
+        earlier, season = add_season(db, 2023), add_season(db, 2024)
+        kept = add_roster(db, team, earlier, 2, position="PG")
+        db.flush()
+        for player in kept[:1]:
+            db.add(
+                RosterMembership(
+                    team=team, player=player, season=season, start_date=season.start_date, end_date=season.end_date
+                )
+            )
+        add_roster(db, team, season, 1, position="C")
+        rebuild_all(db)
+        db.commit()
+        return team.id, season.id
+
+
+def analytics(engine, team_id: int, season_id: int) -> TeamSeasonAnalytics:
+    with Session(engine) as db:
+        return db.execute(
+            select(TeamSeasonAnalytics).where(
+                TeamSeasonAnalytics.team_id == team_id, TeamSeasonAnalytics.season_id == season_id
+            )
+        ).scalar_one()
+
+
+def sign_player(db: Session, team_id: int, season_id: int, name: str) -> None:
+    """Add a new player with a full-season stint, then refresh analytics (uncommitted)."""
+    team, season = db.get(Team, team_id), db.get(Season, season_id)
+    db.add(
+        RosterMembership(
+            team=team,
+            player=Player(first_name=name, last_name="Signing", position="SF"),
+            season=season,
+            start_date=season.start_date,
+            end_date=season.end_date,
+        )
+    )
+    db.flush()
+    refresh_team_seasons(db, {(team_id, season_id)})
+
+
+def test_rebuild_counts_roster_positions_and_turnover(engine, league):
+    row = analytics(engine, *league)
+    assert row.roster_size == 2
+    assert row.position_counts == {"C": 1, "PG": 1}
+    assert (row.retained, row.added, row.departed) == (1, 1, 1)
+
+
+def test_overlapping_refreshes_of_one_team_season_both_commit(engine, league):
+    team_id, season_id = league
+    before = analytics(engine, team_id, season_id).roster_size
+
+    def second_writer():
+        with Session(engine) as db:
+            sign_player(db, team_id, season_id, "Second")
+            db.commit()
+
+    with Session(engine) as first, ThreadPoolExecutor(1) as pool:
+        sign_player(first, team_id, season_id, "First")
+        # The second writer starts while the first still holds its refreshed,
+        # uncommitted analytics row; it must wait, not fail.
+        second = pool.submit(second_writer)
+        with pytest.raises(TimeoutError):
+            second.result(timeout=0.5)
+        first.commit()
+        second.result(timeout=30)
+
+    row = analytics(engine, team_id, season_id)
+    assert row.roster_size == before + 2
+    assert row.added == before + 1
@@ -0,0 +1,105 @@
+"""
+Response cache: invalidation on roster writes, readers that loaded rows
+before a write not caching them after it, and ETag revalidation of cached
+rosters.
+"""
+
+import pytest
+from conftest import add_roster, add_season
+from sqlalchemy.orm import Session
+
+from app.cache import (
+    LRUCacheBackend,
+    ResponseCache,
+    player_tag,
+    response_cache,
+    set_cache_backend,
+    team_season_tag,
+)
+from app.models import Player, Team
+
+ROSTER = "/teams/CCH/seasons/2024/roster"
+
+
+def cache() -> ResponseCache:
+    return ResponseCache(LRUCacheBackend(max_entries=100, ttl=60))
+
+
+def test_write_drops_entries_tagged_with_its_team_season_and_player():
+    responses = cache()
+    responses.set("roster", b"[]", tags=[team_season_tag(1, 2)])
+    responses.set("history", b"{}", tags=[player_tag(3)])
+    responses.set("other", b"[]", tags=[team_season_tag(1, 9)])
+    responses.invalidate_memberships([(1, 2, 3)])
+    assert responses.get("roster") is None
+    assert responses.get("history") is None
+    assert responses.get("other") == b"[]"
+
+
+def test_reader_that_started_before_an_invalidation_does_not_cache():
+    responses = cache()
+    generation = responses.generation()
+    # A write commits between the reader's query and its set().
+    responses.invalidate_memberships([(1, 2, 3)])
+    responses.set("roster", b"stale", tags=[team_season_tag(1, 2)], generation=generation)
+    assert responses.get("roster") is None
+    # Other tags, and readers that started after the write, still cache.
+    responses.set("other", b"[]", tags=[team_season_tag(1, 9)], generation=generation)
+    responses.set("roster", b"fresh", tags=[team_season_tag(1, 2)], generation=responses.generation())
+    assert responses.get("other") == b"[]"
+    assert responses.get("roster") == b"fresh"
+
+
+def test_clear_turns_away_every_reader_that_started_before_it():
+    responses = cache()
+    generation = responses.generation()
+    responses.clear()
+    responses.set("roster", b"stale", tags=[team_season_tag(1, 2)], generation=generation)
+    assert responses.get("roster") is None
+    assert responses.stats()["stale_sets"] == 1
+
+
+@pytest.fixture(scope="module")
+def league(engine):
+    with Session(engine) as db:
+        team = Team(name="Team CCH", abbreviation="CCH")
+        season = add_season(db, 2024)
+        add_roster(db, team, season, 2)
+        free_agent = Player(first_name="Free", last_name="Agent", position="C")
+        db.add(free_agent)
+        db.commit()
+        return {"team_id": team.id, "season_id": season.id, "free_agent": free_agent.id}
+
+
+@pytest.fixture
+def cached(league):
+    """The app's response cache, switched on for one test."""
+    previous = response_cache.backend
+    set_cache_backend(LRUCacheBackend(max_entries=100, ttl=60))
+    yield response_cache
+    set_cache_backend(previous)
+
+
+def test_roster_write_invalidates_the_cached_roster(client, league, cached):
+    assert len(client.get(ROSTER).json()) == 2
+    hits = cached.hits
+    assert len(client.get(ROSTER).json()) == 2
+    assert cached.hits == hits + 1
+
+    membership = {"team_id": league["team_id"], "player_id": league["free_agent"], "season_id": league["season_id"]}
+    assert client.post("/rosters/batch", json={"add": [membership]}).json()["counts"] == {"inserted": 1}
+    assert len(client.get(ROSTER).json()) == 3
+
+    assert client.post("/rosters/batch", json={"remove": [membership]}).json()["counts"] == {"deleted": 1}
+    assert len(client.get(ROSTER).json()) == 2
+
+
+def test_cached_roster_revalidates_with_its_etag(client, cached):
+    first = client.get(ROSTER)
+    etag = first.headers["etag"]
+    # The second response comes from the cache and carries the same validator.
+    revalidated = client.get(ROSTER, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+    assert client.get(ROSTER, headers={"If-None-Match": '"stale"'}).status_code == 200
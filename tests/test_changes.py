@@ -0,0 +1,70 @@
+"""
+GET /changes records the Core writes of POST /rosters/batch: one change per
+row inserted or deleted, none for items that changed nothing, and keyset
+paging over them by seq.
+"""
+
+import pytest
+from conftest import add_roster, add_season
+from sqlalchemy.orm import Session
+
+from app.models import Player, Team
+
+
+@pytest.fixture(scope="module")
+def league(engine):
+    with Session(engine) as db:
+        team = Team(name="Team CHG", abbreviation="CHG")
+        season = add_season(db, 2024)
+        released = add_roster(db, team, season, 1)[0]
+        signing = Player(first_name="New", last_name="Signing", position="SF")
+        db.add(signing)
+        db.commit()
+        return {
+            "team_id": team.id,
+            "season_id": season.id,
+            "season": (season.start_date.isoformat(), season.end_date.isoformat()),
+            "released": released.id,
+            "signing": signing.id,
+        }
+
+
+def membership(league: dict, player_id: int) -> dict:
+    return {"team_id": league["team_id"], "player_id": player_id, "season_id": league["season_id"]}
+
+
+def test_batch_writes_show_up_in_the_feed(client, league):
+    since = client.get("/changes").json()["latest_seq"]
+    response = client.post(
+        "/rosters/batch",
+        json={
+            # The repeated addition and the unknown removal write no rows, so no changes.
+            "add": [membership(league, league["signing"]), membership(league, league["signing"])],
+            "remove": [membership(league, league["released"]), membership(league, 999_999)],
+        },
+    )
+    assert response.json()["counts"] == {"inserted": 1, "duplicate": 1, "deleted": 1, "not_found": 1}
+
+    feed = client.get("/changes", params={"since": since}).json()
+    start_date, end_date = league["season"]
+    assert sorted((c["entity"], c["op"], c["data"]["player_id"]) for c in feed["items"]) == [
+        ("roster_membership", "delete", league["released"]),
+        ("roster_membership", "insert", league["signing"]),
+    ]
+    inserted = next(c for c in feed["items"] if c["op"] == "insert")
+    assert inserted["data"] == {**membership(league, league["signing"]), "start_date": start_date, "end_date": end_date}
+    assert feed["next_since"] == feed["latest_seq"] == max(c["seq"] for c in feed["items"])
+    assert not feed["has_more"]
+
+
+def test_feed_pages_by_seq(client, league):
+    everything = client.get("/changes").json()["items"]
+    seqs, since = [], 0
+    while True:
+        page = client.get("/changes", params={"since": since, "limit": 2}).json()
+        seqs += [c["seq"] for c in page["items"]]
+        since = page["next_since"]
+        if not page["has_more"]:
+            break
+    assert seqs == [c["seq"] for c in everything] == sorted(set(seqs))
+    assert client.get("/changes", params={"since": since}).json()["items"] == []
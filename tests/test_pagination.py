@@ -0,0 +1,92 @@
+"""
+Keyset pagination on GET /players (by id) and GET /players/{id}/history (by
+season year, then membership id): pages neither skip nor repeat rows, and a
+malformed cursor is a 400.
+"""
+
+import pytest
+from conftest import add_season
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Player, RosterMembership, Team
+from app.pagination import encode_cursor
+
+
+@pytest.fixture(scope="module")
+def journeyman(engine):
+    """A player whose memberships were written out of season order."""
+    with Session(engine) as db:
+        seasons = {year: add_season(db, year) for year in (2022, 2023, 2024)}
+        teams = [Team(name=f"Team PG{n}", abbreviation=f"PG{n}") for n in range(2)]
+        player = Player(first_name="Journey", last_name="Man", position="SG")
+        db.add_all(Player(first_name=f"Bench{n}", last_name="Player", position="C") for n in range(6))
+        for year, team in ((2024, teams[0]), (2022, teams[1]), (2023, teams[1]), (2023, teams[0])):
+            season = seasons[year]
+            db.add(
+                RosterMembership(
+                    team=team, player=player, season=season, start_date=season.start_date, end_date=season.end_date
+                )
+            )
+        db.commit()
+        return player.id
+
+
+def pages(client, path: str, limit: int) -> list[list[dict]]:
+    """Every page of path, following next_cursor."""
+    result, cursor = [], None
+    while True:
+        params = {"limit": limit} if cursor is None else {"limit": limit, "cursor": cursor}
+        response = client.get(path, params=params)
+        assert response.status_code == 200
+        body = response.json()
+        result.append(body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return result
+
+
+def test_player_pages_cover_every_player_once_in_id_order(client, engine, journeyman):
+    with Session(engine) as db:
+        all_ids = db.execute(select(Player.id).order_by(Player.id)).scalars().all()
+    paged = pages(client, "/players", limit=3)
+    assert [len(page) for page in paged] == [3, 3, 1]
+    assert [p["id"] for page in paged for p in page] == all_ids
+
+
+def test_player_added_while_paging_shows_up_once_on_a_later_page(client, engine, journeyman):
+    first = client.get("/players", params={"limit": 3}).json()
+    with Session(engine) as db:
+        db.add(Player(first_name="Late", last_name="Signing", position="PF"))
+        db.commit()
+        all_ids = db.execute(select(Player.id).order_by(Player.id)).scalars().all()
+    rest = client.get("/players", params={"limit": 100, "cursor": first["next_cursor"]}).json()
+    assert [p["id"] for p in first["items"] + rest["items"]] == all_ids
+
+
+def test_history_pages_follow_season_year_then_membership_id(client, journeyman):
+    paged = pages(client, f"/players/{journeyman}/history", limit=2)
+    assert [len(page) for page in paged] == [2, 2]
+    items = [m for page in paged for m in page]
+    assert [(m["season"]["year"], m["team"]["abbreviation"]) for m in items] == [
+        (2022, "PG1"),
+        (2023, "PG1"),
+        (2023, "PG0"),
+        (2024, "PG0"),
+    ]
+    assert [m["id"] for m in items[1:3]] == sorted(m["id"] for m in items[1:3])
+
+
+@pytest.mark.parametrize(
+    "path, cursor",
+    [
+        ("/players", "not a cursor"),
+        ("/players", encode_cursor("id")),
+        ("/players", encode_cursor(1, 2)),
+        ("/players/{player_id}/history", encode_cursor(2023)),
+    ],
+)
+def test_malformed_cursor_is_a_400(client, journeyman, path, cursor):
+    response = client.get(path.format(player_id=journeyman), params={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
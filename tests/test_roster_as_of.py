@@ -0,0 +1,57 @@
+"""
+GET /teams/{abbreviation}/roster?as_of=: the stints covering one date, with
+start_date included and end_date excluded, so a player traded on February 8
+is on the old roster through February 7 and on the new one from February 8.
+"""
+
+from datetime import date
+
+import pytest
+from conftest import add_roster, add_season
+from sqlalchemy.orm import Session
+
+from app.models import Player, RosterMembership, Team
+
+TRADE_DATE = date(2024, 2, 8)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def trade(engine):
+    with Session(engine) as db:
+        season = add_season(db, 2024)
+        old, new = Team(name="Team OLD", abbreviation="OLD"), Team(name="Team NEW", abbreviation="NEW")
+        add_roster(db, old, season, 1)
+        traded = Player(first_name="Traded", last_name="Player", position="PG")
+        for team, start_date, end_date in (
+            (old, season.start_date, TRADE_DATE),
+            (new, TRADE_DATE, season.end_date),
+        ):
+            db.add(RosterMembership(team=team, player=traded, season=season, start_date=start_date, end_date=end_date))
+        db.add(Team(name="Team NON", abbreviation="NON"))
+        db.commit()
+
+
+def roster(client, abbreviation: str, as_of: str) -> list[str]:
+    response = client.get(f"/teams/{abbreviation}/roster", params={"as_of": as_of})
+    assert response.status_code == 200
+    return sorted(m["player"]["first_name"] for m in response.json())
+
+
+def test_traded_player_is_on_the_old_roster_through_the_day_before_the_trade(client):
+    assert roster(client, "OLD", "2024-02-07") == ["OLD2024n0", "Traded"]
+    assert roster(client, "NEW", "2024-02-07") == []
+
+
+def test_traded_player_is_on_the_new_roster_from_the_trade_date(client):
+    assert roster(client, "old", "2024-02-08") == ["OLD2024n0"]
+    assert roster(client, "NEW", "2024-02-08") == ["Traded"]
+
+
+def test_season_end_date_is_excluded(client):
+    assert roster(client, "OLD", "2024-06-30") == ["OLD2024n0"]
+    assert roster(client, "OLD", "2024-07-01") == []
+
+
+def test_unknown_team_is_a_404_and_a_known_empty_one_is_not(client):
+    assert client.get("/teams/XXX/roster", params={"as_of": "2024-02-08"}).status_code == 404
+    assert roster(client, "NON", "2024-02-08") == []
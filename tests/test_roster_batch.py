@@ -0,0 +1,95 @@
+"""
+POST /rosters/batch: one status per item, and repeated items reported as
+duplicates, additions compared on the stint they resolve to.
+"""
+
+import pytest
+from conftest import add_roster, add_season
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models import Player, RosterMembership, Team
+
+
+@pytest.fixture(scope="module")
+def league(engine):
+    with Session(engine) as db:
+        team = Team(name="Team BAT", abbreviation="BAT")
+        season = add_season(db, 2024)
+        rostered = add_roster(db, team, season, 2)
+        free = [Player(first_name=f"Free{n}", last_name="Agent", position="SG") for n in range(2)]
+        db.add_all(free)
+        db.commit()
+        return {
+            "team_id": team.id,
+            "season_id": season.id,
+            "season": (season.start_date.isoformat(), season.end_date.isoformat()),
+            "rostered": [p.id for p in rostered],
+            "free": [p.id for p in free],
+        }
+
+
+def membership(league: dict, player_id: int, **fields) -> dict:
+    return {"team_id": league["team_id"], "player_id": player_id, "season_id": league["season_id"], **fields}
+
+
+def stint_count(engine, league: dict, player_id: int) -> int:
+    with Session(engine) as db:
+        return db.execute(
+            select(func.count()).where(
+                RosterMembership.team_id == league["team_id"], RosterMembership.player_id == player_id
+            )
+        ).scalar_one()
+
+
+def test_every_item_gets_its_own_status(client, engine, league):
+    signing, kept, released = league["free"][0], league["rostered"][0], league["rostered"][1]
+    response = client.post(
+        "/rosters/batch",
+        json={
+            "add": [
+                membership(league, signing),
+                membership(league, kept),
+                membership(league, 999_999),
+                membership(league, league["free"][1], start_date="2030-01-01"),
+            ],
+            "remove": [membership(league, released), membership(league, signing + 1_000_000)],
+        },
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert [(r["op"], r["player_id"], r["status"]) for r in body["results"]] == [
+        ("add", signing, "inserted"),
+        ("add", kept, "already_present"),
+        ("add", 999_999, "invalid"),
+        ("add", league["free"][1], "invalid"),
+        ("remove", released, "deleted"),
+        ("remove", signing + 1_000_000, "not_found"),
+    ]
+    assert body["counts"] == {"inserted": 1, "already_present": 1, "invalid": 2, "deleted": 1, "not_found": 1}
+    assert stint_count(engine, league, signing) == 1
+    assert stint_count(engine, league, released) == 0
+
+
+def test_additions_resolving_to_the_same_stint_are_duplicates(client, engine, league):
+    player_id = league["free"][1]
+    start_date, end_date = league["season"]
+    response = client.post(
+        "/rosters/batch",
+        json={
+            "add": [
+                membership(league, player_id),
+                # Spelled out, these are the season's dates: the same stint.
+                membership(league, player_id, start_date=start_date, end_date=end_date),
+            ],
+            "remove": [membership(league, league["rostered"][0])] * 2,
+        },
+    )
+    assert response.status_code == 200
+    assert [(r["op"], r["status"]) for r in response.json()["results"]] == [
+        ("add", "inserted"),
+        ("add", "duplicate"),
+        ("remove", "deleted"),
+        ("remove", "duplicate"),
+    ]
+    assert stint_count(engine, league, player_id) == 1
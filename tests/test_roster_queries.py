@@ -0,0 +1,55 @@
+"""
+The team-season roster endpoint must not issue more SQL as rosters grow.
+
+Seeds a 2-player and a 40-player roster into the test database, counts the
+statements each GET /teams/{abbr}/seasons/{year}/roster runs with a
+before_cursor_execute listener, and requires the counts to match (no N+1 on
+team, player, or season).
+"""
+
+import pytest
+from conftest import add_roster, add_season
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.db import get_async_engine
+from app.models import Team
+
+SMALL_ROSTER = 2
+LARGE_ROSTER = 40
+
+
+@pytest.fixture(scope="module", autouse=True)
+def rosters(engine):
+    with Session(engine) as db:
+        season = add_season(db, 2024)
+        for abbreviation, size in (("SML", SMALL_ROSTER), ("LRG", LARGE_ROSTER)):
+            add_roster(db, Team(name=f"Team {abbreviation}", abbreviation=abbreviation), season, size)
+        db.commit()
+
+
+def count_queries(client: TestClient, path: str) -> tuple[int, list]:
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = get_async_engine().sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get(path)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    return len(statements), response.json()
+
+
+def test_roster_query_count_does_not_grow_with_roster_size(client):
+    small_count, small = count_queries(client, "/teams/SML/seasons/2024/roster")
+    large_count, large = count_queries(client, "/teams/LRG/seasons/2024/roster")
+
+    assert len(small) == SMALL_ROSTER
+    assert len(large) == LARGE_ROSTER
+    assert all(m["player"] and m["team"] and m["season"] for m in large)
+    assert small_count == large_count == 1